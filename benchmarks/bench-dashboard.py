@@ -0,0 +1,1019 @@
+#!/usr/bin/env python3
+"""
+WXCODE Dashboard Generator Benchmarks
+
+Builds synthetic .planning/ trees and times bin/generate-dashboard.py on them.
+Usage: python benchmarks/bench-dashboard.py [BENCHMARK ...] [--milestones N] [--keep]
+       python benchmarks/bench-dashboard.py suite [--save-baseline] [--tolerance 0.25]
+
+Benchmarks:
+  jobs    Cold --all run with --jobs 1 vs --jobs N (default: one per CPU)
+  tasks   extract_xml_tasks on a multi-megabyte PLAN.md vs the legacy regex chain
+  roadmap ROADMAP.md parsing at 125..1000 phases vs the legacy per-phase slicing
+  shared  Milestones falling back to the root phases/: parse count and time vs one parse each
+  snapshot Size and read time of a 4,000-task milestone: pretty JSON vs minified vs .wxds
+  startup Library import time (-X importtime), lazily imported modules, no-op vs full CLI run
+  incremental Planning tree build, --check, and a one-plan edit (narrowed run) vs a full rebuild
+  latency Cold milestone parsing with simulated per-read latency: serial reads vs prefetched
+  writer  Peak memory and time of writing a 4,000-task dashboard: json.dumps vs streamed
+  aggregates Project dashboard with aggregates from stored summaries vs re-reading every milestone dashboard
+  schema  --schema on synthetic SQLAlchemy models: cold parse vs the mtime cache vs one edited model file;
+          also checks that one-line Prisma blocks (generator client { ... }, model X {}) close at once
+  frontmatter SUMMARY.md parsing with nested frontmatter: whole-file read vs head read, and the old flat parser
+  suite   Time, throughput and peak memory of find_milestones, parse_phase_directory,
+          parse_roadmap, detect_workflow_stages and main on a tree mixing nested, flat and
+          archived milestones with SUMMARY/UAT/VERIFICATION files and a large ROADMAP.md,
+          compared against benchmarks/baselines.json (exit status 1 on a regression). Timings
+          are scaled by a calibration workload timed with the baseline; baselines recorded
+          on another platform or Python version are skipped with a warning
+
+Every benchmark also reports its correctness checks (identical_* and *_ok
+fields, e.g. shared's parse_count_ok); the run exits 1 if any of them is false.
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import mmap
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+GENERATOR = Path(__file__).resolve().parent.parent / "bin" / "generate-dashboard.py"
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the WXCODE dashboard generator")
+    parser.add_argument("benchmarks", nargs="*", help="Benchmarks to run (default: all)")
+    parser.add_argument("--milestones", type=int, default=50, help="Synthetic milestones")
+    parser.add_argument("--phases", type=int, default=6, help="Phases per milestone")
+    parser.add_argument("--plans", type=int, default=3, help="Plans per phase")
+    parser.add_argument("--tasks", type=int, default=5, help="Tasks per plan")
+    parser.add_argument("--jobs", type=int, default=0, help="Parallel jobs to compare against 1 (0 = CPUs)")
+    parser.add_argument("--plan-mb", type=float, default=4, help="Size of the synthetic PLAN.md for 'tasks'")
+    parser.add_argument("--latency-ms", type=float, default=2.0,
+                        help="Simulated per-read latency for 'latency' (e.g. a WSL share)")
+    parser.add_argument("--roadmap-phases", type=int, default=500,
+                        help="Phases in the large ROADMAP.md/REQUIREMENTS.md of 'suite'")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store the 'suite' results as the baseline for this scale")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Slowdown or memory growth over the baseline reported as a regression")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic tree and print its path")
+    return parser.parse_args()
+
+
+# =============================================================================
+# Synthetic tree
+# =============================================================================
+
+def make_roadmap(phases: int, detailed: bool = False) -> str:
+    lines = ["# Roadmap", "", "## Phase Details", ""]
+    for n in range(1, phases + 1):
+        lines += [
+            f"### Phase {n}: Synthetic Phase {n}",
+            f"**Goal:** Deliver synthetic feature {n}",
+            f"**Requirements**: CORE-{n:02d}, UI-{n:02d}",
+        ]
+        if detailed:
+            lines += [
+                f"**Depends on**: Phase {max(1, n - 1)}",
+                "**Success Criteria** (what must be TRUE):",
+                "  1. Users can complete the converted flow end to end",
+                "  2. Legacy business rules are preserved",
+                "**Plans**: 2 plans",
+                "",
+                "Plans:",
+                f"- [ ] {n:02d}-01: Backend for feature {n}",
+                f"- [ ] {n:02d}-02: Frontend for feature {n}",
+            ]
+        lines.append("")
+    lines += ["## Progress", ""]
+    return "\n".join(lines)
+
+
+def make_requirements(phases: int) -> str:
+    lines = ["# Requirements", ""]
+    for n in range(1, phases + 1):
+        mark = "x" if n % 2 else " "
+        lines.append(f"- [{mark}] **CORE-{n:02d}**: Core requirement {n}")
+        lines.append(f"- [ ] **UI-{n:02d}**: Interface requirement {n}")
+    return "\n".join(lines) + "\n"
+
+
+def make_plan(phase: int, plan: int, tasks: int) -> str:
+    parts = [
+        "---",
+        f"phase: {phase:02d}-synthetic",
+        f"plan: {plan:02d}",
+        "wave: 1",
+        "---",
+        "",
+        "<objective>",
+        f"Implement synthetic plan {phase}.{plan}",
+        "</objective>",
+        "",
+        "<tasks>",
+    ]
+    for t in range(1, tasks + 1):
+        parts += [
+            '<task type="auto">',
+            f"  <name>Task {t}: Build component {t}</name>",
+            f"  <files>src/feature_{phase}/module_{t}.py, tests/test_{t}.py</files>",
+            f"  <action>Create module {t} for plan {phase}.{plan}.",
+            "  Wire it into the router and cover the happy path.</action>",
+            "  <verify>pytest -q</verify>",
+            "  <done>Module responds</done>",
+            "</task>",
+            "",
+        ]
+    parts.append("</tasks>")
+    return "\n".join(parts) + "\n"
+
+
+def make_summary(phase: int, plan: int) -> str:
+    return (
+        f"---\nphase: {phase:02d}-synthetic\nplan: {plan:02d}\nsubsystem: api\n---\n\n"
+        f"# Phase {phase}: Summary\n\n**Synthetic plan {phase}.{plan} shipped**\n\nDetails.\n"
+    )
+
+
+def make_uat(phase: int) -> str:
+    lines = ["---", "status: complete", f"phase: {phase:02d}-synthetic", "---", "", "## Tests", ""]
+    for t in range(1, 21):
+        lines += [f"### {t}. Scenario {t}", "expected: Page behaves like the legacy one", "result: pass", ""]
+    return "\n".join(lines)
+
+
+def make_phases(
+    phases_dir: Path, phases: int, plans: int, tasks: int, done_ratio: float, verified: bool = False
+):
+    """Write phase directories; with verified, finished phases also get VERIFICATION and UAT files."""
+    total = phases * plans
+    done = int(total * done_ratio)
+    count = 0
+    for ph in range(1, phases + 1):
+        phase_dir = phases_dir / f"{ph:02d}-synthetic-phase-{ph}"
+        phase_dir.mkdir(parents=True, exist_ok=True)
+        for pl in range(1, plans + 1):
+            (phase_dir / f"{ph:02d}-{pl:02d}-PLAN.md").write_text(make_plan(ph, pl, tasks))
+            if count < done:
+                (phase_dir / f"{ph:02d}-{pl:02d}-SUMMARY.md").write_text(make_summary(ph, pl))
+            count += 1
+        if verified and count <= done:
+            (phase_dir / f"{ph:02d}-VERIFICATION.md").write_text(f"# Phase {ph} verification\n\nstatus: passed\n")
+            (phase_dir / f"{ph:02d}-UAT.md").write_text(make_uat(ph))
+
+
+def make_tree(root: Path, milestones: int, phases: int, plans: int, tasks: int) -> Path:
+    """Create a synthetic project with active and archived milestones."""
+    planning = root / ".planning"
+    planning.mkdir(parents=True)
+    (planning / "PROJECT.md").write_text("# Synthetic Project\n\n## What This Is\n\nBenchmark.\n")
+    (planning / "ROADMAP.md").write_text(make_roadmap(phases))
+    (planning / "REQUIREMENTS.md").write_text(make_requirements(phases))
+
+    archive = planning / "milestones"
+    archive.mkdir()
+    for m in range(milestones):
+        version = f"v{m // 10}.{m % 10}"
+        name = f"{version}-PAGE_Synthetic{m:03d}"
+        # Last two milestones stay active and nested, the rest are archived
+        if m >= milestones - 2:
+            folder = planning / name
+            make_phases(folder / "phases", phases, plans, tasks, done_ratio=0.5)
+            (folder / "ROADMAP.md").write_text(make_roadmap(phases))
+            (folder / "REQUIREMENTS.md").write_text(make_requirements(phases))
+        else:
+            folder = archive / name
+            make_phases(folder / "phases", phases, plans, tasks, done_ratio=1.0)
+            (folder / "MILESTONE.json").write_text(json.dumps({"version": version, "status": "completed"}))
+            (archive / f"{version}-ROADMAP.md").write_text(make_roadmap(phases))
+            (archive / f"{version}-REQUIREMENTS.md").write_text(make_requirements(phases))
+    return planning
+
+
+def make_shared_tree(root: Path, milestones: int, phases: int, plans: int, tasks: int) -> Path:
+    """Create a project whose milestones all fall back to the root phases/ and documents."""
+    planning = root / ".planning"
+    planning.mkdir(parents=True)
+    (planning / "ROADMAP.md").write_text(make_roadmap(phases))
+    (planning / "REQUIREMENTS.md").write_text(make_requirements(phases))
+    make_phases(planning / "phases", phases, plans, tasks, done_ratio=0.5)
+    for m in range(milestones):
+        (planning / f"v{m // 10}.{m % 10}-PAGE_Shared{m:03d}").mkdir()
+    return planning
+
+
+def make_suite_tree(root: Path, milestones: int, phases: int, plans: int, tasks: int, roadmap_phases: int) -> Path:
+    """Create a project cycling through archived, nested and flat milestones.
+
+    Flat milestones are bare folders that fall back to the root phases/. The
+    root ROADMAP.md and REQUIREMENTS.md cover roadmap_phases phases.
+    """
+    planning = root / ".planning"
+    planning.mkdir(parents=True)
+    (planning / "PROJECT.md").write_text("# Synthetic Project\n\n## What This Is\n\nBenchmark.\n")
+    (planning / "ROADMAP.md").write_text(make_roadmap(roadmap_phases, detailed=True))
+    (planning / "REQUIREMENTS.md").write_text(make_requirements(roadmap_phases))
+    make_phases(planning / "phases", phases, plans, tasks, done_ratio=0.5, verified=True)
+
+    archive = planning / "milestones"
+    archive.mkdir()
+    for m in range(milestones):
+        version = f"v{m // 10}.{m % 10}"
+        kind = ("Archived", "Nested", "Flat")[m % 3]
+        name = f"{version}-PAGE_{kind}{m:03d}"
+        if kind == "Archived":
+            folder = archive / name
+            make_phases(folder / "phases", phases, plans, tasks, done_ratio=1.0, verified=True)
+            (folder / "MILESTONE.json").write_text(json.dumps({"version": version, "status": "completed"}))
+            (archive / f"{version}-ROADMAP.md").write_text(make_roadmap(phases, detailed=True))
+            (archive / f"{version}-REQUIREMENTS.md").write_text(make_requirements(phases))
+        elif kind == "Nested":
+            folder = planning / name
+            make_phases(folder / "phases", phases, plans, tasks, done_ratio=0.5, verified=True)
+            (folder / "ROADMAP.md").write_text(make_roadmap(phases, detailed=True))
+            (folder / "REQUIREMENTS.md").write_text(make_requirements(phases))
+        else:
+            (planning / name).mkdir()
+    return planning
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def load_generator():
+    """Import the wxcode_dashboard library behind bin/generate-dashboard.py."""
+    sys.path.insert(0, str(GENERATOR.parent))
+    return importlib.import_module("wxcode_dashboard")
+
+
+def time_call(repeat: int, fn) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_generator(project_dir: Path, *extra: str) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(GENERATOR), "--project-dir", str(project_dir), *extra],
+        check=True, stdout=subprocess.DEVNULL
+    )
+    return time.perf_counter() - start
+
+
+def best_of(repeat: int, fn) -> float:
+    return min(fn() for _ in range(repeat))
+
+
+def dashboard_snapshot(planning: Path) -> dict:
+    """Read every dashboard with the run timestamp masked out, for equality checks.
+
+    Only the fields that record the run time (meta.generated_at and the stages
+    of archived milestones) are masked: timestamps have second resolution, so
+    file times falling in the same second must still be compared.
+    """
+    snapshot = {}
+    for path in sorted(planning.glob("dashboard*.json")):
+        dashboard = json.loads(path.read_text(encoding="utf-8"))
+        dashboard["meta"]["generated_at"] = ""
+        workflow = dashboard.get("workflow", {})
+        if workflow.get("current_stage") == "archived":
+            for stage in workflow["stages"]:
+                stage["completed_at"] = ""
+        snapshot[path.name] = dashboard
+    return snapshot
+
+
+# =============================================================================
+# Benchmarks
+# =============================================================================
+
+def bench_jobs(root: Path, args) -> dict:
+    """Cold --all generation, serial vs parallel."""
+    jobs = args.jobs or os.cpu_count() or 1
+
+    serial = best_of(args.repeat, lambda: run_generator(root, "--all", "--no-cache", "--force"))
+    serial_output = dashboard_snapshot(root / ".planning")
+
+    parallel = best_of(args.repeat, lambda: run_generator(
+        root, "--all", "--no-cache", "--force", "--jobs", str(jobs)
+    ))
+    parallel_output = dashboard_snapshot(root / ".planning")
+
+    return {
+        "jobs": jobs,
+        "serial_s": round(serial, 3),
+        "parallel_s": round(parallel, 3),
+        "speedup": round(serial / parallel, 2) if parallel else None,
+        "identical_output": serial_output == parallel_output,
+    }
+
+
+def legacy_extract_xml_tasks(content: str) -> list:
+    """Reference copy of the regex-chain extract_xml_tasks it was replaced with."""
+    tasks = []
+    for i, match in enumerate(re.findall(r'<task[^>]*>(.*?)</task>', content, re.DOTALL), 1):
+        task = {"sequence": i}
+        name_match = re.search(r'<name>(.*?)</name>', match, re.DOTALL)
+        if name_match:
+            task["name"] = re.sub(r'^Task\s+\d+:\s*', '', name_match.group(1).strip())
+        files_match = re.search(r'<files>(.*?)</files>', match, re.DOTALL)
+        if files_match:
+            task["file"] = files_match.group(1).strip().split(",")[0].strip()
+        action_match = re.search(r'<action>(.*?)</action>', match, re.DOTALL)
+        if action_match:
+            first_line = action_match.group(1).strip().split("\n")[0].strip()
+            task["description"] = first_line[:200] if len(first_line) > 200 else first_line
+        tasks.append(task)
+    return tasks
+
+
+def bench_tasks(root: Path, args) -> dict:
+    """Task extraction on one very large PLAN.md, in-process."""
+    generator = load_generator()
+    block = make_plan(1, 1, 50)
+    content = block * max(1, int(args.plan_mb * 1024 * 1024 / len(block)))
+
+    legacy = time_call(args.repeat, lambda: legacy_extract_xml_tasks(content))
+    current = time_call(args.repeat, lambda: generator.extract_xml_tasks(content))
+
+    return {
+        "plan_mb": round(len(content) / 1024 / 1024, 2),
+        "tasks": len(generator.extract_xml_tasks(content)),
+        "legacy_s": round(legacy, 3),
+        "current_s": round(current, 3),
+        "speedup": round(legacy / current, 2) if current else None,
+        "identical_output": legacy_extract_xml_tasks(content) == generator.extract_xml_tasks(content),
+    }
+
+
+def legacy_parse_roadmap_content(content: str) -> dict:
+    """Reference copy of the per-phase slicing roadmap parser it was replaced with."""
+    phases_info = {}
+    for match in re.finditer(r'###\s*Phase\s+(\d+):\s*([^\n]+)', content):
+        start = match.end()
+        next_phase = re.search(r'\n###\s*Phase\s+\d+:', content[start:])
+        next_section = re.search(r'\n##\s+', content[start:])
+        ends = [m.start() for m in (next_phase, next_section) if m]
+        end = start + min(ends) if ends else len(content)
+        section_content = content[start:end]
+        goal_match = re.search(r'\*\*Goal:\*\*\s*([^\n]+)', section_content)
+        # **Depends on** lines, parsed the same way so both sides do the same work
+        depends_match = re.search(r'\*\*Depends on(?::\*\*|\*\*:)[ \t]*([^\n]*)', section_content, re.IGNORECASE)
+        phases_info[int(match.group(1))] = {
+            "name": match.group(2).strip(),
+            "goal": goal_match.group(1).strip() if goal_match else "",
+            "requirements": list(dict.fromkeys(re.findall(r'([A-Z]+-\d+)', section_content))),
+            "depends_on": [
+                int(num) for num in re.findall(r'(?:phase\s*)?0*(\d+)(?![.\d])', depends_match.group(1), re.IGNORECASE)
+            ] if depends_match else None
+        }
+    return phases_info
+
+
+def bench_roadmap(root: Path, args) -> dict:
+    """Roadmap parsing cost per phase as the phase count grows."""
+    generator = load_generator()
+    results = {}
+    for phases in (125, 250, 500, 1000):
+        content = make_roadmap(phases, detailed=True)
+        legacy = time_call(args.repeat, lambda: legacy_parse_roadmap_content(content))
+        current = time_call(args.repeat, lambda: generator.parse_roadmap_content(content))
+        results[phases] = {
+            "legacy_ms": round(legacy * 1000, 2),
+            "current_ms": round(current * 1000, 2),
+            "current_us_per_phase": round(current / phases * 1e6, 2),
+            "identical_output": legacy_parse_roadmap_content(content) == generator.parse_roadmap_content(content),
+        }
+    return results
+
+
+def bench_shared(root: Path, args) -> dict:
+    """Milestones sharing the flat .planning/phases parse it (and the documents) once per run."""
+    generator = load_generator()
+    planning = make_shared_tree(root / "shared", args.milestones, args.phases, args.plans, args.tasks)
+    milestones = generator.find_milestones(planning)
+
+    def generate(fs_per_milestone: bool):
+        fs = generator.FsSnapshot()
+        for milestone in milestones:
+            if fs_per_milestone:
+                fs = generator.FsSnapshot()
+            generator.generate_milestone_dashboard(
+                milestone["path"], milestone["folder_name"], "bench",
+                root_planning_dir=planning, is_archived=milestone["archived"], fs=fs
+            )
+        return fs
+
+    fs = generate(False)
+    # phases/ tree + ROADMAP.md + REQUIREMENTS.md, however many milestones share them
+    expected_parses = 3
+    return {
+        "milestones": len(milestones),
+        "parses": fs.parses,
+        "parses_reused": fs.parses_reused,
+        "parse_count_ok": fs.parses == expected_parses,
+        "unshared_s": round(time_call(args.repeat, lambda: generate(True)), 3),
+        "shared_s": round(time_call(args.repeat, lambda: generate(False)), 3),
+    }
+
+
+def bench_snapshot(root: Path, args) -> dict:
+    """Pretty dashboard JSON vs minified JSON vs the indexed .wxds snapshot."""
+    generator = load_generator()
+    phases, plans, tasks = 50, 8, 10
+    folder = root / "snapshot" / ".planning" / "v9.9-PAGE_Snapshot"
+    make_phases(folder / "phases", phases, plans, tasks, done_ratio=0.5)
+    (folder / "ROADMAP.md").write_text(make_roadmap(phases))
+    dashboard = generator.generate_milestone_dashboard(folder, folder.name, "bench", root_planning_dir=folder.parent)
+
+    pretty = json.dumps(dashboard, indent=2, ensure_ascii=False).encode("utf-8")
+    minified = json.dumps(dashboard, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    snapshot_file = folder.parent / "dashboard.wxds"
+    snapshot_file.write_bytes(generator.encode_snapshot(dashboard))
+    middle = dashboard["phases"][phases // 2]["number"]
+
+    def read_one_phase():
+        with open(snapshot_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return generator.read_snapshot_phase(data, middle)
+
+    return {
+        "tasks": sum(len(pl["tasks"]) for ph in dashboard["phases"] for pl in ph["plans"]),
+        "pretty_kb": round(len(pretty) / 1024, 1),
+        "minified_kb": round(len(minified) / 1024, 1),
+        "snapshot_kb": round(snapshot_file.stat().st_size / 1024, 1),
+        "pretty_parse_ms": round(time_call(args.repeat, lambda: json.loads(pretty)) * 1000, 2),
+        "minified_parse_ms": round(time_call(args.repeat, lambda: json.loads(minified)) * 1000, 2),
+        "snapshot_decode_ms": round(
+            time_call(args.repeat, lambda: generator.decode_snapshot(snapshot_file.read_bytes())) * 1000, 2
+        ),
+        "snapshot_one_phase_ms": round(time_call(args.repeat, read_one_phase) * 1000, 3),
+        "identical_output": generator.decode_snapshot(snapshot_file.read_bytes()) == json.loads(pretty),
+    }
+
+
+# Must not be imported at startup; only the paths that need them load them
+LAZY_MODULES = (
+    "argparse", "concurrent.futures", "ctypes", "dataclasses", "hashlib", "select", "struct", "tempfile", "xml.etree", "zlib"
+)
+
+
+def import_time_us() -> int:
+    """Cumulative -X importtime of wxcode_dashboard in a fresh interpreter, in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         f"import sys; sys.path.insert(0, {str(GENERATOR.parent)!r}); import wxcode_dashboard"],
+        check=True, capture_output=True, text=True
+    )
+    for line in result.stderr.splitlines():
+        fields = [f.strip() for f in line.split("|")]
+        if len(fields) == 3 and fields[2] == "wxcode_dashboard":
+            return int(fields[1])
+    raise RuntimeError("wxcode_dashboard missing from -X importtime output")
+
+
+def bench_startup(root: Path, args) -> dict:
+    """Import cost and no-op CLI runs; guards the lazy-import startup path."""
+    probe = subprocess.run(
+        [sys.executable, "-c",
+         f"import sys, json; sys.path.insert(0, {str(GENERATOR.parent)!r}); import wxcode_dashboard; "
+         f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"],
+        check=True, capture_output=True, text=True
+    )
+    eagerly_imported = json.loads(probe.stdout)
+
+    run_generator(root, "--all")  # Leaves fingerprint state for the no-op runs
+    return {
+        "import_ms": round(min(import_time_us() for _ in range(args.repeat)) / 1000, 2),
+        "eagerly_imported": eagerly_imported,
+        "lazy_imports_ok": not eagerly_imported,
+        "noop_run_ms": round(best_of(args.repeat, lambda: run_generator(root, "--all")) * 1000, 1),
+        "full_run_ms": round(best_of(args.repeat, lambda: run_generator(root, "--all", "--force")) * 1000, 1),
+    }
+
+
+def bench_incremental(root: Path, args) -> dict:
+    """A single edited PLAN.md regenerates one phase of one milestone, with identical output."""
+    generator = load_generator()
+    planning = root / ".planning"
+    run_generator(root, "--all")
+    active = sorted(d for d in planning.iterdir() if d.name.startswith("v"))[-1]
+    plan = sorted((active / "phases").glob("*/*-PLAN.md"))[0]
+    original = plan.read_text(encoding="utf-8")
+
+    def edit_and_run(i: int) -> float:
+        plan.write_text(original.replace("Build component", f"Edit component {i}", 1), encoding="utf-8")
+        return run_generator(root, "--all")
+
+    narrowed_s = min(edit_and_run(i) for i in range(args.repeat))
+    narrowed = dashboard_snapshot(planning)
+    full_s = best_of(args.repeat, lambda: run_generator(root, "--all", "--force", "--no-cache"))
+    return {
+        "tree_ms": round(time_call(args.repeat, lambda: generator.planning_tree(planning)) * 1000, 2),
+        "check_run_ms": round(best_of(args.repeat, lambda: run_generator(root, "--all", "--check")) * 1000, 1),
+        "narrowed_run_ms": round(narrowed_s * 1000, 1),
+        "full_run_ms": round(full_s * 1000, 1),
+        "output_ok": narrowed == dashboard_snapshot(planning),
+    }
+
+
+def bench_latency(root: Path, args) -> dict:
+    """Prefetching PLAN/SUMMARY files overlaps read latency that serial reads pay per file."""
+    generator = load_generator()
+    planning = root / ".planning"
+    milestones = generator.find_milestones(planning)
+    latency = args.latency_ms / 1000
+    read_text = Path.read_text
+
+    def slow_read_text(path, *a, **kw):
+        time.sleep(latency)
+        return read_text(path, *a, **kw)
+
+    def generate(read_workers: int) -> list:
+        generator.READ_WORKERS = read_workers
+        return [
+            dashboard for _, dashboard in
+            generator.generate_milestone_dashboards(planning, milestones, "bench", fs=generator.FsSnapshot())
+        ]
+
+    default_workers = generator.READ_WORKERS
+    Path.read_text = slow_read_text
+    try:
+        serial_s = time_call(args.repeat, lambda: generate(1))
+        serial = generate(1)
+        prefetched_s = time_call(args.repeat, lambda: generate(default_workers))
+        prefetched = generate(default_workers)
+    finally:
+        Path.read_text = read_text
+        generator.READ_WORKERS = default_workers
+    return {
+        "latency_ms": args.latency_ms,
+        "read_workers": default_workers,
+        "serial_s": round(serial_s, 3),
+        "prefetched_s": round(prefetched_s, 3),
+        "output_ok": serial == prefetched,
+    }
+
+
+def measure(repeat: int, fn) -> dict:
+    """Best wall time over repeat runs, then the peak traced allocation of one more run."""
+    seconds = time_call(repeat, fn)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"s": round(seconds, 4), "peak_kib": round(peak / 1024)}
+
+
+def calibrate(repeat: int) -> float:
+    """Best time of a fixed pure-Python workload (regex, indented JSON, sorting).
+
+    Stored with the baseline, so timings are compared relative to how fast
+    the machine runs this reference rather than in absolute seconds. Indented
+    encoding runs the pure-Python encoder, which dominates main.
+    """
+    text = "\n".join(f"- [ ] **REQ-{i}**: item {i} {'x' * (i % 40)}" for i in range(20000))
+    data = {f"k{i}": {"n": i, "s": str(i) * 3, "l": list(range(i % 10))} for i in range(5000)}
+
+    def work():
+        re.findall(r"\*\*([A-Z]+-\d+)\*\*", text)
+        json.loads(json.dumps(data, indent=2))
+        sorted(data, key=lambda key: data[key]["s"])
+
+    return time_call(max(repeat, 20), work)
+
+
+def environment() -> dict:
+    return {"python": platform.python_version(), "machine": f"{platform.system()} {platform.machine()}"}
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float, time_scale: float = 1.0) -> list:
+    """Names of the measurements that got slower or bigger than baseline allows.
+
+    Baseline timings are multiplied by time_scale (this machine's calibration
+    time over the baseline's) before the comparison.
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        for field, scale in (("s", time_scale), ("peak_kib", 1.0)):
+            if before[field] and result[field] > before[field] * scale * (1 + tolerance):
+                regressions.append(f"{name}.{field}")
+    return regressions
+
+
+def bench_aggregates(root: Path, args) -> dict:
+    """Project aggregates come from compact summary records, not from the milestone dashboards."""
+    generator = load_generator()
+    planning = root / ".planning"
+    run_generator(root, "--all", "--force")
+    milestones = generator.find_milestones(planning)
+
+    def from_summaries():
+        return generator.generate_project_dashboard(planning, milestones, "bench", generator.FsSnapshot())
+
+    def from_dashboards():
+        # What external tooling had to do: load every dashboard and sum it
+        totals = {}
+        for milestone in milestones:
+            progress = json.loads(generator.milestone_dashboard_path(planning, milestone).read_text())["progress"]
+            for name, value in progress.items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
+
+    return {
+        "milestones": len(milestones),
+        "summaries_kb": round((planning / generator.SUMMARIES_FILENAME).stat().st_size / 1024, 1),
+        "dashboards_kb": round(sum(
+            generator.milestone_dashboard_path(planning, m).stat().st_size for m in milestones
+        ) / 1024, 1),
+        "project_dashboard_ms": round(time_call(args.repeat, from_summaries) * 1000, 2),
+        "sum_dashboards_ms": round(time_call(args.repeat, from_dashboards) * 1000, 2),
+    }
+
+
+def make_rich_summary(phase: int, plan: int, body_kb: int) -> str:
+    """A SUMMARY.md with the template's nested frontmatter and a long body."""
+    head = "\n".join([
+        "---",
+        f"phase: {phase:02d}-synthetic",
+        f"plan: {plan:02d}",
+        "subsystem: api",
+        "tags: [fastapi, postgres, jwt]",
+        "",
+        "# Dependency graph",
+        "requires:",
+        f"  - phase: {max(phase - 1, 1):02d}-synthetic",
+        "    provides: [database models, settings]",
+        "provides:",
+        f"  - Endpoint set {phase}.{plan}",
+        "  - Request validation",
+        "affects: [reporting, admin]",
+        "",
+        "tech-stack:",
+        "  added: [pydantic]",
+        "  patterns: [repository]",
+        "",
+        "key-files:",
+        "  created:",
+        f"    - src/feature_{phase}/routes_{plan}.py",
+        f"    - tests/test_routes_{plan}.py",
+        "  modified: [src/app.py]",
+        "",
+        "key-decisions:",
+        '  - "Validate at the router boundary"',
+        "",
+        "duration: 12min",
+        "completed: 2026-01-15",
+        "---",
+        "",
+        f"# Phase {phase}: Summary",
+        "",
+        f"**Synthetic plan {phase}.{plan} shipped**",
+        "",
+    ])
+    section = "## Details\n\n" + "- Wired the module into the router and covered the happy path.\n" * 20 + "\n"
+    return head + "\n" + section * max(1, body_kb * 1024 // len(section))
+
+
+def legacy_parse_markdown_frontmatter(content: str) -> dict:
+    """Reference copy of the flat key: value frontmatter parser it was replaced with."""
+    frontmatter = {}
+    if content.startswith("---"):
+        parts = content.split("---", 2)
+        if len(parts) >= 3:
+            for line in parts[1].strip().split("\n"):
+                if ":" in line:
+                    key, value = line.split(":", 1)
+                    frontmatter[key.strip()] = value.strip().strip('"').strip("'")
+    return frontmatter
+
+
+def bench_frontmatter(root: Path, args) -> dict:
+    """SUMMARY.md parsing reads only the frontmatter and first paragraph, and keeps nested fields."""
+    generator = load_generator()
+    summaries = []
+    for plan in range(1, 201):
+        path = root / f"01-{plan:03d}-SUMMARY.md"
+        path.write_text(make_rich_summary(1, plan, 16))
+        summaries.append(path)
+
+    def parse(read, parse_frontmatter):
+        def run():
+            for path in summaries:
+                content = read(path)
+                parse_frontmatter(content)
+                generator._SUMMARY_PARAGRAPH_RE.search(content)
+        return run
+
+    sample = generator.plan_frontmatter_fields({}, generator.parse_markdown_frontmatter(summaries[0].read_text()), 1)
+    whole_s = time_call(args.repeat, parse(Path.read_text, generator.parse_markdown_frontmatter))
+    head_s = time_call(args.repeat, parse(generator.read_summary_head, generator.parse_markdown_frontmatter))
+    legacy_s = time_call(args.repeat, parse(Path.read_text, legacy_parse_markdown_frontmatter))
+    return {
+        "summaries": len(summaries),
+        "whole_kb_read": round(sum(p.stat().st_size for p in summaries) / 1024, 1),
+        "head_kb_read": round(sum(len(generator.read_summary_head(p)) for p in summaries) / 1024, 1),
+        "whole_read_s": round(whole_s, 4),
+        "head_read_s": round(head_s, 4),
+        # Reference only: the flat parser dropped every nested field
+        "legacy_flat_s": round(legacy_s, 4),
+        "sample_dependencies": sample["dependencies"],
+        "identical_paragraphs": all(
+            generator._SUMMARY_PARAGRAPH_RE.search(p.read_text()).group(1)
+            == generator._SUMMARY_PARAGRAPH_RE.search(generator.read_summary_head(p)).group(1)
+            for p in summaries
+        ),
+    }
+
+
+def make_sqlalchemy_models(models_dir: Path, tables: int):
+    """Write one declarative SQLAlchemy module per table, each referencing the previous table."""
+    models_dir.mkdir(parents=True, exist_ok=True)
+    for i in range(tables):
+        parent = f"T{i - 1:04d}"
+        lines = [
+            "from sqlalchemy import Column, ForeignKey, Integer, Numeric, String, Text",
+            "from sqlalchemy.orm import relationship",
+            "from .base import Base",
+            "",
+            "",
+            f"class Model{i:04d}(Base):",
+            f'    """Maps to legacy T{i:04d} table."""',
+            f'    __tablename__ = "T{i:04d}"',
+            "",
+            f"    ID_T{i:04d} = Column(Integer, primary_key=True)",
+        ]
+        lines += [f"    NM_COL{c:02d} = Column(String({20 + c}), nullable=False)" for c in range(12)]
+        lines += [
+            "    VL_TOTAL = Column(Numeric(19, 4), server_default='0')",
+            "    DS_OBS = Column(Text)",
+        ]
+        if i:
+            lines += [
+                f'    ID_{parent} = Column(Integer, ForeignKey("{parent}.ID_{parent}", ondelete="CASCADE"))',
+                f'    parent = relationship("Model{i - 1:04d}")',
+            ]
+        (models_dir / f"t{i:04d}.py").write_text("\n".join(lines) + "\n")
+
+
+def make_prisma_schema(path: Path):
+    """Write a Prisma schema whose one-line blocks precede an enum and the model using it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join([
+        'generator client { provider = "prisma-client-js" }',
+        "",
+        "model Empty {}",
+        "",
+        "enum Role {",
+        "  ADMIN",
+        "  USER",
+        "}",
+        "",
+        "model Account {",
+        "  id   Int  @id",
+        "  role Role",
+        "}",
+    ]) + "\n")
+
+
+def bench_schema(root: Path, args) -> dict:
+    """--schema reuses cached model parses; only edited model files are parsed again."""
+    project = root / "schema-project"
+    (project / ".planning").mkdir(parents=True, exist_ok=True)
+    models = project / "app" / "models"
+    make_sqlalchemy_models(models, args.milestones * 4)
+    cache = project / ".planning" / ".schema-cache.json"
+
+    def cold():
+        cache.unlink(missing_ok=True)
+        return run_generator(project, "--schema")
+
+    cold_s = best_of(args.repeat, cold)
+    run_generator(project, "--schema")
+    warm_s = best_of(args.repeat, lambda: run_generator(project, "--schema"))
+    edited = models / "t0000.py"
+
+    def one_edit():
+        edited.write_text(edited.read_text() + "\n")
+        return run_generator(project, "--schema")
+
+    # One-line Prisma blocks must close at once instead of swallowing the enum after them
+    load_generator()
+    schema = importlib.import_module("wxcode_schema")
+    prisma = root / "prisma-project" / "prisma" / "schema.prisma"
+    make_prisma_schema(prisma)
+    tables, _views, enums, _datasource = schema.resolve_prisma({"schema.prisma": schema.parse_prisma_file(prisma)})
+    column_types = {column["name"]: column["type"]["base"] for table in tables for column in table["columns"]}
+
+    return {
+        "model_files": args.milestones * 4,
+        "cold_s": round(cold_s, 3),
+        "cached_s": round(warm_s, 3),
+        "one_edit_s": round(best_of(args.repeat, one_edit), 3),
+        "prisma_one_line_blocks_ok": (
+            [table["name"] for table in tables] == ["Empty", "Account"]
+            and [enum["name"] for enum in enums] == ["Role"]
+            and column_types.get("role") == "enum"
+        ),
+    }
+
+
+def bench_suite(root: Path, args) -> dict:
+    """Per-function timings, throughput and peak memory, guarded by stored baselines."""
+    generator = load_generator()
+    project = root / "suite"
+    planning = make_suite_tree(project, args.milestones, args.phases, args.plans, args.tasks, args.roadmap_phases)
+    milestones = generator.find_milestones(planning)
+
+    # Every distinct phase directory, and the inputs detect_workflow_stages needs per milestone
+    workflow_inputs = []
+    phase_dirs = set()
+    fs = generator.FsSnapshot()
+    for milestone in milestones:
+        phases_dir = generator.detect_phases_dir(planning, milestone["path"], fs)
+        dirs = sorted(d for d in fs.subdirs(phases_dir) if re.match(r"\d+-", d.name))
+        phase_dirs.update(dirs)
+        phases = generator.parse_phases(dirs, fs=fs)
+        workflow_inputs.append((milestone, phases_dir, phases))
+    phase_dirs = sorted(phase_dirs)
+    plans = sum(len(fs.files_ending(d, "-PLAN.md")) for d in phase_dirs)
+
+    def detect_workflows():
+        fs = generator.FsSnapshot()
+        for milestone, phases_dir, phases in workflow_inputs:
+            generator.detect_workflow_stages(
+                planning, phases_dir, phases, is_archived=milestone["archived"],
+                milestone_name=milestone["folder_name"], fs=fs
+            )
+
+    def run_main():
+        argv = sys.argv
+        sys.argv = [str(GENERATOR), "--project-dir", str(project), "--all", "--force", "--no-cache"]
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                generator.main()
+        finally:
+            sys.argv = argv
+
+    cases = {
+        "find_milestones": ("milestones", len(milestones),
+                            lambda: generator.find_milestones(planning, generator.FsSnapshot())),
+        "parse_phase_directory": ("plans", plans, lambda: [
+            generator.parse_phase_directory(d, fs=generator.FsSnapshot()) for d in phase_dirs
+        ]),
+        "parse_roadmap": ("phases", args.roadmap_phases, lambda: generator.parse_roadmap(planning / "ROADMAP.md")),
+        "detect_workflow_stages": ("milestones", len(milestones), detect_workflows),
+        "main": ("plans", plans, run_main),
+    }
+    results = {}
+    for name, (unit, items, fn) in cases.items():
+        result = measure(args.repeat, fn)
+        result[f"{unit}_per_s"] = round(items / result["s"]) if result["s"] else None
+        results[name] = result
+
+    scale = f"{args.milestones}x{args.phases}x{args.plans}x{args.tasks}+roadmap{args.roadmap_phases}"
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    baseline = baselines.get(scale)
+    calibration = calibrate(args.repeat)
+    report = {"scale": scale, "calibration_s": round(calibration, 4), "functions": results}
+    current = environment()
+    if args.save_baseline:
+        baselines[scale] = {
+            **current,
+            "calibration_s": round(calibration, 4),
+            "functions": {name: {"s": r["s"], "peak_kib": r["peak_kib"]} for name, r in results.items()},
+        }
+        BASELINES.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        report["baseline"] = "saved"
+    elif baseline is None:
+        report["baseline"] = "none for this scale (record one with --save-baseline)"
+    elif any(baseline.get(key) != value for key, value in current.items()):
+        # Timings and allocation sizes do not carry over between interpreters or platforms
+        report["baseline"] = (f"skipped: recorded on {baseline.get('machine')} / Python {baseline.get('python')}, "
+                              f"this is {current['machine']} / Python {current['python']}")
+        print(f"WARNING: suite: {report['baseline']}; re-record with --save-baseline", file=sys.stderr)
+    else:
+        time_scale = 1.0
+        if baseline.get("calibration_s"):
+            time_scale = calibration / baseline["calibration_s"]
+        else:
+            print("WARNING: suite: baseline has no calibration_s; timings compared unscaled", file=sys.stderr)
+        report["baseline"] = baseline["functions"]
+        report["time_scale"] = round(time_scale, 3)
+        report["regressions"] = compare_to_baseline(results, baseline["functions"], args.tolerance, time_scale)
+    return report
+
+
+def bench_writer(root: Path, args) -> dict:
+    """Streaming write_dashboard() vs serializing the whole text first, on a 4,000-task milestone."""
+    generator = load_generator()
+    phases, plans, tasks = 50, 8, 10
+    folder = root / "writer" / ".planning" / "v9.9-PAGE_Writer"
+    make_phases(folder / "phases", phases, plans, tasks, done_ratio=0.5)
+    (folder / "ROADMAP.md").write_text(make_roadmap(phases))
+    dashboard = generator.generate_milestone_dashboard(folder, folder.name, "bench", root_planning_dir=folder.parent)
+    legacy_path = folder.parent / "legacy.json"
+    streamed_path = folder.parent / "streamed.json"
+
+    def legacy_write():
+        generator.atomic_write_text(legacy_path, json.dumps(dashboard, indent=2, ensure_ascii=False))
+
+    legacy = measure(args.repeat, legacy_write)
+    streamed = measure(args.repeat, lambda: generator.write_dashboard(streamed_path, dashboard, force=True))
+    unchanged = measure(args.repeat, lambda: generator.write_dashboard(streamed_path, dashboard))
+    return {
+        "dashboard_kb": round(streamed_path.stat().st_size / 1024, 1),
+        "legacy": legacy,
+        "streamed": streamed,
+        "unchanged_compare": unchanged,
+        "identical_output": legacy_path.read_bytes() == streamed_path.read_bytes(),
+    }
+
+
+BENCHMARKS = {
+    "jobs": bench_jobs,
+    "tasks": bench_tasks,
+    "roadmap": bench_roadmap,
+    "shared": bench_shared,
+    "snapshot": bench_snapshot,
+    "startup": bench_startup,
+    "incremental": bench_incremental,
+    "latency": bench_latency,
+    "writer": bench_writer,
+    "aggregates": bench_aggregates,
+    "schema": bench_schema,
+    "frontmatter": bench_frontmatter,
+    "suite": bench_suite,
+}
+
+
+def failed_checks(result, prefix: str = "") -> list:
+    """Paths of the identical_* / *_ok fields that are false in a benchmark result."""
+    failed = []
+    if isinstance(result, dict):
+        for key, value in result.items():
+            path = f"{prefix}.{key}" if prefix else str(key)
+            if value is False and (str(key).startswith("identical") or str(key).endswith("_ok")):
+                failed.append(path)
+            else:
+                failed.extend(failed_checks(value, path))
+    return failed
+
+
+def main():
+    args = parse_args()
+    names = args.benchmarks or list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        print(f"ERROR: Unknown benchmark(s): {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(1)
+
+    root = Path(tempfile.mkdtemp(prefix="wxcode-bench-"))
+    try:
+        make_tree(root, args.milestones, args.phases, args.plans, args.tasks)
+        print(f"Synthetic tree: {args.milestones} milestones x {args.phases} phases x "
+              f"{args.plans} plans x {args.tasks} tasks")
+        regressed = False
+        for name in names:
+            result = BENCHMARKS[name](root, args)
+            print(f"{name}: {json.dumps(result)}")
+            regressed = regressed or bool(result.get("regressions"))
+            failed = failed_checks(result)
+            if failed:
+                print(f"ERROR: {name}: failed checks: {', '.join(failed)}", file=sys.stderr)
+                regressed = True
+    finally:
+        if args.keep:
+            print(f"Tree kept at {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+    if regressed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4076 @@
+"""
+WXCODE Dashboard library
+
+Generates deterministic JSON dashboards from .planning/ files. The
+generate-dashboard.py script next to this module is a thin command-line
+wrapper around main(); hooks and other long-lived tools can import the module
+instead and keep a typed in-memory model between refreshes:
+
+    import wxcode_dashboard
+
+    project = wxcode_dashboard.load_project(".")
+    project.current_milestone.progress["tasks_percentage"]
+    wxcode_dashboard.refresh_project(project, "v1.0-PAGE_Login", phase=3)
+    wxcode_dashboard.save_project(project)
+
+Command line:
+Usage: python generate-dashboard.py [--all] [--project-dir PATH] [--jobs N] [--no-cache] [--force]
+                                   [--compact] [--stats] [--profile FILE]
+       python generate-dashboard.py [--milestone NAME] [--phase N]
+       python generate-dashboard.py --check [--all | --milestone NAME [--phase N]]
+       python generate-dashboard.py --watch [--debounce SECONDS] [--poll [--poll-interval SECONDS]]
+       python generate-dashboard.py --schema [--legacy-tables FILE] [--no-cache] [--force]
+
+Outputs:
+  - .planning/dashboard.json (project dashboard)
+  - .planning/dashboard_<milestone>.json (milestone dashboards, with --all)
+  - .planning/dashboard_<milestone>.wxds (indexed compact snapshots, with --compact)
+  - .planning/.dashboard-cache.json (parse cache, reused across runs)
+  - .planning/.dashboard-state.json (input trees of the last runs, per option set)
+  - .planning/.dashboard-summaries.json (per-milestone records behind the project aggregates)
+  - .planning/.dashboard-timing.jsonl (append-only log of completed plan timings)
+  - .planning/dashboard-history.jsonl (status changes between generations, rotated by size)
+  - .planning/schema-dashboard.json, SCHEMA-STATUS.md and .schema-cache.json (with --schema)
+
+Dashboards whose content is unchanged (ignoring generation timestamps) are not
+rewritten, and [WXCODE:DASHBOARD_UPDATED] is only printed for files written.
+Each run records a stat-only Merkle tree of .planning/ (directory mtimes,
+file sizes and mtimes). When it matches the last run with the same options the
+run exits before parsing anything; otherwise only the milestones, and where
+possible only the phase directories, holding changed files are regenerated.
+--check compares the trees without generating and exits 0 when up to date and
+1 when a run would regenerate something, so hooks can decide cheaply.
+
+--milestone regenerates a single milestone dashboard; adding --phase N
+re-parses only that phase directory and takes the other phases from the
+existing dashboard_<milestone>.json, so per-wave refreshes cost the same
+regardless of project size. A phase without a directory in the milestone is
+an error (exit 1, listing the available phases), as is an unknown milestone.
+
+--watch keeps the generator running and regenerates only the milestone
+dashboards affected by changed planning files (inotify on Linux, mtime
+polling elsewhere).
+
+--schema extracts tables, columns, enums, relationships and coverage from the
+project's SQLAlchemy or Prisma model files instead (see wxcode_schema.py).
+
+--stats prints one JSON line to stderr per run with per-stage timings, files
+and bytes read, cache hits and filesystem counts; --profile FILE additionally
+writes a cProfile dump (inspect with python -m pstats FILE).
+"""
+
+# The CLI runs many times per session, so startup stays lean: modules only some
+# paths need (argparse, hashlib, struct, tempfile, zlib, ctypes, select,
+# concurrent.futures, the dataclass model) are imported where they are used.
+# datetime stays eager: every generation formats timestamps, and importing it
+# costs about a millisecond.
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+
+def parse_args():
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate WXCODE dashboards")
+    parser.add_argument("--all", action="store_true", help="Regenerate all milestone dashboards")
+    parser.add_argument("--milestone", type=str, default=None, metavar="NAME",
+                        help="Regenerate only this milestone's dashboard (folder name, e.g. v1.0-PAGE_Login)")
+    parser.add_argument("--phase", type=int, default=None, metavar="N",
+                        help="Re-parse only phase N of --milestone (default: the current milestone), "
+                             "reusing the other phases from its existing dashboard")
+    parser.add_argument("--project-dir", type=str, default=".", help="Project directory path")
+    parser.add_argument("--wxcode-version", type=str, default=None, help="WXCODE version")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the parse cache")
+    parser.add_argument("--force", action="store_true", help="Rewrite dashboards even if content is unchanged")
+    parser.add_argument("--check", action="store_true",
+                        help="Generate nothing; exit 0 if the dashboards of a run with the same options "
+                             "are up to date, 1 if it would regenerate anything")
+    parser.add_argument("--compact", action="store_true",
+                        help="Also write dashboard_<milestone>.wxds snapshots (indexed, minified; see encode_snapshot)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes for milestone/phase parsing (0 = one per CPU)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Stay running and regenerate affected dashboards when .planning/ changes")
+    parser.add_argument("--debounce", type=float, default=0.5,
+                        help="Seconds of quiet before regenerating in --watch mode")
+    parser.add_argument("--poll", action="store_true", help="Use mtime polling instead of inotify in --watch mode")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Polling interval in seconds")
+    parser.add_argument("--schema", action="store_true",
+                        help="Write .planning/schema-dashboard.json from the project's SQLAlchemy/Prisma "
+                             "models instead of the planning dashboards")
+    parser.add_argument("--legacy-tables", type=str, default=None, metavar="FILE",
+                        help="With --schema: legacy table names for coverage (JSON list, MCP get_schema "
+                             "output or one name per line; default: those of the previous schema dashboard)")
+    parser.add_argument("--stats", action="store_true",
+                        help="Print per-stage timings, read/cache counters and filesystem counts as JSON to stderr")
+    parser.add_argument("--profile", type=str, default=None, metavar="FILE",
+                        help="Also write a cProfile dump of the run to FILE (implies --stats)")
+    return parser.parse_args()
+
+
+def get_wxcode_version(provided_version: Optional[str] = None) -> str:
+    """Get WXCODE version from VERSION file or provided value."""
+    if provided_version:
+        return provided_version
+
+    version_paths = [
+        Path.home() / ".claude" / "wxcode-skill" / "VERSION",
+        Path(__file__).parent.parent / "VERSION",
+    ]
+
+    for path in version_paths:
+        if path.exists():
+            return path.read_text().strip()
+
+    return "unknown"
+
+
+_run_timestamp = None
+
+
+def run_timestamp() -> str:
+    """Timestamp of this generator run, shared by every "now" field it writes."""
+    global _run_timestamp
+    if _run_timestamp is None:
+        _run_timestamp = iso_timestamp(time.time())
+    return _run_timestamp
+
+
+def reset_run_timestamp():
+    """Start a new run (used by --watch between regenerations)."""
+    global _run_timestamp
+    _run_timestamp = None
+
+
+class RunStats:
+    """Per-stage timings and counters for --stats / --profile.
+
+    Timings are inclusive wall-clock seconds; "regex" overlaps the parsing
+    stage it ran in, and stages timed in worker processes are summed.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.counters = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def add(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def take(self) -> dict:
+        """Return and reset everything collected so far, for merging."""
+        data = {"timings": self.timings, "counters": self.counters}
+        self.timings = {}
+        self.counters = {}
+        return data
+
+    def merge(self, data: Optional[dict]):
+        """Add what another process collected (see take)."""
+        if not data:
+            return
+        for name, seconds in data["timings"].items():
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+        for name, amount in data["counters"].items():
+            self.add(name, amount)
+
+    def report(self) -> dict:
+        return {
+            "timings_s": {name: round(seconds, 4) for name, seconds in sorted(self.timings.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+
+# Active RunStats with --stats/--profile, None otherwise (see reset_stats)
+_stats: Optional[RunStats] = None
+_NOT_TIMED = contextlib.nullcontext()
+
+
+def reset_stats(enabled: bool):
+    """Start collecting a fresh RunStats, or turn collection off."""
+    global _stats
+    _stats = RunStats() if enabled else None
+
+
+def timed(name: str):
+    """Context manager timing a stage; a shared no-op when stats are off."""
+    return _stats.stage(name) if _stats is not None else _NOT_TIMED
+
+
+def count(name: str, amount: int = 1):
+    if _stats is not None:
+        _stats.add(name, amount)
+
+
+def read_file(path: Path) -> str:
+    """Path.read_text(), counted in files_read/bytes_read when stats are on."""
+    text = path.read_text()
+    count_read(text)
+    return text
+
+
+def count_read(text: str):
+    if _stats is not None:
+        _stats.add("files_read")
+        _stats.add("bytes_read", len(text.encode("utf-8")))
+
+
+def atomic_write_text(path: Path, text: str):
+    """Write text via a temp file and rename, so readers never see partial content."""
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """Binary counterpart of atomic_write_text()."""
+    with atomic_writer(path) as f:
+        f.write(data)
+
+
+@contextlib.contextmanager
+def atomic_writer(path: Path):
+    """Binary file that replaces path when the block exits cleanly.
+
+    Any exception raised in the block discards the temp file instead.
+    """
+    import tempfile
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        # mkstemp creates 0600 files; keep dashboards readable like write_text() did
+        try:
+            mode = path.stat().st_mode & 0o777
+        except OSError:
+            mode = 0o644
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+# Serialized JSON is written (and hashed) in pieces of this many encoder tokens
+WRITE_CHUNK_TOKENS = 8192
+_GENERATED_AT_RE = re.compile(r'"generated_at": "([^"]*)"')
+
+
+def iter_json(value) -> Iterator[str]:
+    """json.dumps(value, indent=2, ensure_ascii=False) as a stream of chunks.
+
+    The encoder walks phases and tasks lazily, so the full text never exists
+    at once. Chunks only ever split between JSON tokens.
+    """
+    import itertools
+    tokens = json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(value)
+    while True:
+        batch = list(itertools.islice(tokens, WRITE_CHUNK_TOKENS))
+        if not batch:
+            return
+        yield "".join(batch)
+
+
+def content_hash(chunks, timestamp: Optional[str]) -> str:
+    """Hash serialized dashboard text, given in chunks, with its run timestamp masked out.
+
+    Timestamps are whole JSON strings, so one never straddles two chunks
+    (tokens from iter_json() or lines of a dashboard file).
+    """
+    import hashlib
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        if timestamp:
+            chunk = chunk.replace(timestamp, "")
+        digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def dashboard_file_hash(path: Path) -> Optional[str]:
+    """content_hash() of an existing dashboard file, read line by line.
+
+    Its generated_at is taken from the trailing "meta" object, or for
+    dashboards without one (schema-dashboard.json) from the top-level field
+    near the head. None if the file cannot be read.
+    """
+    try:
+        with path.open("rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - 4096))
+            timestamps = _GENERATED_AT_RE.findall(f.read().decode("utf-8", "replace"))[-1:]
+            f.seek(0)
+            if not timestamps:
+                timestamps = _GENERATED_AT_RE.findall(f.read(4096).decode("utf-8", "replace"))[:1]
+                f.seek(0)
+            return content_hash((line.decode("utf-8") for line in f), timestamps[0] if timestamps else None)
+    except (OSError, ValueError):
+        return None
+
+
+def write_dashboard(path: Path, dashboard: dict, force: bool = False) -> bool:
+    """Write a dashboard atomically unless its content is unchanged.
+
+    Every timestamp that only records "when this run happened" uses run_timestamp(),
+    which equals meta.generated_at (or the top-level generated_at of dashboards
+    without "meta"), so masking it leaves the semantic content.
+    The JSON is streamed (see iter_json) and the existing file is hashed line by
+    line, so neither text is held in memory; an existing file costs one extra
+    serialization pass, to compare, but unchanged dashboards are never written.
+    Returns True if the file was written.
+    """
+    if not force and path.exists():
+        old_hash = dashboard_file_hash(path)
+        generated_at = dashboard.get("meta", dashboard).get("generated_at")
+        with timed("serialization"):
+            if old_hash is not None and content_hash(iter_json(dashboard), generated_at) == old_hash:
+                return False
+
+    with atomic_writer(path) as f:
+        with timed("serialization"):
+            for chunk in iter_json(dashboard):
+                f.write(chunk.encode("utf-8"))
+    return True
+
+
+# Compact milestone snapshot (dashboard_<milestone>.wxds), for --compact:
+#   header   b"WXDS", u16 format version, u16 reserved, u32 section count
+#   index    per section: i32 phase number, u64 offset, u32 length (little endian)
+#   payload  sections as minified UTF-8 JSON, in index order
+# Section 0 is the dashboard with "phases" set to null; sections 1..n are the
+# phases in order, so a reader can mmap the file and decode just one phase.
+SNAPSHOT_MAGIC = b"WXDS"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".wxds"
+_SNAPSHOT_HEADER = "<4sHHI"
+_SNAPSHOT_ENTRY = "<iQI"
+
+
+def _minified_text(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _minified(value) -> bytes:
+    return _minified_text(value).encode("utf-8")
+
+
+def encode_snapshot(dashboard: dict) -> bytes:
+    """Encode a milestone dashboard in the indexed snapshot format."""
+    phases = dashboard.get("phases", [])
+    sections = [_minified(dict(dashboard, phases=None))] + [_minified(p) for p in phases]
+    numbers = [-1] + [p.get("number", -1) for p in phases]
+
+    import struct
+    offset = struct.calcsize(_SNAPSHOT_HEADER) + struct.calcsize(_SNAPSHOT_ENTRY) * len(sections)
+    index = []
+    for number, section in zip(numbers, sections):
+        index.append(struct.pack(_SNAPSHOT_ENTRY, number, offset, len(section)))
+        offset += len(section)
+    header = struct.pack(_SNAPSHOT_HEADER, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, len(sections))
+    return b"".join([header] + index + sections)
+
+
+def read_snapshot_index(data) -> list:
+    """[(phase number, offset, length)] of a snapshot in bytes/mmap; entry 0 is the header section."""
+    import struct
+    magic, version, _, count = struct.unpack_from(_SNAPSHOT_HEADER, data, 0)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError("Not a WXCODE dashboard snapshot (or unsupported version)")
+    header_size, entry_size = struct.calcsize(_SNAPSHOT_HEADER), struct.calcsize(_SNAPSHOT_ENTRY)
+    return [struct.unpack_from(_SNAPSHOT_ENTRY, data, header_size + i * entry_size) for i in range(count)]
+
+
+def read_snapshot_phase(data, number: int) -> Optional[dict]:
+    """Decode only the phase with this number from a snapshot."""
+    for phase_number, offset, length in read_snapshot_index(data)[1:]:
+        if phase_number == number:
+            return json.loads(bytes(data[offset:offset + length]))
+    return None
+
+
+def decode_snapshot(data) -> dict:
+    """Decode a whole snapshot back into the dashboard dict."""
+    sections = [json.loads(bytes(data[offset:offset + length])) for _, offset, length in read_snapshot_index(data)]
+    dashboard = sections[0]
+    dashboard["phases"] = sections[1:]
+    return dashboard
+
+
+def snapshot_path(dashboard_path: Path) -> Path:
+    return dashboard_path.with_suffix(SNAPSHOT_SUFFIX)
+
+
+def write_snapshot(dashboard_path: Path, dashboard: dict, changed: bool = True) -> bool:
+    """Write the .wxds snapshot next to a milestone dashboard.
+
+    Follows the JSON file: rewritten when the dashboard was (changed), or
+    when the snapshot is missing. Returns True if it was written.
+    """
+    path = snapshot_path(dashboard_path)
+    if not changed and path.exists():
+        return False
+    with timed("serialization"):
+        data = encode_snapshot(dashboard)
+    atomic_write_bytes(path, data)
+    return True
+
+
+def is_dashboard_output(name: str) -> bool:
+    """Whether a file name is one of the generator's own outputs."""
+    return name.startswith("dashboard") and name.endswith((".json", ".jsonl", SNAPSHOT_SUFFIX))
+
+
+STATE_FILENAME = ".dashboard-state.json"
+
+
+def run_signature(args, wxcode_version: str) -> str:
+    """Everything besides the planning files that changes what a run produces."""
+    try:
+        st = os.stat(__file__)
+        generator_stamp = [st.st_mtime_ns, st.st_size]
+    except OSError:
+        generator_stamp = None
+    return json.dumps([
+        CACHE_VERSION, generator_stamp, wxcode_version,
+        args.all, args.milestone, args.phase, args.compact
+    ])
+
+
+# Runs with different options keep separate baselines (e.g. --all and --phase)
+STATE_MAX_RUNS = 4
+
+
+def planning_tree(planning_dir: Path) -> dict:
+    """Stat-only Merkle tree of the planning files.
+
+    Maps each directory (relative POSIX path, "" for .planning/ itself) to its
+    files' [mtime_ns, size], its subdirectory names and a hash over those, the
+    subdirectories' hashes and its own mtime. The root's mtime is left out since
+    every dashboard write bumps it; hidden files and our outputs are skipped.
+    Costs one scandir per directory and one stat per file; nothing is read.
+    """
+    import hashlib
+    tree = {}
+
+    def visit(directory: str, rel: str, st_mtime_ns: Optional[int]) -> str:
+        files, dirs = {}, []
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            entries = []
+        digest = hashlib.sha256(f"{st_mtime_ns}\n".encode("ascii"))
+        for entry in entries:
+            name = entry.name
+            if name.startswith(".") or is_dashboard_output(name):
+                continue
+            try:
+                st = entry.stat()
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                dirs.append(name)
+                child = visit(entry.path, f"{rel}/{name}" if rel else name, st.st_mtime_ns)
+                digest.update(f"d\0{name}\0{child}\n".encode("utf-8", "surrogateescape"))
+            else:
+                files[name] = [st.st_mtime_ns, st.st_size]
+                digest.update(f"f\0{name}\0{st.st_mtime_ns}\0{st.st_size}\n".encode("utf-8", "surrogateescape"))
+        node_hash = digest.hexdigest()
+        tree[rel] = {"hash": node_hash, "files": files, "dirs": dirs}
+        return node_hash
+
+    visit(str(planning_dir), "", None)
+    return tree
+
+
+def diff_planning_trees(planning_dir: Path, old: dict, new: dict) -> set:
+    """(path, is_dir) pairs that differ between two planning trees.
+
+    Subtrees with equal hashes are skipped without looking at their entries,
+    so the cost follows the size of the change rather than of the tree.
+    """
+    changes = set()
+    pending = [""]
+    while pending:
+        rel = pending.pop()
+        before, after = old.get(rel), new.get(rel)
+        if before is None or after is None or before.get("hash") == after["hash"]:
+            continue
+        directory = planning_dir / rel if rel else planning_dir
+        before_files = before.get("files", {})
+        for name in before_files.keys() | after["files"].keys():
+            if before_files.get(name) != after["files"].get(name):
+                changes.add((directory / name, False))
+        before_dirs = set(before.get("dirs", []))
+        for name in before_dirs ^ set(after["dirs"]):
+            changes.add((directory / name, True))
+        for name in before_dirs & set(after["dirs"]):
+            pending.append(f"{rel}/{name}" if rel else name)
+    return changes
+
+
+def load_planning_state(planning_dir: Path, signature: str) -> Optional[dict]:
+    """The tree and outputs recorded by the last run with this signature.
+
+    None when there is no such run or one of its outputs has since gone missing.
+    """
+    try:
+        state = json.loads((planning_dir / STATE_FILENAME).read_text(encoding="utf-8"))
+        run = state["runs"][signature]
+        if not isinstance(run["tree"][""]["hash"], str):
+            return None
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not all((planning_dir / name).exists() for name in run.get("outputs", [])):
+        return None
+    return run
+
+
+def planning_changes(planning_dir: Path, run: Optional[dict], tree: dict) -> Optional[set]:
+    """Dashboard-relevant changes between a recorded run (see load_planning_state) and tree.
+
+    An empty set means every dashboard is up to date; None means there is no
+    usable baseline and everything has to be regenerated.
+    """
+    if run is None:
+        return None
+    if run["tree"][""]["hash"] == tree[""]["hash"]:
+        return set()
+    return {
+        (path, is_dir) for path, is_dir in diff_planning_trees(planning_dir, run["tree"], tree)
+        if is_watched_change(path, is_dir)
+    }
+
+
+def save_planning_state(planning_dir: Path, signature: str, tree: dict, outputs: list):
+    """Record tree and the output file names as the baseline of this signature.
+
+    Only the most recent STATE_MAX_RUNS signatures are kept.
+    """
+    try:
+        runs = json.loads((planning_dir / STATE_FILENAME).read_text(encoding="utf-8"))["runs"]
+        if not isinstance(runs, dict):
+            runs = {}
+    except (OSError, ValueError, KeyError, TypeError):
+        runs = {}
+    runs.pop(signature, None)
+    runs[signature] = {"tree": tree, "outputs": sorted(set(outputs))}
+    while len(runs) > STATE_MAX_RUNS:
+        del runs[next(iter(runs))]
+    try:
+        atomic_write_text(planning_dir / STATE_FILENAME, json.dumps({"runs": runs}))
+    except OSError:
+        pass
+
+
+# Bump whenever the output of a cached parser or the cache key format changes, so
+# stale entries are discarded
+CACHE_VERSION = 9
+CACHE_FILENAME = ".dashboard-cache.json"
+
+
+def file_stamp(path: Path) -> Optional[list]:
+    """Return [mtime_ns, size] for a file, or None if it does not exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+# Threads per prefetch batch: reads are latency-bound, so this may exceed the CPU count
+READ_WORKERS = 8
+
+
+class FsSnapshot:
+    """Per-run view of the .planning tree built from os.scandir.
+
+    Each directory is listed at most once (on first use) and each entry is
+    stat'ed at most once, so the many exists/is_dir/stat/iterdir checks made
+    while generating dashboards cost one syscall per directory or file.
+    Parsed documents and phase trees are memoized per path the same way, so
+    milestones that fall back to the shared root phases/ or ROADMAP.md parse
+    them once. Files can be prefetched concurrently and are then parsed from
+    memory. Create a new snapshot for every run; it never notices later changes.
+    """
+
+    def __init__(self):
+        self.listings = {}
+        self.stat_results = {}
+        self.parsed = {}
+        self.buffers = {}
+        self.heads = {}
+        # Filesystem calls the callers would have made vs. calls actually made
+        self.lookups = 0
+        self.syscalls = 0
+        # Memoized parses computed vs. served again from memory
+        self.parses = 0
+        self.parses_reused = 0
+
+    def listing(self, directory: Path) -> Optional[dict]:
+        """Return {name: os.DirEntry} for a directory, or None if it is not one."""
+        key = str(directory)
+        if key not in self.listings:
+            self.syscalls += 1
+            try:
+                with os.scandir(directory) as it:
+                    self.listings[key] = {entry.name: entry for entry in it}
+            except OSError:
+                self.listings[key] = None
+        return self.listings[key]
+
+    def entry(self, path: Path):
+        listing = self.listing(path.parent)
+        return listing.get(path.name) if listing else None
+
+    def exists(self, path: Path) -> bool:
+        self.lookups += 1
+        return self.entry(path) is not None
+
+    def is_dir(self, path: Path) -> bool:
+        self.lookups += 1
+        entry = self.entry(path)
+        try:
+            return entry is not None and entry.is_dir()
+        except OSError:
+            return False
+
+    def stat(self, path: Path) -> Optional[os.stat_result]:
+        self.lookups += 1
+        key = str(path)
+        if key not in self.stat_results:
+            entry = self.entry(path)
+            result = None
+            if entry is not None:
+                # DirEntry.stat() is free on Windows, one syscall elsewhere
+                if os.name != "nt":
+                    self.syscalls += 1
+                try:
+                    result = entry.stat()
+                except OSError:
+                    pass
+            self.stat_results[key] = result
+        return self.stat_results[key]
+
+    def stamp(self, path: Path) -> Optional[list]:
+        """Snapshot equivalent of file_stamp()."""
+        st = self.stat(path)
+        return [st.st_mtime_ns, st.st_size] if st else None
+
+    def children(self, directory: Path) -> list:
+        """Paths of all entries in a directory (unsorted, like iterdir)."""
+        self.lookups += 1
+        listing = self.listing(directory)
+        return [directory / name for name in listing] if listing else []
+
+    def subdirs(self, directory: Path) -> list:
+        """Paths of subdirectories (unsorted), replacing iterdir() + is_dir() per entry."""
+        listing = self.listing(directory)
+        if not listing:
+            self.lookups += 1
+            return []
+        self.lookups += 1 + len(listing)
+        result = []
+        for name, entry in listing.items():
+            try:
+                if entry.is_dir():
+                    result.append(directory / name)
+            except OSError:
+                pass
+        return result
+
+    def files_ending(self, directory: Path, suffix: str) -> list:
+        """Sorted paths in a directory whose name ends with suffix, like glob("*" + suffix)."""
+        self.lookups += 1
+        listing = self.listing(directory)
+        if not listing:
+            return []
+        suffix = os.path.normcase(suffix)
+        return sorted(directory / name for name in listing if os.path.normcase(name).endswith(suffix))
+
+    def prefetch(self, paths: list, heads: list = ()):
+        """Read files concurrently (at most READ_WORKERS at a time) for read() to serve.
+
+        On slow or remote filesystems (bind mounts, WSL shares) per-read latency
+        dominates, so overlapping the reads matters more than the CPU count.
+        heads are SUMMARY.md files read only as far as read_summary_head() goes,
+        for read_head(). Unreadable files are left for read() to report.
+        """
+        jobs = [(path, False) for path in paths if path not in self.buffers]
+        jobs += [(path, True) for path in heads if path not in self.heads]
+        if len(jobs) < 2 or READ_WORKERS < 2:
+            return
+        from concurrent.futures import ThreadPoolExecutor
+
+        def load(job: tuple) -> Optional[str]:
+            path, head = job
+            try:
+                return summary_head_text(path) if head else path.read_text()
+            except (OSError, UnicodeDecodeError):
+                return None
+
+        with timed("io"):
+            with ThreadPoolExecutor(min(READ_WORKERS, len(jobs))) as executor:
+                for (path, head), text in zip(jobs, executor.map(load, jobs)):
+                    if text is not None:
+                        count_read(text)
+                        (self.heads if head else self.buffers)[path] = text
+
+    def read(self, path: Path) -> str:
+        """Contents of a file, from the prefetched buffer if there is one (which is released)."""
+        text = self.buffers.pop(path, None)
+        return read_file(path) if text is None else text
+
+    def read_head(self, path: Path) -> str:
+        """read_summary_head() of a file, from the prefetched heads if there is one."""
+        text = self.heads.pop(path, None)
+        return read_summary_head(path) if text is None else text
+
+    def memoized(self, kind: str, path: Path, compute):
+        """Return compute() for (kind, path), computing it once per snapshot.
+
+        Stored as JSON like ParseCache entries, so each caller gets its own
+        copy to mutate and the values match what the parse cache hands out.
+        """
+        key = f"{kind}:{path}"
+        if key in self.parsed:
+            self.parses_reused += 1
+        else:
+            self.parses += 1
+            self.parsed[key] = json.dumps(compute())
+        return json.loads(self.parsed[key])
+
+    def report(self) -> dict:
+        return {
+            "lookups": self.lookups,
+            "syscalls": self.syscalls,
+            "syscalls_avoided": max(0, self.lookups - self.syscalls),
+            "parses": self.parses,
+            "parses_reused": self.parses_reused,
+        }
+
+    def counts(self) -> tuple:
+        """Counters to send back from a worker process, see merge_counts()."""
+        return self.lookups, self.syscalls, self.parses, self.parses_reused
+
+    def merge_counts(self, counts: tuple):
+        """Add the counts() of a worker process's own snapshot."""
+        self.lookups += counts[0]
+        self.syscalls += counts[1]
+        self.parses += counts[2]
+        self.parses_reused += counts[3]
+
+
+class ParseCache:
+    """Persistent cache of parser output keyed by path, mtime, size and version.
+
+    Paths are stored relative to the directory holding the cache file, so the
+    cache stays valid when the project is moved or checked out elsewhere.
+    Entries are stored as JSON, so every value handed out is a fresh copy that
+    callers may mutate freely. Values are returned in the same JSON round-tripped
+    form on cold and warm runs, which keeps the generated dashboards identical.
+    version defaults to CACHE_VERSION; caches of other parsers pass their own.
+    """
+
+    def __init__(self, path: Path, version: int = CACHE_VERSION):
+        self.path = path
+        self.root = path.parent
+        self._prefix = os.path.join(str(self.root), "")
+        self.version = version
+        self.entries = {}
+        self.used = set()
+        self.updated = set()
+        self.dirty = False
+
+    def load(self) -> "ParseCache":
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+                if data.get("version") == self.version:
+                    self.entries = data.get("entries", {})
+            except (json.JSONDecodeError, OSError, AttributeError):
+                pass
+        return self
+
+    @staticmethod
+    def stamp(path: Path, extra_paths: tuple, fs: Optional[FsSnapshot]) -> list:
+        stamp_of = fs.stamp if fs else file_stamp
+        return [stamp_of(path)] + [stamp_of(p) for p in extra_paths]
+
+    def key(self, kind: str, path: Path) -> str:
+        """kind:path, with path relative to the cache directory."""
+        text = str(path)
+        relative = text[len(self._prefix):] if text.startswith(self._prefix) else os.path.relpath(text, self.root)
+        return f"{kind}:{relative.replace(os.sep, '/')}"
+
+    def fresh(self, kind: str, path: Path, extra_paths: tuple = (), fs: Optional[FsSnapshot] = None) -> bool:
+        """Whether get() would return a stored result without running the parser."""
+        entry = self.entries.get(self.key(kind, path))
+        return bool(entry) and entry.get("stamp") == self.stamp(path, extra_paths, fs)
+
+    def get(self, kind: str, path: Path, parser, extra_paths: tuple = (), fs: Optional[FsSnapshot] = None):
+        """Return parser(path), reusing the stored result if no input file changed."""
+        key = self.key(kind, path)
+        stamp = self.stamp(path, extra_paths, fs)
+        self.used.add(key)
+
+        entry = self.entries.get(key)
+        if entry and entry.get("stamp") == stamp:
+            count("cache_hits")
+            return json.loads(json.dumps(entry["data"]))
+
+        count("cache_misses")
+        data = parser(path)
+        self.entries[key] = {"stamp": stamp, "data": data}
+        self.updated.add(key)
+        self.dirty = True
+        return json.loads(json.dumps(data))
+
+    def take_updates(self) -> tuple:
+        """Return and reset (new entries, used keys) since the last call, for merging."""
+        updates = ({key: self.entries[key] for key in self.updated}, self.used)
+        self.updated = set()
+        self.used = set()
+        return updates
+
+    def merge(self, updates: tuple):
+        """Merge entries recorded by another process (see take_updates)."""
+        entries, used = updates
+        self.entries.update(entries)
+        self.used |= used
+        if entries:
+            self.dirty = True
+
+    def save(self):
+        """Write the cache back, dropping entries whose files no longer exist."""
+        for key in list(self.entries):
+            if key not in self.used and not (self.root / key.split(":", 1)[1]).exists():
+                del self.entries[key]
+                self.dirty = True
+
+        if not self.dirty:
+            return
+
+        try:
+            atomic_write_text(self.path, json.dumps(
+                {"version": self.version, "entries": self.entries},
+                ensure_ascii=False, separators=(",", ":")
+            ))
+        except OSError:
+            pass
+        self.dirty = False
+
+
+# Per-process state for pool workers (see init_worker)
+_worker_cache: Optional[ParseCache] = None
+
+
+def init_worker(cache_path: Optional[Path], collect_stats: bool = False):
+    """Initialize a pool worker with its own view of the parse cache."""
+    global _worker_cache
+    _worker_cache = ParseCache(cache_path).load() if cache_path else None
+    reset_stats(collect_stats)
+
+
+def take_worker_updates() -> tuple:
+    return _worker_cache.take_updates() if _worker_cache else ({}, set())
+
+
+def take_worker_stats() -> Optional[dict]:
+    return _stats.take() if _stats is not None else None
+
+
+def merge_worker_stats(data: Optional[dict]):
+    if _stats is not None:
+        _stats.merge(data)
+
+
+def create_pool(jobs: int, cache: Optional[ParseCache]) -> Optional[ProcessPoolExecutor]:
+    """Create a worker pool for --jobs, or None to run serially."""
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1:
+        return None
+    from concurrent.futures import ProcessPoolExecutor
+    try:
+        return ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=init_worker,
+            initargs=(cache.path if cache else None, _stats is not None)
+        )
+    except (OSError, NotImplementedError):
+        # No usable multiprocessing on this platform; fall back to serial
+        return None
+
+
+def cached_parse(
+    cache: Optional[ParseCache],
+    kind: str,
+    path: Path,
+    parser,
+    extra_paths: tuple = (),
+    fs: Optional[FsSnapshot] = None
+):
+    """Run a parser through the cache when one is active."""
+    if cache is None:
+        return parser(path)
+    return cache.get(kind, path, parser, extra_paths, fs)
+
+
+# Frontmatter is parsed as a YAML subset: block mappings and sequences (including
+# maps inside list items), flow [..] / {..} collections, quoted and plain scalars,
+# | and > block scalars and # comments. Anchors, tags and multiple documents are
+# not supported; lines that do not fit are skipped rather than rejected.
+_FRONTMATTER_END_RE = re.compile(r'^[ \t]*---[ \t]*\r?$', re.MULTILINE)
+_YAML_KEY_RE = re.compile(r'''("(?:[^"\\]|\\.)*"|'(?:[^']|'')*'|[^\s'"#\[\]{},][^#]*?)\s*:(?:\s+|$)''')
+# A "key: value" line the block parser would read as a plain scalar
+_YAML_FLAT_LINE_RE = re.compile(r'([A-Za-z_][\w.-]*)[ \t]*:[ \t]+([^\s#\[\]{}|>"\'-][^#]*)$')
+_YAML_FLOW_SPECIAL_RE = re.compile(r'[\[\]{}"\']')
+_YAML_FLOW_PLAIN_RE = re.compile(r'[^,\]}]*')
+_YAML_FLOW_KEY_RE = re.compile(r'[^,\]}:]*')
+_YAML_BLOCK_SCALAR_RE = re.compile(r'[|>][-+1-9]*$')
+_YAML_INT_RE = re.compile(r'[-+]?\d+$')
+_YAML_FLOAT_RE = re.compile(r'[-+]?(?:\d+\.\d*|\.\d+)(?:[eE][-+]?\d+)?$')
+
+
+def parse_markdown_frontmatter(content: str) -> dict:
+    """Parse the YAML frontmatter of a markdown file (the subset described above).
+
+    The frontmatter runs from a first line of --- to the next line that is
+    exactly ---. Files without one, or whose frontmatter is not a mapping,
+    give {}.
+    """
+    if not content.startswith("---"):
+        return {}
+    first_end = content.find("\n")
+    if first_end < 0 or content[:first_end].strip() != "---":
+        return {}
+    end = _FRONTMATTER_END_RE.search(content, first_end + 1)
+    if end is None:
+        return {}
+    return parse_yaml_subset(content[first_end + 1:end.start()].split("\n"))
+
+
+def parse_yaml_subset(lines: list) -> dict:
+    """Parse YAML lines (the frontmatter subset) into a dict."""
+    # Flat "key: value" frontmatter, as PLAN.md files mostly have, needs no block parsing
+    flat = {}
+    for line in lines:
+        if not line:
+            continue
+        match = _YAML_FLAT_LINE_RE.match(line)
+        if match is None:
+            break
+        flat[match.group(1)] = _yaml_scalar(match.group(2).rstrip())
+    else:
+        return flat
+
+    # (indent, content without comment, raw line) per line, computed once
+    rows = [(len(line) - len(line.lstrip(" ")), _yaml_content(line), line) for line in lines]
+    start = _yaml_next(rows, 0)
+    if start >= len(rows):
+        return {}
+    value, _ = _yaml_node(rows, start, rows[start][0])
+    return value if isinstance(value, dict) else {}
+
+
+def _yaml_content(line: str) -> str:
+    """A line without indentation, trailing spaces and # comment."""
+    if "#" in line:
+        quote = None
+        for pos, char in enumerate(line):
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in "\"'" and (pos == 0 or line[pos - 1] in " \t[{,:-"):
+                quote = char
+            elif char == "#" and (pos == 0 or line[pos - 1] in " \t"):
+                line = line[:pos]
+                break
+    return line.strip()
+
+
+def _yaml_next(rows: list, index: int) -> int:
+    """Index of the first line from index on that is not blank or a comment."""
+    while index < len(rows) and not rows[index][1]:
+        index += 1
+    return index
+
+
+def _yaml_is_item(content: str) -> bool:
+    return content == "-" or content.startswith("- ")
+
+
+def _yaml_node(rows: list, index: int, indent: int, first: Optional[str] = None) -> tuple:
+    """Parse the block node starting at rows[index] at column indent.
+
+    first replaces that line's content, for a node that starts after a list
+    item's "- ". Returns (value, index of the next unconsumed line).
+    """
+    content = rows[index][1] if first is None else first
+    if _yaml_is_item(content):
+        return _yaml_sequence(rows, index, indent, first)
+    if _YAML_KEY_RE.match(content):
+        return _yaml_mapping(rows, index, indent, first)
+    return _yaml_inline(rows, index, content, indent)
+
+
+def _yaml_sequence(rows: list, index: int, indent: int, first: Optional[str]) -> tuple:
+    items = []
+    content = first
+    while index < len(rows):
+        if content is None:
+            line_indent, content = rows[index][:2]
+            if line_indent < indent:
+                break
+            if line_indent > indent:
+                index = _yaml_next(rows, index + 1)  # Stray deeper line
+                content = None
+                continue
+            if not _yaml_is_item(content):
+                break
+        rest = content[1:].lstrip()
+        if not rest:
+            value, index = _yaml_nested(rows, index, indent, False)
+        elif _yaml_is_item(rest) or _YAML_KEY_RE.match(rest):
+            # "- key: value" opens a map (or "- - x" a list) at the column of rest
+            value, index = _yaml_node(rows, index, indent + len(content) - len(rest), rest)
+        else:
+            value, index = _yaml_inline(rows, index, rest, indent)
+        items.append(value)
+        content = None
+    return items, index
+
+
+def _yaml_mapping(rows: list, index: int, indent: int, first: Optional[str]) -> tuple:
+    result = {}
+    content = first
+    while index < len(rows):
+        if content is None:
+            line_indent, content = rows[index][:2]
+            if line_indent < indent:
+                break
+            if line_indent > indent:
+                index = _yaml_next(rows, index + 1)  # Stray deeper line
+                content = None
+                continue
+        match = _YAML_KEY_RE.match(content)
+        if not match:
+            if _yaml_is_item(content):
+                break
+            index = _yaml_next(rows, index + 1)
+            content = None
+            continue
+        key = match.group(1)
+        if key[0] in "\"'":
+            key = str(_yaml_scalar(key))
+        rest = content[match.end():]
+        if rest and rest[0] not in "|>[{":
+            value, index = _yaml_scalar(rest), _yaml_next(rows, index + 1)
+        elif rest:
+            value, index = _yaml_inline(rows, index, rest, indent)
+        else:
+            value, index = _yaml_nested(rows, index, indent, True)
+        result[key] = value
+        content = None
+    return result, index
+
+
+def _yaml_nested(rows: list, index: int, indent: int, same_indent_list: bool) -> tuple:
+    """Value of an empty "key:" or "-" on rows[index]: the deeper block after it, or None.
+
+    A mapping key may also own a list written at its own indentation.
+    """
+    following = _yaml_next(rows, index + 1)
+    if following < len(rows):
+        following_indent, content = rows[following][:2]
+        if following_indent > indent or (
+            same_indent_list and following_indent == indent and _yaml_is_item(content)
+        ):
+            return _yaml_node(rows, following, following_indent)
+    return None, following
+
+
+def _yaml_inline(rows: list, index: int, text: str, indent: int) -> tuple:
+    """Value written after "key:" or "- " on rows[index]: a block scalar, flow collection or scalar."""
+    if text[0] in "|>" and _YAML_BLOCK_SCALAR_RE.match(text):
+        return _yaml_block_scalar(rows, index, text, indent)
+    end = index + 1
+    if text[0] in "[{":
+        # Flow collections may continue over the next rows
+        closer = "]" if text[0] == "[" else "}"
+        while not text.endswith(closer) and end < len(rows) and rows[end][0] > indent:
+            text += " " + rows[end][1]
+            end += 1
+        inner = text[1:-1]
+        if closer == "]" and text.endswith("]") and not _YAML_FLOW_SPECIAL_RE.search(inner):
+            # Flat [a, b] list: split on commas (a trailing comma adds no item)
+            items = inner.split(",")
+            if not items[-1].strip():
+                items.pop()
+            value = [_yaml_scalar(item.strip()) for item in items]
+        else:
+            try:
+                value, pos = _yaml_flow(text, 0)
+                if text[pos:].strip():
+                    value = text
+            except (IndexError, ValueError):
+                value = text
+    else:
+        value = _yaml_scalar(text)
+    return value, _yaml_next(rows, end)
+
+
+def _yaml_block_scalar(rows: list, index: int, header: str, indent: int) -> tuple:
+    """A | (literal) or > (folded) scalar on the rows indented deeper than indent."""
+    body = []
+    end = index + 1
+    block_indent = None
+    while end < len(rows):
+        line = rows[end][2].rstrip()
+        if line:
+            line_indent = rows[end][0]
+            if line_indent <= indent:
+                break
+            if block_indent is None:
+                block_indent = line_indent
+            line = line[min(block_indent, line_indent):]
+        body.append(line)
+        end += 1
+    while body and not body[-1]:
+        body.pop()
+    if header[0] == "|":
+        text = "\n".join(body)
+    else:
+        text = ""
+        for line in body:
+            if not line:
+                text += "\n"
+            elif text and not text.endswith("\n"):
+                text += " " + line
+            else:
+                text += line
+    if "-" not in header and text:
+        text += "\n"
+    return text, _yaml_next(rows, end)
+
+
+def _yaml_flow(text: str, pos: int) -> tuple:
+    """Parse the flow node at text[pos]; returns (value, position after it)."""
+    while text[pos] == " ":
+        pos += 1
+    opener = text[pos]
+    if opener in "[{":
+        closer = "]" if opener == "[" else "}"
+        items = [] if opener == "[" else {}
+        pos += 1
+        while True:
+            while text[pos] == " ":
+                pos += 1
+            if text[pos] == closer:
+                return items, pos + 1
+            if opener == "[":
+                value, pos = _yaml_flow(text, pos)
+                items.append(value)
+            else:
+                key, pos = _yaml_flow_scalar(text, pos, True)
+                if text[pos] == ":":
+                    value, pos = _yaml_flow(text, pos + 1)
+                else:
+                    value = None
+                items["" if key is None else str(key)] = value
+            while text[pos] == " ":
+                pos += 1
+            if text[pos] == ",":
+                pos += 1
+            elif text[pos] != closer:
+                raise ValueError("unterminated flow collection")
+    return _yaml_flow_scalar(text, pos)
+
+
+def _yaml_flow_scalar(text: str, pos: int, key: bool = False) -> tuple:
+    """A quoted or plain scalar inside a flow collection, ending at , ] } (or : for a key)."""
+    while text[pos] == " ":
+        pos += 1
+    if text[pos] in "\"'":
+        quote = text[pos]
+        end = pos + 1
+        while True:
+            end = text.index(quote, end)
+            if quote == '"' and text[end - 1] == "\\" and text[end - 2] != "\\":
+                end += 1
+            elif quote == "'" and text[end + 1:end + 2] == "'":
+                end += 2
+            else:
+                break
+        return _yaml_scalar(text[pos:end + 1]), end + 1
+    end = (_YAML_FLOW_KEY_RE if key else _YAML_FLOW_PLAIN_RE).match(text, pos).end()
+    return _yaml_scalar(text[pos:end].strip()), end
+
+
+def _yaml_scalar(text: str):
+    """Resolve a scalar: quoted strings, null, booleans, integers, floats, else the text."""
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'":
+        if text[0] == "'":
+            return text[1:-1].replace("''", "'")
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text[1:-1]
+    if not text or text == "~":
+        return None
+    if text[0] in "0123456789+-.":
+        if _YAML_INT_RE.match(text):
+            return int(text)
+        if _YAML_FLOAT_RE.match(text):
+            return float(text)
+    elif len(text) <= 5:
+        lowered = text.lower()
+        if lowered == "null":
+            return None
+        if lowered in ("true", "false"):
+            return lowered == "true"
+    return text
+
+
+# Single token stream for scan_plan_content: task boundaries and <objective>
+_PLAN_TOKEN_RE = re.compile(r'<task[^>]*>|</task>|<objective>')
+_OBJECTIVE_LINE_RE = re.compile(r'\s*(.*?)\n', re.DOTALL)
+_TASK_PREFIX_RE = re.compile(r'^Task\s+\d+:\s*')
+_OBJECTIVE_TAG = "<objective>"
+_TASK_FIELDS = (
+    ("name", "<name>", "</name>"),
+    ("files", "<files>", "</files>"),
+    ("action", "<action>", "</action>"),
+)
+
+
+def _build_task(content: str, sequence: int, body_start: int, body_end: int) -> dict:
+    """Build a task dict from the body content[body_start:body_end]."""
+    task = {"sequence": sequence}
+
+    # Bounded lookups: first <tag>, then the first </tag> after it, inside the body
+    fields = {}
+    for field, open_tag, close_tag in _TASK_FIELDS:
+        open_pos = content.find(open_tag, body_start, body_end)
+        if open_pos >= 0:
+            value_start = open_pos + len(open_tag)
+            close_pos = content.find(close_tag, value_start, body_end)
+            if close_pos >= 0:
+                fields[field] = content[value_start:close_pos]
+
+    if "name" in fields:
+        # Remove "Task N: " prefix if present
+        task["name"] = _TASK_PREFIX_RE.sub("", fields["name"].strip(), count=1)
+
+    if "files" in fields:
+        # Take first file if comma-separated
+        task["file"] = fields["files"].strip().partition(",")[0].strip()
+
+    if "action" in fields:
+        # Take first line, capped at 200 chars
+        task["description"] = fields["action"].strip().partition("\n")[0].strip()[:200]
+
+    return task
+
+
+def scan_plan_content(content: str, spans: Optional[list] = None) -> tuple:
+    """Scan PLAN.md content once for <task> blocks and the <objective> line.
+
+    Returns (objective, tasks). objective is the first line after <objective>
+    (None if absent); tasks are the dicts described in extract_xml_tasks.
+    A task body runs to the first </task>, and within it the first <tag> and
+    the first </tag> after it win, matching the per-field regexes this replaced.
+    With spans, the (start, end) offsets of each task body are appended to it.
+    """
+    tasks = []
+    objective_pos = None
+    body_start = None  # offset of the current task body, None outside a task
+    pos = 0
+
+    while pos is not None:
+        restart = None
+        for tag in _PLAN_TOKEN_RE.finditer(content, pos):
+            text = tag.group()
+
+            if text == "</task>":
+                if body_start is not None:
+                    tasks.append(_build_task(content, len(tasks) + 1, body_start, tag.start()))
+                    if spans is not None:
+                        spans.append((body_start, tag.start()))
+                    body_start = None
+            elif text == _OBJECTIVE_TAG:
+                if objective_pos is None:
+                    objective_pos = tag.end()
+            elif body_start is None:
+                # Task opener
+                if objective_pos is None and _OBJECTIVE_TAG in text:
+                    # A malformed opener such as "<task <objective>" swallowed the tag
+                    objective_pos = tag.start() + text.index(_OBJECTIVE_TAG) + len(_OBJECTIVE_TAG)
+                body_start = tag.end()
+            elif "<" in text[1:]:
+                # "<task" inside a body whose [^>]* ran over other tags: rescan them
+                restart = tag.start() + 1
+                break
+        pos = restart
+
+    # An unterminated <task> (body_start still set) is dropped, as before
+
+    objective = None
+    if objective_pos is not None:
+        objective_match = _OBJECTIVE_LINE_RE.match(content, objective_pos)
+        if objective_match:
+            objective = objective_match.group(1)
+
+    return objective, tasks
+
+
+def extract_xml_tasks(content: str) -> list:
+    """Extract tasks from XML <task> blocks in PLAN.md content."""
+    return scan_plan_content(content)[1]
+
+
+_PHASE_DIR_RE = re.compile(r'\d+-')
+_PHASE_DIR_NAME_RE = re.compile(r'(\d+)-(.+)')
+_PLAN_FILENAME_RE = re.compile(r'(\d+)-(\d+)-PLAN\.md')
+_SUMMARY_PARAGRAPH_RE = re.compile(r'---.*?---\s*(.+?)(?:\n\n|\n#)', re.DOTALL)
+_NON_SPACE_RE = re.compile(r'\S')
+_PLAN_REFERENCE_RE = re.compile(r'(\d+)[-.](\d+)')
+_DURATION_PART_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(h|hrs?|hours?|m|mins?|minutes?|s|secs?|seconds?)?\b', re.IGNORECASE)
+_DATE_ONLY_RE = re.compile(r'\d{4}-\d{2}-\d{2}$')
+
+# SUMMARY.md heads are read in pieces of this many characters; past the
+# maximum the head is not worth stopping early for
+SUMMARY_HEAD_CHUNK_CHARS = 4096
+SUMMARY_HEAD_MAX_CHARS = 64 * 1024
+
+
+def read_summary_head(summary_path: Path) -> str:
+    """Read a SUMMARY.md only as far as its frontmatter and first paragraph.
+
+    Returns a prefix of the file on which parse_markdown_frontmatter and
+    _SUMMARY_PARAGRAPH_RE give the same results as on the whole file (see
+    _summary_head_complete). Files that do not open with a --- line, or whose
+    head runs past SUMMARY_HEAD_MAX_CHARS, are read in full.
+    """
+    text = summary_head_text(summary_path)
+    count_read(text)
+    return text
+
+
+def summary_head_text(summary_path: Path) -> str:
+    """read_summary_head() without the files_read/bytes_read counting (safe off the main thread)."""
+    with open(summary_path) as f:
+        text = f.read(SUMMARY_HEAD_CHUNK_CHARS)
+        while len(text) <= SUMMARY_HEAD_MAX_CHARS:
+            if _summary_head_complete(text):
+                return text
+            chunk = f.read(SUMMARY_HEAD_CHUNK_CHARS)
+            if not chunk:
+                return text
+            text += chunk
+        return text + f.read()
+
+
+def _summary_head_complete(text: str) -> bool:
+    """Whether reading past text can no longer change the frontmatter or summary paragraph.
+
+    The frontmatter must have closed, and after the first --- that the
+    paragraph regex closes on, non-blank text must be followed by a blank
+    line or a heading: the regex then matches the same way on any longer text.
+    """
+    first_end = text.find("\n")
+    if first_end < 0 or text[:first_end].strip() != "---":
+        return False
+    end = _FRONTMATTER_END_RE.search(text, first_end + 1)
+    if end is None or end.end() == len(text):
+        return False
+    content = _NON_SPACE_RE.search(text, text.find("---", 3) + 3)
+    if content is None:
+        return False
+    return text.find("\n\n", content.end()) >= 0 or text.find("\n#", content.end()) >= 0
+
+
+def detect_phases_dir(
+    planning_dir: Path,
+    milestone_folder: Optional[Path] = None,
+    fs: Optional[FsSnapshot] = None
+) -> Optional[Path]:
+    """Detect phases directory (nested or flat structure).
+
+    Handles multiple structures:
+    1. Nested: milestone_folder/phases/ (e.g., .planning/v1.0-PAGE_Login/phases/)
+    2. Flat: planning_dir/phases/ (e.g., .planning/phases/)
+    3. Marker folder: milestones/v1.0-PAGE_Login/ is empty, phases in .planning/phases/
+    """
+    fs = fs or FsSnapshot()
+
+    # Check nested structure first
+    if milestone_folder and fs.is_dir(milestone_folder / "phases"):
+        phases_dir = milestone_folder / "phases"
+        # Verify it has actual phase directories
+        phase_dirs = [d for d in fs.subdirs(phases_dir) if _PHASE_DIR_RE.match(d.name)]
+        if phase_dirs:
+            return phases_dir
+
+    # Fall back to flat structure (.planning/phases/)
+    if fs.is_dir(planning_dir / "phases"):
+        return planning_dir / "phases"
+
+    return None
+
+
+def parse_plan_file(plan_path: Path, fs: Optional[FsSnapshot] = None) -> dict:
+    """Parse a PLAN.md file and extract plan info with tasks.
+
+    With fs, the plan and its summary come from the snapshot (and its
+    prefetched buffers) instead of being read here.
+    """
+    read = fs.read if fs is not None else read_file
+    read_head = fs.read_head if fs is not None else read_summary_head
+    content = read(plan_path)
+    with timed("regex"):
+        frontmatter = parse_markdown_frontmatter(content)
+        spans = []
+        objective, tasks = scan_plan_content(content, spans)
+        # Candidate requirement IDs: the requirements field is what the plan
+        # covers, task bodies only mention others; build_requirement_index
+        # keeps the defined ones
+        requirements = list(dict.fromkeys(
+            _REQUIREMENT_ID_RE.findall(frontmatter_text(frontmatter.get("requirements")))
+        ))
+        mentioned = []
+        for start, end in spans:
+            mentioned.extend(_REQUIREMENT_ID_RE.findall(content, start, end))
+        mentioned = [req_id for req_id in dict.fromkeys(mentioned) if req_id not in requirements]
+
+    # Extract plan number from filename (e.g., 01-01-PLAN.md -> "1.1")
+    filename = plan_path.name
+    match = _PLAN_FILENAME_RE.match(filename)
+    if match:
+        phase_num = int(match.group(1))
+        plan_num = int(match.group(2))
+        plan_number = f"{phase_num}.{plan_num}"
+    else:
+        plan_number = "1.1"
+
+    # Extract plan name from objective or frontmatter
+    name = frontmatter_text(frontmatter.get("name"))
+    if not name:
+        if objective is not None:
+            name = objective.strip()[:100]
+        else:
+            name = plan_path.parent.name.replace("-", " ").title()
+
+    # Check if SUMMARY.md exists
+    summary_path = summary_path_for(plan_path)
+    summary_exists = fs.exists(summary_path) if fs is not None else summary_path.exists()
+    status = "complete" if summary_exists else "pending"
+
+    # Extract summary content if exists
+    summary_text = None
+    summary_frontmatter = {}
+    timing = {"started_at": None, "completed_at": None, "duration_minutes": None, "source": None}
+    if summary_exists:
+        summary_content = read_head(summary_path)
+        # Try to get first paragraph after frontmatter
+        with timed("regex"):
+            summary_frontmatter = parse_markdown_frontmatter(summary_content)
+            summary_match = _SUMMARY_PARAGRAPH_RE.search(summary_content)
+        if summary_match:
+            summary_text = summary_match.group(1).strip()[:200]
+        summary_stat = fs.stat(summary_path) if fs is not None else summary_path.stat()
+        timing = plan_timing(summary_frontmatter, summary_stat.st_mtime if summary_stat else None)
+
+    # Build task objects with proper IDs
+    task_objects = []
+    for task in tasks:
+        task_id = f"{plan_number}.{task['sequence']}"
+        task_objects.append({
+            "id": task_id,
+            "name": task.get("name", f"Task {task['sequence']}"),
+            "file": task.get("file"),
+            "status": status,  # Task status follows plan status
+            "description": task.get("description", "")
+        })
+
+    return {
+        "number": plan_number,
+        "name": name,
+        "status": status,
+        "summary": summary_text,
+        "requirements": requirements,
+        "requirements_mentioned": mentioned,
+        **plan_frontmatter_fields(frontmatter, summary_frontmatter, phase_num if match else 1),
+        "timing": timing,
+        "tasks": task_objects
+    }
+
+
+def frontmatter_text(value) -> str:
+    """A frontmatter value as one line of text ("" for null)."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, list):
+        return ", ".join(frontmatter_list(value))
+    if isinstance(value, dict):
+        return ", ".join(f"{key}: {frontmatter_text(item)}" for key, item in value.items())
+    return str(value)
+
+
+def frontmatter_list(value, split: bool = False) -> list:
+    """A frontmatter value as a list of non-empty strings.
+
+    Nested lists are flattened; with split, a plain "a, b" string is split on
+    commas (for keys such as tags that are often written without brackets).
+    """
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        text = frontmatter_text(value)
+        items = text.split(",") if split and isinstance(value, str) else [text]
+        return [item.strip() for item in items if item.strip()]
+    result = []
+    for item in value:
+        result.extend(frontmatter_list(item))
+    return result
+
+
+def plan_reference(value, phase_num: int) -> str:
+    """Normalize a depends_on entry ("01-02", "01-02-PLAN.md", 2) to a plan number like "1.2"."""
+    text = frontmatter_text(value).strip()
+    match = _PLAN_REFERENCE_RE.search(text)
+    if match:
+        return f"{int(match.group(1))}.{int(match.group(2))}"
+    if text.isdigit():
+        return f"{phase_num}.{int(text)}"
+    return text
+
+
+def plan_frontmatter_fields(plan: dict, summary: dict, phase_num: int) -> dict:
+    """Dashboard fields taken from PLAN.md and SUMMARY.md frontmatter.
+
+    SUMMARY.md wins for subsystem and tags. key_files comes from its key-files
+    (a bare list counts as modified); until a summary exists, modified lists
+    the PLAN.md files_modified. dependencies holds the plan's wave and
+    depends_on (as plan numbers) and the summary's requires/provides/affects.
+    """
+    key_files = summary.get("key-files")
+    if isinstance(key_files, dict):
+        created = frontmatter_list(key_files.get("created"), True)
+        modified = frontmatter_list(key_files.get("modified"), True)
+    elif key_files is not None:
+        created, modified = [], frontmatter_list(key_files, True)
+    else:
+        created, modified = [], frontmatter_list(plan.get("files_modified"), True)
+
+    requires = []
+    raw_requires = summary.get("requires")
+    for item in raw_requires if isinstance(raw_requires, list) else frontmatter_list(raw_requires):
+        if isinstance(item, dict):
+            phase = frontmatter_text(item.get("phase"))
+            requires.append({"phase": phase or None, "provides": frontmatter_list(item.get("provides"))})
+        elif frontmatter_text(item):
+            requires.append({"phase": frontmatter_text(item), "provides": []})
+
+    wave = plan.get("wave")
+    return {
+        "subsystem": frontmatter_text(summary.get("subsystem", plan.get("subsystem"))) or None,
+        "tags": frontmatter_list(summary.get("tags", plan.get("tags")), True),
+        "key_files": {"created": created, "modified": modified},
+        "dependencies": {
+            "wave": wave if isinstance(wave, int) and not isinstance(wave, bool) else None,
+            "depends_on": [plan_reference(item, phase_num) for item in frontmatter_list(plan.get("depends_on"), True)],
+            "requires": requires,
+            "provides": frontmatter_list(summary.get("provides")),
+            "affects": frontmatter_list(summary.get("affects"), True)
+        }
+    }
+
+
+def parse_duration_minutes(value) -> Optional[float]:
+    """Minutes in a SUMMARY duration such as "23min", "1h 15m" or 45 (None if unreadable)."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if value >= 0 else None
+    total = None
+    for amount, unit in _DURATION_PART_RE.findall(frontmatter_text(value)):
+        unit = unit[:1].lower()
+        total = (total or 0.0) + float(amount) * (60 if unit == "h" else 1 / 60 if unit == "s" else 1)
+    return None if total is None else round(total, 1)
+
+
+def parse_timestamp(value) -> Optional[float]:
+    """Epoch seconds of an ISO 8601 timestamp (naive ones are local time), else None.
+
+    A bare date stands for UTC midnight, so it keeps its calendar day when
+    formatted back with iso_timestamp.
+    """
+    text = frontmatter_text(value).strip()
+    if text[-1:] in ("Z", "z"):
+        text = text[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(text.replace(" ", "T", 1)) if text else None
+    except ValueError:
+        return None
+    if parsed is None:
+        return None
+    if _DATE_ONLY_RE.match(text):
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def iso_timestamp(seconds: Optional[float]) -> Optional[str]:
+    """UTC ISO 8601 form of epoch seconds, to the second."""
+    if seconds is None:
+        return None
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def plan_timing(summary: dict, mtime: Optional[float]) -> dict:
+    """started_at, completed_at and duration_minutes of a completed plan.
+
+    completed_at is the SUMMARY.md "completed" field when it has a time of day.
+    A bare date keeps the file mtime if that falls on the same (local) day and
+    otherwise stays a date (YYYY-MM-DD), as checkouts and copies reset mtimes;
+    without the field the mtime is used. started_at is "started" (a bare date
+    again stays a date), or completed_at minus "duration" when completed_at
+    has a time of day. source says whether completed_at came from the
+    "frontmatter" or the "mtime".
+    """
+    duration = parse_duration_minutes(summary.get("duration"))
+    completed_text = frontmatter_text(summary.get("completed")).strip()
+    completed = parse_timestamp(completed_text)
+    completed_at = iso_timestamp(completed)
+    source = "frontmatter"
+    if completed is None:
+        completed, completed_at, source = mtime, iso_timestamp(mtime), "mtime"
+    elif _DATE_ONLY_RE.match(completed_text):
+        if mtime is not None and datetime.fromtimestamp(mtime).date().isoformat() == completed_text:
+            completed, completed_at, source = mtime, iso_timestamp(mtime), "mtime"
+        else:
+            # No time of day, so no start can be derived from the duration
+            completed, completed_at = None, completed_text
+    started_text = frontmatter_text(summary.get("started")).strip()
+    started = parse_timestamp(started_text)
+    started_at = started_text if started is not None and _DATE_ONLY_RE.match(started_text) else iso_timestamp(started)
+    if started_at is None and completed is not None and duration is not None:
+        started_at = iso_timestamp(completed - duration * 60)
+    return {
+        "started_at": started_at,
+        "completed_at": completed_at,
+        "duration_minutes": duration,
+        "source": source if completed_at is not None else None
+    }
+
+
+def summary_path_for(plan_path: Path) -> Path:
+    """Return the SUMMARY.md path that marks a PLAN.md as complete."""
+    return plan_path.parent / plan_path.name.replace("-PLAN.md", "-SUMMARY.md")
+
+
+def phase_dir_identity(phase_dir: Path) -> tuple:
+    """(number, name) of a phase directory (e.g., 01-database-model -> (1, "Database Model"))."""
+    dir_name = phase_dir.name
+    match = _PHASE_DIR_NAME_RE.match(dir_name)
+    if match:
+        return int(match.group(1)), match.group(2).replace("-", " ").title()
+    return 1, dir_name
+
+
+def parse_phase_directory(
+    phase_dir: Path,
+    cache: Optional[ParseCache] = None,
+    fs: Optional[FsSnapshot] = None
+) -> dict:
+    """Parse a phase directory and extract all plans."""
+    fs = fs or FsSnapshot()
+    phase_num, phase_name = phase_dir_identity(phase_dir)
+
+    # Find all PLAN.md files
+    plan_files = fs.files_ending(phase_dir, "-PLAN.md")
+    plans = [
+        cached_parse(cache, "plan", pf, lambda path: parse_plan_file(path, fs), (summary_path_for(pf),), fs)
+        for pf in plan_files
+    ]
+
+    # Determine phase status
+    if not plans:
+        status = "pending"
+    elif all(p["status"] == "complete" for p in plans):
+        status = "complete"
+    elif any(p["status"] == "complete" for p in plans):
+        status = "in_progress"
+    else:
+        status = "pending"
+
+    # Check for verification
+    verification_files = fs.files_ending(phase_dir, "-VERIFICATION.md")
+    verified = len(verification_files) > 0
+
+    return {
+        "number": phase_num,
+        "name": phase_name,
+        "goal": "",  # Will be populated from ROADMAP.md
+        "status": status,
+        "requirements_covered": [],  # Will be populated from ROADMAP.md
+        "plans": plans,
+        "verified": verified
+    }
+
+
+def prefetch_phase_files(phase_dirs: list, cache: Optional[ParseCache], fs: FsSnapshot):
+    """Read the PLAN files and SUMMARY heads that parsing phase_dirs will need, concurrently.
+
+    Plans the parse cache can serve are skipped, so warm runs read nothing.
+    """
+    paths = []
+    heads = []
+    for phase_dir in phase_dirs:
+        for plan_path in fs.files_ending(phase_dir, "-PLAN.md"):
+            summary_path = summary_path_for(plan_path)
+            if cache is not None and cache.fresh("plan", plan_path, (summary_path,), fs):
+                continue
+            paths.append(plan_path)
+            if fs.exists(summary_path):
+                heads.append(summary_path)
+    fs.prefetch(paths, heads)
+
+
+def parse_phase_worker(phase_dir: Path) -> tuple:
+    """Pool entry point: parse one phase directory in a worker process."""
+    fs = FsSnapshot()
+    prefetch_phase_files([phase_dir], _worker_cache, fs)
+    phase = parse_phase_directory(phase_dir, _worker_cache, fs)
+    return phase, take_worker_updates(), fs.counts(), take_worker_stats()
+
+
+def parse_phases(
+    phase_dirs: list,
+    cache: Optional[ParseCache] = None,
+    pool: Optional[ProcessPoolExecutor] = None,
+    fs: Optional[FsSnapshot] = None
+) -> list:
+    """Parse phase directories, fanning out over a worker pool when given one.
+
+    Results keep the order of phase_dirs, and cache entries created by the
+    workers are merged back so the next run can reuse them.
+    """
+    fs = fs or FsSnapshot()
+    if pool is None or len(phase_dirs) < 2:
+        prefetch_phase_files(phase_dirs, cache, fs)
+        return [parse_phase_directory(pd, cache, fs) for pd in phase_dirs]
+
+    phases = []
+    for phase, updates, fs_counts, stats in pool.map(parse_phase_worker, phase_dirs):
+        if cache is not None:
+            cache.merge(updates)
+        fs.merge_counts(fs_counts)
+        merge_worker_stats(stats)
+        phases.append(phase)
+    return phases
+
+
+def patch_phases(
+    phase_dirs: list,
+    phase_numbers: set,
+    previous_phases: list,
+    cache: Optional[ParseCache] = None,
+    fs: Optional[FsSnapshot] = None
+) -> list:
+    """Parse only the directories of phase_numbers, reusing the other phases from a previous dashboard.
+
+    Previous entries are matched by (number, name). Entries without plans are
+    re-parsed anyway: they cannot be told apart from roadmap-only placeholders
+    and cost a directory listing. Roadmap fields are cleared for the caller to
+    re-apply, as for freshly parsed phases.
+    """
+    fs = fs or FsSnapshot()
+    reusable = {(p["number"], p["name"]): p for p in previous_phases if p.get("plans")}
+
+    def stale(phase_dir: Path) -> bool:
+        identity = phase_dir_identity(phase_dir)
+        return identity[0] in phase_numbers or identity not in reusable
+
+    prefetch_phase_files([d for d in phase_dirs if stale(d)], cache, fs)
+    phases = []
+    for phase_dir in phase_dirs:
+        if stale(phase_dir):
+            phases.append(parse_phase_directory(phase_dir, cache, fs))
+        else:
+            phases.append(dict(reusable[phase_dir_identity(phase_dir)], goal="", requirements_covered=[]))
+    return phases
+
+
+_ROADMAP_PHASE_RE = re.compile(r'###\s*Phase\s+(\d+):\s*([^\n]+)')
+# Zero-width after the newline so adjacent boundaries are never swallowed
+_ROADMAP_BOUNDARY_RE = re.compile(r'\n(?=###\s*Phase\s+\d+:|##\s+)')
+_ROADMAP_GOAL_RE = re.compile(r'\*\*Goal:\*\*\s*([^\n]+)')
+_ROADMAP_DEPENDS_RE = re.compile(r'\*\*Depends on(?::\*\*|\*\*:)[ \t]*([^\n]*)', re.IGNORECASE)
+_PHASE_REFERENCE_RE = re.compile(r'(?:phase\s*)?0*(\d+)(?![.\d])', re.IGNORECASE)
+_REQUIREMENT_ID_RE = re.compile(r'([A-Z]+-\d+)')
+
+
+def plan_sort_key(number: str) -> tuple:
+    """Numeric order for plan numbers such as "2.10" (after "2.9")."""
+    return tuple(int(part) if part.isdigit() else 0 for part in number.split("."))
+
+
+def phase_reference(value) -> Optional[int]:
+    """The phase number a requires entry points at ("01-foundation", "Phase 2", 2), if any."""
+    match = _PHASE_REFERENCE_RE.match(frontmatter_text(value).strip())
+    return int(match.group(1)) if match else None
+
+
+def build_plan_graph(phases: list, phase_dependencies: dict, is_archived: bool = False) -> dict:
+    """Build the plan dependency graph of a milestone and schedule it.
+
+    Edges (prerequisite -> plan) come from, in order of precedence:
+      - depends_on in PLAN.md frontmatter;
+      - wave in PLAN.md frontmatter: without depends_on, a plan waits for the
+        plans of the previous wave in its phase;
+      - requires in SUMMARY.md frontmatter: the plans of the named phase whose
+        provides match, or all of its plans;
+      - phase order: the first plans of a phase wait for the last plans of the
+        phases it depends on in ROADMAP.md ("Depends on"), or of the previous
+        phase when ROADMAP.md does not say.
+
+    waves are topological levels over all plans; remaining_waves the same over
+    pending plans, whose first wave is the ready set. Critical paths are the
+    longest chains weighted by task count. Plans on or behind a dependency
+    cycle are listed as unschedulable and left out of the schedule; references
+    that match no plan are listed as unresolved.
+    """
+    plans = {}
+    phase_plans = {}
+    for phase in phases:
+        numbers = phase_plans.setdefault(phase["number"], [])
+        for plan in phase.get("plans", []):
+            if plan["number"] not in plans:
+                plans[plan["number"]] = (phase["number"], plan)
+                numbers.append(plan["number"])
+    for numbers in phase_plans.values():
+        numbers.sort(key=plan_sort_key)
+
+    predecessors = {number: {} for number in plans}  # plan -> {prerequisite: via}
+    unresolved = []
+
+    def add_edge(source: str, target: str, via: str):
+        if source != target and source not in predecessors[target]:
+            predecessors[target][source] = via
+
+    for number, (phase_num, plan) in plans.items():
+        dependencies = plan.get("dependencies", {})
+        depends_on = dependencies.get("depends_on", [])
+        for ref in depends_on:
+            if ref in plans:
+                add_edge(ref, number, "depends_on")
+            else:
+                unresolved.append({"plan": number, "ref": ref})
+
+        wave = dependencies.get("wave")
+        if not depends_on and wave is not None:
+            earlier = {}
+            for other in phase_plans[phase_num]:
+                other_wave = plans[other][1].get("dependencies", {}).get("wave")
+                if other_wave is not None and other_wave < wave:
+                    earlier.setdefault(other_wave, []).append(other)
+            if earlier:
+                for other in earlier[max(earlier)]:
+                    add_edge(other, number, "wave")
+
+        for required in dependencies.get("requires", []):
+            required_phase = phase_reference(required.get("phase"))
+            candidates = [other for other in phase_plans.get(required_phase, []) if other != number]
+            if not candidates:
+                unresolved.append({"plan": number, "ref": required.get("phase")})
+                continue
+            wanted = {item.lower() for item in required.get("provides", [])}
+            providers = [
+                other for other in candidates
+                if wanted & {item.lower() for item in plans[other][1].get("dependencies", {}).get("provides", [])}
+            ]
+            if not providers and required_phase == phase_num:
+                continue  # Only matching providers say which plans of the own phase come first
+            for other in providers or candidates:
+                add_edge(other, number, "requires")
+
+    # Phase order: entry plans of a phase wait for the exit plans of the phases it depends on
+    planned_phases = sorted(num for num, numbers in phase_plans.items() if numbers)
+    for index, phase_num in enumerate(planned_phases):
+        numbers = set(phase_plans[phase_num])
+        required_phases = phase_dependencies.get(phase_num)
+        if required_phases is None:
+            required_phases = planned_phases[index - 1:index]
+        # A phase whose plans form a cycle has no entries or exits: use all its plans
+        entries = [n for n in phase_plans[phase_num] if not numbers & set(predecessors[n])] or phase_plans[phase_num]
+        for required_phase in required_phases:
+            required_numbers = set(phase_plans.get(required_phase, []))
+            if required_phase == phase_num or not required_numbers:
+                continue
+            exits = [
+                n for n in phase_plans[required_phase]
+                if not any(n in predecessors[other] for other in required_numbers)
+            ] or phase_plans[required_phase]
+            for entry in entries:
+                for exit_plan in exits:
+                    add_edge(exit_plan, entry, "phase")
+
+    order = sorted(plans, key=plan_sort_key)
+    complete = {n for n in order if is_archived or plans[n][1]["status"] == "complete"}
+    weights = {n: max(1, len(plans[n][1].get("tasks", []))) for n in order}
+
+    levels = _graph_levels(order, predecessors)
+    unschedulable = [n for n in order if n not in levels]
+    # A plan behind a cycle never gets a level, so pending plans are all schedulable
+    remaining_levels = _graph_levels([n for n in order if n in levels and n not in complete], predecessors)
+
+    edges = [
+        {"from": source, "to": target, "via": via}
+        for target in order
+        for source, via in sorted(predecessors[target].items(), key=lambda item: plan_sort_key(item[0]))
+    ]
+    remaining_waves = _graph_waves(remaining_levels)
+    return {
+        "plans": len(order),
+        "edges": edges,
+        "waves": _graph_waves(levels),
+        "critical_path": _critical_path(levels, predecessors, weights),
+        "ready": remaining_waves[0] if remaining_waves else [],
+        "remaining_waves": remaining_waves,
+        "remaining_critical_path": _critical_path(remaining_levels, predecessors, weights),
+        "unschedulable": unschedulable,
+        "unresolved": unresolved
+    }
+
+
+def _graph_levels(order: list, predecessors: dict) -> dict:
+    """Wave number of each plan in order, counting only predecessors within order.
+
+    Kahn's algorithm: plans on or behind a cycle get no wave and are left out.
+    """
+    members = set(order)
+    waiting = {n: sum(1 for p in predecessors[n] if p in members) for n in order}
+    successors = {n: [] for n in order}
+    for n in order:
+        for p in predecessors[n]:
+            if p in members:
+                successors[p].append(n)
+    levels = {}
+    wave = [n for n in order if waiting[n] == 0]
+    level = 1
+    while wave:
+        following = []
+        for n in wave:
+            levels[n] = level
+            for successor in successors[n]:
+                waiting[successor] -= 1
+                if waiting[successor] == 0:
+                    following.append(successor)
+        wave = following
+        level += 1
+    return levels
+
+
+def _graph_waves(levels: dict) -> list:
+    waves = {}
+    for n, level in levels.items():
+        waves.setdefault(level, []).append(n)
+    return [sorted(waves[level], key=plan_sort_key) for level in sorted(waves)]
+
+
+def _critical_path(levels: dict, predecessors: dict, weights: dict) -> dict:
+    """Heaviest chain (by task count) through the plans in levels, in dependency order.
+
+    Ties go to the lower plan number.
+    """
+    best = {}
+    previous = {}
+    for n in sorted(levels, key=lambda n: (levels[n], plan_sort_key(n))):
+        heaviest = None
+        for p in predecessors[n]:
+            if p in levels and (
+                heaviest is None or best[p] > best[heaviest]
+                or (best[p] == best[heaviest] and plan_sort_key(p) < plan_sort_key(heaviest))
+            ):
+                heaviest = p
+        best[n] = weights[n] + (best[heaviest] if heaviest is not None else 0)
+        previous[n] = heaviest
+    if not best:
+        return {"plans": [], "tasks": 0}
+    end = min(best, key=lambda n: (-best[n], plan_sort_key(n)))
+    path = []
+    while end is not None:
+        path.append(end)
+        end = previous[end]
+    return {"plans": path[::-1], "tasks": sum(weights[n] for n in path)}
+
+
+def parse_roadmap(roadmap_path: Path) -> dict:
+    """Parse ROADMAP.md to extract phase goals and requirements."""
+    if not roadmap_path.exists():
+        return {}
+
+    content = read_file(roadmap_path)
+    with timed("regex"):
+        return parse_roadmap_content(content)
+
+
+def parse_roadmap_content(content: str) -> dict:
+    """Parse ROADMAP.md content in one forward pass.
+
+    Section boundaries (next "### Phase N:" or "## " header) are found once
+    for the whole file, and each section is searched in place via pos/endpos
+    instead of slicing, so cost stays linear in file size.
+    """
+    phases_info = {}
+
+    boundaries = [m.start() for m in _ROADMAP_BOUNDARY_RE.finditer(content)]
+    next_boundary = 0
+
+    # Find phase sections: ### Phase N: Name
+    for match in _ROADMAP_PHASE_RE.finditer(content):
+        phase_num = int(match.group(1))
+        phase_name = match.group(2).strip()
+
+        # Section runs until the next phase or section header
+        start = match.end()
+        while next_boundary < len(boundaries) and boundaries[next_boundary] < start:
+            next_boundary += 1
+        end = boundaries[next_boundary] if next_boundary < len(boundaries) else len(content)
+
+        # Extract goal
+        goal_match = _ROADMAP_GOAL_RE.search(content, start, end)
+        goal = goal_match.group(1).strip() if goal_match else ""
+
+        # Extract requirements (first-seen order, deduplicated)
+        requirements = _REQUIREMENT_ID_RE.findall(content, start, end)
+
+        # "**Depends on**: Phase 1, Phase 2" (None when the line is missing)
+        depends_match = _ROADMAP_DEPENDS_RE.search(content, start, end)
+        depends_on = None
+        if depends_match:
+            depends_on = [int(num) for num in _PHASE_REFERENCE_RE.findall(depends_match.group(1))]
+
+        phases_info[phase_num] = {
+            "name": phase_name,
+            "goal": goal,
+            "requirements": list(dict.fromkeys(requirements)),
+            "depends_on": depends_on
+        }
+
+    return phases_info
+
+
+# Requirements: - [x] **REQ-01**: Description or - [ ] **REQ-01**: Description
+_REQUIREMENT_CHECKBOX_RE = re.compile(r'-\s*\[([ xX])\]\s*\*\*([A-Z]+)-(\d+)\*\*')
+
+
+def parse_requirements(requirements_path: Path) -> dict:
+    """Parse REQUIREMENTS.md to get requirement completion status."""
+    if not requirements_path.exists():
+        return {"total": 0, "complete": 0, "by_category": {}}
+
+    content = read_file(requirements_path)
+    with timed("regex"):
+        return parse_requirements_content(content)
+
+
+def parse_requirements_content(content: str) -> dict:
+    """Count checked and unchecked requirements in REQUIREMENTS.md content.
+
+    "items" lists each requirement as [id, complete] in file order, for
+    build_requirement_index; it is not part of the dashboard.
+    """
+    total = 0
+    complete = 0
+    by_category = {}
+    items = []
+
+    matches = _REQUIREMENT_CHECKBOX_RE.finditer(content)
+
+    for match in matches:
+        is_complete = match.group(1).lower() == 'x'
+        category = match.group(2)
+        items.append([f"{category}-{match.group(3)}", is_complete])
+
+        total += 1
+        if is_complete:
+            complete += 1
+
+        if category not in by_category:
+            by_category[category] = {"total": 0, "complete": 0}
+
+        by_category[category]["total"] += 1
+        if is_complete:
+            by_category[category]["complete"] += 1
+
+    return {
+        "total": total,
+        "complete": complete,
+        "by_category": by_category,
+        "items": items
+    }
+
+
+def build_requirement_index(
+    items: list,
+    phases: list,
+    is_archived: bool = False,
+    phase_numbers: Optional[set] = None
+) -> dict:
+    """Cross-reference requirements with the phases and plans that cover them.
+
+    One pass over what the dashboard already parsed: the REQUIREMENTS.md items
+    (see parse_requirements_content), each phase's ROADMAP.md requirements and
+    the IDs in each plan's requirements field. Plan lists (and the task body
+    mentions, which do not count as coverage) are trimmed to defined IDs in
+    place, since plans mention other dash-number tokens too.
+
+    With phase_numbers (a milestone falling back to the REQUIREMENTS.md shared
+    by the whole project), only those phases count as mapping requirements and
+    only the requirements they map or the plans cover are indexed, so each
+    such milestone does not carry a copy of the whole project's index.
+    """
+    defined = {req_id for req_id, _complete in items}
+    if phase_numbers is not None:
+        relevant = {
+            req_id for phase in phases if phase["number"] in phase_numbers
+            for req_id in phase.get("requirements_covered", [])
+        }
+        relevant.update(
+            req_id for phase in phases for plan in phase.get("plans", []) for req_id in plan.get("requirements", [])
+        )
+        items = [item for item in items if item[0] in relevant]
+
+    index = {}
+    for req_id, complete in items:
+        index[req_id] = {
+            "status": "complete" if complete or is_archived else "pending",
+            "category": req_id.rsplit("-", 1)[0],
+            "phases": [],
+            "plans": []
+        }
+
+    undefined = []
+    for phase in phases:
+        requirements_covered = phase.get("requirements_covered", [])
+        if phase_numbers is not None and phase["number"] not in phase_numbers:
+            requirements_covered = []
+        for req_id in requirements_covered:
+            entry = index.get(req_id)
+            if entry is None:
+                if req_id not in undefined:
+                    undefined.append(req_id)
+            elif phase["number"] not in entry["phases"]:
+                entry["phases"].append(phase["number"])
+        for plan in phase.get("plans", []):
+            plan["requirements"] = [req_id for req_id in plan.get("requirements", []) if req_id in index]
+            plan["requirements_mentioned"] = [
+                req_id for req_id in plan.get("requirements_mentioned", []) if req_id in defined
+            ]
+            for req_id in plan["requirements"]:
+                index[req_id]["plans"].append(plan["number"])
+
+    total = len(index)
+    unmapped = [req_id for req_id, entry in index.items() if not entry["phases"]]
+    unplanned = [req_id for req_id, entry in index.items() if not entry["plans"]]
+    return {
+        "total": total,
+        "mapped": total - len(unmapped),
+        "planned": total - len(unplanned),
+        "mapped_percentage": round((total - len(unmapped)) / total * 100) if total else 0,
+        "planned_percentage": round((total - len(unplanned)) / total * 100) if total else 0,
+        "unmapped": unmapped,
+        "unplanned": unplanned,
+        "undefined": undefined,
+        "index": index
+    }
+
+
+def planning_created_time(planning_dir: Path, fs: Optional[FsSnapshot] = None) -> float:
+    """Best available creation time of the planning directory.
+
+    On POSIX st_ctime is the last metadata change, which every dashboard write
+    bumps, so use st_birthtime when available and otherwise the oldest entry mtime.
+    """
+    fs = fs or FsSnapshot()
+    st = fs.stat(planning_dir)
+    birthtime = getattr(st, "st_birthtime", None)
+    if birthtime:
+        return birthtime
+    if os.name == "nt":
+        return st.st_ctime
+
+    oldest = st.st_ctime
+    for child in fs.children(planning_dir):
+        child_st = fs.stat(child)
+        if child_st:
+            oldest = min(oldest, child_st.st_mtime)
+    return oldest
+
+
+# Frontmatter probe bounds: UAT logs can grow large after long test sessions
+UAT_PROBE_MAX_LINES = 64
+UAT_PROBE_MAX_CHARS = 64 * 1024
+
+
+def uat_is_complete(uat_path: Path) -> bool:
+    """Check whether a UAT.md has status: complete, reading only its frontmatter.
+
+    Streams the file line by line and stops at the first match or at the end
+    of the frontmatter; files without frontmatter are probed over their first
+    UAT_PROBE_MAX_LINES lines. Never reads more than UAT_PROBE_MAX_CHARS characters.
+    """
+    remaining = UAT_PROBE_MAX_CHARS
+    count("files_read")
+    try:
+        with open(uat_path, encoding="utf-8", errors="replace") as f:
+            for index in range(UAT_PROBE_MAX_LINES):
+                line = f.readline(remaining)
+                if not line:
+                    break
+                remaining -= len(line)
+                if _stats is not None:
+                    _stats.add("bytes_read", len(line.encode("utf-8")))
+                stripped = line.strip()
+                if stripped == "---":
+                    if index > 0:
+                        break  # End of frontmatter
+                    continue
+                if "status: complete" in stripped.lower():
+                    return True
+                if remaining <= 0:
+                    break
+    except OSError:
+        pass
+    return False
+
+
+def find_uat_files(phases_dir: Path, fs: Optional[FsSnapshot] = None) -> list:
+    """UAT files in the phases directory and its phase directories (one level deep)."""
+    fs = fs or FsSnapshot()
+    uat_files = fs.files_ending(phases_dir, "-UAT.md")
+    for phase_dir in sorted(fs.subdirs(phases_dir)):
+        uat_files.extend(fs.files_ending(phase_dir, "-UAT.md"))
+    return uat_files
+
+
+def detect_workflow_stages(
+    planning_dir: Path,
+    phases_dir: Optional[Path],
+    phases: list,
+    is_archived: bool = False,
+    milestone_name: str = "",
+    fs: Optional[FsSnapshot] = None,
+    cache: Optional[ParseCache] = None
+) -> dict:
+    """Detect workflow stage status.
+
+    Args:
+        planning_dir: The directory to check for files
+        phases_dir: The phases directory
+        phases: List of parsed phases
+        is_archived: Whether this is an archived milestone
+        milestone_name: Name like "v1.0-PAGE_Login" for finding archived files
+        fs: Optional filesystem snapshot shared across the run
+        cache: Optional parse cache for per-file UAT verdicts
+    """
+    fs = fs or FsSnapshot()
+    now = run_timestamp()
+
+    stages = [
+        {"id": "created", "name": "Milestone Created", "status": "pending", "completed_at": None},
+        {"id": "requirements", "name": "Requirements Defined", "status": "pending", "completed_at": None},
+        {"id": "roadmap", "name": "Roadmap Created", "status": "pending", "completed_at": None},
+        {"id": "planning", "name": "All Phases Planned", "status": "pending", "completed_at": None},
+        {"id": "executing", "name": "Execution In Progress", "status": "pending", "completed_at": None},
+        {"id": "verified", "name": "Work Verified", "status": "pending", "completed_at": None},
+        {"id": "archived", "name": "Milestone Archived", "status": "pending", "completed_at": None},
+    ]
+
+    # For archived milestones, all stages are complete by definition
+    if is_archived:
+        for stage in stages:
+            stage["status"] = "complete"
+            stage["completed_at"] = now
+        return {
+            "current_stage": "archived",
+            "stages": stages
+        }
+
+    # Check created (folder exists)
+    if fs.exists(planning_dir):
+        stages[0]["status"] = "complete"
+        stages[0]["completed_at"] = iso_timestamp(planning_created_time(planning_dir, fs))
+
+    # Check requirements - try multiple locations
+    req_paths = [
+        planning_dir / "REQUIREMENTS.md",
+    ]
+    for req_path in req_paths:
+        req_stat = fs.stat(req_path)
+        if req_stat and req_stat.st_size > 100:
+            stages[1]["status"] = "complete"
+            stages[1]["completed_at"] = iso_timestamp(req_stat.st_mtime)
+            break
+
+    # Check roadmap - try multiple locations
+    roadmap_paths = [
+        planning_dir / "ROADMAP.md",
+    ]
+    for roadmap_path in roadmap_paths:
+        roadmap_stat = fs.stat(roadmap_path)
+        if roadmap_stat and roadmap_stat.st_size > 100:
+            stages[2]["status"] = "complete"
+            stages[2]["completed_at"] = iso_timestamp(roadmap_stat.st_mtime)
+            break
+
+    # Check planning (all phases have at least one PLAN.md)
+    if phases:
+        phases_with_plans = sum(1 for p in phases if p.get("plans"))
+        if phases_with_plans == len(phases):
+            stages[3]["status"] = "complete"
+        elif phases_with_plans > 0:
+            stages[3]["status"] = "in_progress"
+
+    # Check executing (phases with SUMMARY.md)
+    if phases:
+        phases_complete = sum(1 for p in phases if p.get("status") == "complete")
+        if phases_complete == len(phases):
+            stages[4]["status"] = "complete"
+        elif phases_complete > 0:
+            stages[4]["status"] = "in_progress"
+
+    # Check verified - look for a completed UAT in the phase directories
+    verified = False
+    if phases_dir and fs.is_dir(phases_dir):
+        for uat_file in find_uat_files(phases_dir, fs):
+            if cached_parse(cache, "uat", uat_file, uat_is_complete, fs=fs):
+                verified = True
+                break
+
+    # Also check for phase verification markers
+    if not verified and phases:
+        verified = all(p.get("verified", False) for p in phases)
+
+    if verified:
+        stages[5]["status"] = "complete"
+
+    # Determine current stage
+    current_stage = "created"
+    for stage in stages:
+        if stage["status"] == "in_progress":
+            current_stage = stage["id"]
+            break
+        elif stage["status"] == "pending":
+            current_stage = stage["id"]
+            break
+
+    return {
+        "current_stage": current_stage,
+        "stages": stages
+    }
+
+
+def calculate_progress(phases: list, requirements: dict) -> dict:
+    """Calculate progress statistics."""
+    phases_total = len(phases)
+    phases_complete = sum(1 for p in phases if p.get("status") == "complete")
+
+    plans_total = sum(len(p.get("plans", [])) for p in phases)
+    plans_complete = sum(
+        sum(1 for pl in p.get("plans", []) if pl.get("status") == "complete")
+        for p in phases
+    )
+
+    tasks_total = sum(
+        sum(len(pl.get("tasks", [])) for pl in p.get("plans", []))
+        for p in phases
+    )
+    tasks_complete = sum(
+        sum(
+            sum(1 for t in pl.get("tasks", []) if t.get("status") == "complete")
+            for pl in p.get("plans", [])
+        )
+        for p in phases
+    )
+
+    return {
+        "phases_complete": phases_complete,
+        "phases_total": phases_total,
+        "phases_percentage": round((phases_complete / phases_total * 100) if phases_total else 0),
+        "plans_complete": plans_complete,
+        "plans_total": plans_total,
+        "plans_percentage": round((plans_complete / plans_total * 100) if plans_total else 0),
+        "tasks_complete": tasks_complete,
+        "tasks_total": tasks_total,
+        "tasks_percentage": round((tasks_complete / tasks_total * 100) if tasks_total else 0),
+        "requirements_complete": requirements.get("complete", 0),
+        "requirements_total": requirements.get("total", 0),
+        "requirements_percentage": round(
+            (requirements.get("complete", 0) / requirements.get("total", 1) * 100)
+            if requirements.get("total", 0) else 0
+        )
+    }
+
+
+TIMING_FILENAME = ".dashboard-timing.jsonl"
+_TIMING_FIELDS = ("started_at", "completed_at", "duration_minutes")
+# Superseded lines tolerated in the timing log before it is rewritten
+TIMING_COMPACT_SLACK = 64
+# Latest plan completions the rolling plans_per_hour is measured over
+VELOCITY_WINDOW_PLANS = 10
+
+
+class TimingHistory:
+    """Append-only log of completed plan timings, one JSON line per change.
+
+    The first timing recorded for a plan whose completion time comes from the
+    SUMMARY.md mtime is kept, so later touches or checkouts do not move it;
+    timings from SUMMARY.md frontmatter always replace the record (see
+    milestone_velocity). A plan that is no longer complete gets a line with
+    a null completed_at. load() folds the lines into
+    records by milestone and plan number, update() appends only the lines that
+    differ and rewrites the file once superseded lines pile up.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.milestones = {}
+        self.lines = 0
+
+    def load(self) -> "TimingHistory":
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        records = self.milestones.setdefault(entry["milestone"], {})
+                        plan = entry["plan"]
+                    except (ValueError, TypeError, KeyError):
+                        continue
+                    self.lines += 1
+                    if entry.get("completed_at"):
+                        records[plan] = {key: entry.get(key) for key in _TIMING_FIELDS}
+                    else:
+                        records.pop(plan, None)
+        except OSError:
+            pass
+        return self
+
+    def records(self, milestone: str) -> dict:
+        """{plan number: timing} of a milestone's completed plans."""
+        return self.milestones.get(milestone, {})
+
+    def update(self, milestone: str, records: dict) -> bool:
+        """Make records the milestone's timings; returns whether the log changed."""
+        current = self.milestones.get(milestone, {})
+        entries = [
+            {"milestone": milestone, "plan": plan, **timing}
+            for plan, timing in records.items() if current.get(plan) != timing
+        ]
+        entries += [
+            {"milestone": milestone, "plan": plan, "completed_at": None}
+            for plan in current if plan not in records
+        ]
+        if not entries:
+            return False
+        self.milestones[milestone] = dict(records)
+        self.lines += len(entries)
+        self.write(entries)
+        return True
+
+    def retain(self, milestones: set):
+        """Forget milestones that no longer exist."""
+        dropped = [name for name in self.milestones if name not in milestones]
+        for name in dropped:
+            del self.milestones[name]
+        if dropped:
+            self.write([], rewrite=True)
+
+    def write(self, entries: list, rewrite: bool = False):
+        live = sum(len(records) for records in self.milestones.values())
+        try:
+            if rewrite or self.lines > 2 * live + TIMING_COMPACT_SLACK:
+                atomic_write_text(self.path, "".join(
+                    json.dumps({"milestone": name, "plan": plan, **timing}, separators=(",", ":")) + "\n"
+                    for name, records in self.milestones.items() for plan, timing in records.items()
+                ))
+                self.lines = live
+            else:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries)
+        except OSError:
+            pass
+
+
+def timing_records(dashboard: dict) -> dict:
+    """{plan number: timing} of the completed plans in a milestone dashboard."""
+    return {
+        plan["number"]: {key: plan["timing"].get(key) for key in _TIMING_FIELDS}
+        for phase in dashboard["phases"] for plan in phase["plans"]
+        if plan["status"] == "complete" and (plan.get("timing") or {}).get("completed_at")
+    }
+
+
+def milestone_velocity(phases: list, history: dict, is_archived: bool = False) -> dict:
+    """Per-phase durations, rolling throughput and projected ETA of a milestone.
+
+    Completed plans whose timing comes from the SUMMARY.md mtime take it from
+    history (the milestone's TimingHistory records) when it has one, and
+    phases is updated to match; frontmatter timings are always kept.
+    plans_per_hour is measured over the latest VELOCITY_WINDOW_PLANS
+    completions; the ETA extrapolates it from the last completion, never from
+    the current time, so unchanged inputs give an unchanged dashboard.
+    Roadmap phases without plans get no row.
+    """
+    done = []
+    phase_rows = []
+    remaining = 0
+    for phase in phases:
+        if not phase.get("plans"):
+            continue
+        starts, ends, durations, pending = [], [], [], 0
+        dates_only = False
+        for plan in phase.get("plans", []):
+            if plan["status"] != "complete":
+                pending += 1
+                continue
+            timing = plan.get("timing") or {}
+            if timing.get("source") == "mtime" and plan["number"] in history:
+                timing = plan["timing"] = {**history[plan["number"]], "source": "mtime"}
+            completed = parse_timestamp(timing.get("completed_at"))
+            if completed is None:
+                continue
+            started = parse_timestamp(timing.get("started_at"))
+            # Bare dates (see plan_timing) place a plan on a day, too coarse for a duration
+            dates_only = dates_only or any(
+                _DATE_ONLY_RE.match(timing.get(key) or "") for key in ("started_at", "completed_at")
+            )
+            done.append((completed, started))
+            ends.append(completed)
+            if started is not None:
+                starts.append(started)
+            if timing.get("duration_minutes") is not None:
+                durations.append(timing["duration_minutes"])
+        remaining += pending
+        first = min(starts + ends) if ends else None
+        last = max(ends) if ends and not pending else None
+        phase_rows.append({
+            "number": phase["number"],
+            "plans_timed": len(ends),
+            "started_at": iso_timestamp(first),
+            "completed_at": iso_timestamp(last),
+            "duration_minutes": round((last - first) / 60, 1) if last is not None and not dates_only else None,
+            "work_minutes": round(sum(durations), 1) if durations else None
+        })
+    if is_archived:
+        remaining = 0
+
+    done.sort(key=lambda item: item[0])
+    window = done[-VELOCITY_WINDOW_PLANS:]
+    plans_per_hour = None
+    last_completed = done[-1][0] if done else None
+    if window:
+        span_start = min([started for _, started in window if started is not None] + [window[0][0]])
+        counted = len(window) if span_start < window[0][0] else len(window) - 1
+        if counted and last_completed > span_start:
+            plans_per_hour = counted / ((last_completed - span_start) / 3600)
+    eta = None
+    if remaining and plans_per_hour:
+        eta = last_completed + remaining / plans_per_hour * 3600
+
+    first_started = min((completed if started is None else started for completed, started in done), default=None)
+    return {
+        "plans_timed": len(done),
+        "plans_remaining": remaining,
+        "started_at": iso_timestamp(first_started),
+        "last_completed_at": iso_timestamp(last_completed),
+        "window_plans": len(window),
+        "plans_per_hour": float(f"{plans_per_hour:.3g}") if plans_per_hour else None,
+        "eta": iso_timestamp(eta),
+        "phases": phase_rows
+    }
+
+
+_MILESTONE_NAME_RE = re.compile(r'(v[\d.]+)-(.+)')
+_MILESTONE_DIR_RE = re.compile(r'v[\d.]+-')
+_STATE_MILESTONE_RE = re.compile(r'Milestone:\s*(v[\d.]+-[^\s\n]+)')
+
+
+def read_milestone_meta(milestone_path: Path, folder_name: str, fs: Optional[FsSnapshot] = None) -> dict:
+    """Read version/element info from MILESTONE.json, falling back to the folder name."""
+    fs = fs or FsSnapshot()
+
+    # Try to read MILESTONE.json for authoritative element data
+    milestone_json_path = milestone_path / "MILESTONE.json"
+    milestone_meta = None
+    if fs.exists(milestone_json_path):
+        try:
+            milestone_meta = json.loads(read_file(milestone_json_path))
+        except (json.JSONDecodeError, OSError):
+            pass
+
+    if milestone_meta:
+        element = milestone_meta.get("element", folder_name)
+        return {
+            "version": milestone_meta.get("version", "v1.0"),
+            "element": element,
+            "elements": milestone_meta.get("elements", [element]),
+            "display_name": milestone_meta.get("display_name"),
+        }
+
+    match = _MILESTONE_NAME_RE.match(folder_name)
+    if match:
+        version = match.group(1)
+        element = match.group(2)
+    else:
+        version = "v1.0"
+        element = folder_name
+    return {
+        "version": version,
+        "element": element,
+        "elements": [element],
+        "display_name": None,
+    }
+
+
+def find_milestone_document(
+    planning_dir: Path,
+    root_planning_dir: Path,
+    version: str,
+    filename: str,
+    fs: Optional[FsSnapshot] = None
+) -> Optional[Path]:
+    """Locate ROADMAP.md / REQUIREMENTS.md for a milestone.
+
+    Checks the milestone folder, then the root .planning, then the archived
+    copy in milestones/ (archived milestones use version-prefixed files,
+    e.g. v1.0-REQUIREMENTS.md).
+    """
+    fs = fs or FsSnapshot()
+    candidates = [planning_dir / filename, root_planning_dir / filename]
+    milestones_dir = root_planning_dir / "milestones"
+    if fs.exists(milestones_dir):
+        candidates.append(milestones_dir / f"{version}-{filename}")
+
+    for candidate in candidates:
+        if fs.exists(candidate):
+            return candidate
+    return None
+
+
+def generate_milestone_dashboard(
+    planning_dir: Path,
+    milestone_name: str,
+    wxcode_version: str,
+    root_planning_dir: Optional[Path] = None,
+    is_archived: bool = False,
+    cache: Optional[ParseCache] = None,
+    pool: Optional[ProcessPoolExecutor] = None,
+    fs: Optional[FsSnapshot] = None,
+    phase_numbers: Optional[set] = None,
+    previous: Optional[dict] = None,
+    history: Optional[dict] = None
+) -> dict:
+    """Generate a complete milestone dashboard.
+
+    Args:
+        planning_dir: The milestone folder path (could be .planning or .planning/milestones/v1.0-X)
+        milestone_name: Name of the milestone (e.g., v1.0-PAGE_Login)
+        wxcode_version: WXCODE version string
+        root_planning_dir: The root .planning directory (for fallback phases lookup)
+        is_archived: Whether this milestone is archived
+        cache: Optional parse cache shared across milestones and runs
+        pool: Optional worker pool used to parse phase directories in parallel
+        fs: Optional filesystem snapshot shared across the run
+        phase_numbers: With previous, re-parse only these phases (see patch_phases)
+        previous: The milestone's existing dashboard, to take the other phases from
+        history: The milestone's TimingHistory records (see milestone_velocity)
+    """
+    fs = fs or FsSnapshot()
+
+    meta = read_milestone_meta(planning_dir, milestone_name, fs)
+    version = meta["version"]
+    element = meta["element"]
+    elements = meta["elements"]
+    display_name = meta["display_name"]
+
+    # Use root_planning_dir for fallback if provided
+    if root_planning_dir is None:
+        root_planning_dir = planning_dir
+
+    # Detect phases directory (check milestone folder first, then root)
+    phases_dir = detect_phases_dir(root_planning_dir, planning_dir, fs)
+
+    # Parse all phases (once per run for milestones sharing the root phases/)
+    phases = []
+    if phases_dir and fs.is_dir(phases_dir):
+        phase_dirs = sorted(d for d in fs.subdirs(phases_dir) if _PHASE_DIR_RE.match(d.name))
+        with timed("phases"):
+            if phase_numbers is not None and previous is not None:
+                phases = patch_phases(phase_dirs, phase_numbers, previous.get("phases", []), cache, fs)
+            elif phases_dir == root_planning_dir / "phases":
+                phases = fs.memoized("phases", phases_dir, lambda: parse_phases(phase_dirs, cache, pool, fs))
+            else:
+                # A milestone's own phases/ is parsed once anyway; memoizing would keep a copy for the run
+                phases = parse_phases(phase_dirs, cache, pool, fs)
+
+    # Parse roadmap for goals and requirements
+    roadmap_path = find_milestone_document(planning_dir, root_planning_dir, version, "ROADMAP.md", fs)
+    roadmap_info = {}
+    if roadmap_path:
+        # Phase numbers come back as strings after a JSON round trip through the cache
+        with timed("roadmap"):
+            roadmap = fs.memoized(
+                "roadmap", roadmap_path, lambda: cached_parse(cache, "roadmap", roadmap_path, parse_roadmap, fs=fs)
+            )
+        roadmap_info = {int(num): info for num, info in roadmap.items()}
+
+    # Enrich phases with roadmap info
+    for phase in phases:
+        phase_num = phase["number"]
+        if phase_num in roadmap_info:
+            phase["goal"] = roadmap_info[phase_num].get("goal", "")
+            phase["requirements_covered"] = roadmap_info[phase_num].get("requirements", [])
+
+    # Add roadmap phases that don't have directories yet (e.g., Phase 3 not planned yet)
+    existing_phase_nums = {p["number"] for p in phases}
+    for num, info in sorted(roadmap_info.items()):
+        if num not in existing_phase_nums:
+            phases.append({
+                "number": num,
+                "name": info.get("name", f"Phase {num}"),
+                "goal": info.get("goal", ""),
+                "status": "pending",
+                "requirements_covered": info.get("requirements", []),
+                "plans": [],
+                "verified": False
+            })
+    phases.sort(key=lambda p: p["number"])
+
+    # Parse requirements - check multiple locations
+    requirements_path = find_milestone_document(planning_dir, root_planning_dir, version, "REQUIREMENTS.md", fs)
+    if requirements_path:
+        with timed("requirements"):
+            requirements = fs.memoized(
+                "requirements", requirements_path,
+                lambda: cached_parse(cache, "requirements", requirements_path, parse_requirements, fs=fs)
+            )
+    else:
+        requirements = {"total": 0, "complete": 0, "by_category": {}}
+    # Milestones falling back to the project-wide REQUIREMENTS.md index only their own phases' share
+    shared_requirements = planning_dir != root_planning_dir and requirements_path == root_planning_dir / "REQUIREMENTS.md"
+    with timed("requirements"):
+        coverage = build_requirement_index(
+            requirements.pop("items", []), phases, is_archived,
+            existing_phase_nums if shared_requirements else None
+        )
+    with timed("graph"):
+        plan_graph = build_plan_graph(
+            phases, {num: info.get("depends_on") for num, info in roadmap_info.items()}, is_archived
+        )
+    with timed("velocity"):
+        velocity = milestone_velocity(phases, history or {}, is_archived)
+
+    # Detect workflow stages
+    with timed("workflow"):
+        workflow = detect_workflow_stages(
+            root_planning_dir or planning_dir,
+            phases_dir,
+            phases,
+            is_archived=is_archived,
+            milestone_name=milestone_name,
+            fs=fs,
+            cache=cache
+        )
+
+    # For archived milestones, mark all requirements as complete
+    if is_archived and requirements.get("total", 0) > 0:
+        requirements["complete"] = requirements["total"]
+        for cat in requirements.get("by_category", {}).values():
+            cat["complete"] = cat["total"]
+
+    # Calculate progress
+    progress = calculate_progress(phases, requirements)
+
+    # For archived milestones, ensure all progress is 100%
+    if is_archived:
+        if progress["phases_total"] > 0:
+            progress["phases_complete"] = progress["phases_total"]
+            progress["phases_percentage"] = 100
+        if progress["plans_total"] > 0:
+            progress["plans_complete"] = progress["plans_total"]
+            progress["plans_percentage"] = 100
+        if progress["tasks_total"] > 0:
+            progress["tasks_complete"] = progress["tasks_total"]
+            progress["tasks_percentage"] = 100
+        if progress["requirements_total"] > 0:
+            progress["requirements_complete"] = progress["requirements_total"]
+            progress["requirements_percentage"] = 100
+
+    # Determine current position
+    current_phase = None
+    current_plan = None
+    if not is_archived:
+        for phase in phases:
+            if phase["status"] != "complete":
+                current_phase = phase["number"]
+                for plan in phase.get("plans", []):
+                    if plan["status"] != "complete":
+                        current_plan = plan["number"]
+                        break
+                break
+
+    # Determine milestone status
+    if is_archived:
+        milestone_status = "completed"
+    elif any(p["status"] != "complete" for p in phases):
+        milestone_status = "in_progress"
+    else:
+        milestone_status = "completed"
+
+    # Load business rules summary cache (written by wxcode-rules-verifier agent)
+    rules_summary = None
+    rules_summary_path = root_planning_dir / "rules-summary.json" if root_planning_dir else planning_dir / "rules-summary.json"
+    if fs.exists(rules_summary_path):
+        try:
+            rules_summary = json.loads(read_file(rules_summary_path))
+        except (json.JSONDecodeError, OSError):
+            pass
+
+    # Build dashboard
+    dashboard = {
+        "milestone": {
+            "folder_name": milestone_name,
+            "mongodb_id": None,  # Would need MCP to get this
+            "wxcode_version": version,
+            "element_name": element,
+            "elements": elements,
+            "display_name": display_name,
+            "status": milestone_status,
+            "created_at": velocity["started_at"] or iso_timestamp(planning_created_time(planning_dir, fs)),
+            "completed_at": (velocity["last_completed_at"] or run_timestamp()) if is_archived else None
+        },
+        "workflow": workflow,
+        "current_position": {
+            "phase_number": current_phase,
+            "phase_name": next((p["name"] for p in phases if p["number"] == current_phase), None),
+            "plan_number": current_plan,
+            "plan_total": progress["plans_total"],
+            "status": "complete" if is_archived or not current_phase else "in_progress"
+        },
+        "progress": progress,
+        "phases": phases,
+        "requirements": requirements,
+        "requirements_coverage": coverage,
+        "plan_graph": plan_graph,
+        "velocity": velocity,
+        "blockers": [],
+        "business_rules": rules_summary if rules_summary else None,
+        "meta": {
+            "generated_at": run_timestamp(),
+            "wxcode_version": wxcode_version,
+            "generator": "generate-dashboard.py"
+        }
+    }
+
+    return dashboard
+
+
+def milestone_dashboard_path(planning_dir: Path, milestone: dict) -> Path:
+    return planning_dir / f"dashboard_{milestone['folder_name']}.json"
+
+
+def load_previous_dashboard(planning_dir: Path, milestone: dict, wxcode_version: str) -> Optional[dict]:
+    """The milestone's existing dashboard, if it can seed a --phase update.
+
+    Dashboards from another WXCODE version may have a different layout, so
+    those (and missing or unreadable files) return None for a full rebuild.
+    """
+    try:
+        dashboard = json.loads(read_file(milestone_dashboard_path(planning_dir, milestone)))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(dashboard, dict) or dashboard.get("meta", {}).get("wxcode_version") != wxcode_version:
+        return None
+    # Written before plans recorded their requirement IDs
+    if "requirements_coverage" not in dashboard:
+        return None
+    # Written before plans carried their frontmatter fields, timing sources or requirement mentions
+    if any(
+        "dependencies" not in plan or "source" not in plan.get("timing", {}) or "requirements_mentioned" not in plan
+        for phase in dashboard.get("phases", []) for plan in phase.get("plans", [])
+    ):
+        return None
+    return dashboard
+
+
+def milestone_worker(
+    planning_dir: Path,
+    milestone: dict,
+    wxcode_version: str,
+    timestamp: str,
+    history: Optional[dict] = None
+) -> tuple:
+    """Pool entry point: generate one milestone dashboard in a worker process."""
+    # Share the parent's run timestamp so all dashboards of a run agree
+    global _run_timestamp
+    _run_timestamp = timestamp
+    fs = FsSnapshot()
+    dashboard = generate_milestone_dashboard(
+        milestone["path"],
+        milestone["folder_name"],
+        wxcode_version,
+        root_planning_dir=planning_dir,
+        is_archived=milestone["archived"],
+        cache=_worker_cache,
+        fs=fs,
+        history=history
+    )
+    return dashboard, take_worker_updates(), fs.counts(), take_worker_stats()
+
+
+def generate_milestone_dashboards(
+    planning_dir: Path,
+    milestones: list,
+    wxcode_version: str,
+    cache: Optional[ParseCache] = None,
+    pool: Optional[ProcessPoolExecutor] = None,
+    fs: Optional[FsSnapshot] = None,
+    phase_numbers: Optional[dict] = None,
+    history: Optional[TimingHistory] = None
+):
+    """Yield (milestone, dashboard) pairs in milestone order.
+
+    With a pool, several milestones are spread across workers; a single
+    milestone instead spreads its phase directories. phase_numbers maps
+    milestone folder names to the set of phases to re-parse; the other phases of
+    those milestones come from their existing dashboards. history supplies the
+    recorded plan timings (it is read, not updated).
+    """
+    fs = fs or FsSnapshot()
+    phase_numbers = phase_numbers or {}
+    history = history or TimingHistory(planning_dir / TIMING_FILENAME)
+    if pool is None or len(milestones) < 2 or phase_numbers:
+        for milestone in milestones:
+            numbers = phase_numbers.get(milestone["folder_name"])
+            previous = None
+            if numbers is not None:
+                previous = load_previous_dashboard(planning_dir, milestone, wxcode_version)
+            yield milestone, generate_milestone_dashboard(
+                milestone["path"],
+                milestone["folder_name"],
+                wxcode_version,
+                root_planning_dir=planning_dir,  # Pass root for fallback phases lookup
+                is_archived=milestone["archived"],
+                cache=cache,
+                pool=pool,
+                fs=fs,
+                phase_numbers=numbers,
+                previous=previous,
+                history=history.records(milestone["folder_name"])
+            )
+        return
+
+    futures = [
+        pool.submit(
+            milestone_worker, planning_dir, m, wxcode_version, run_timestamp(), history.records(m["folder_name"])
+        )
+        for m in milestones
+    ]
+    for milestone, future in zip(milestones, futures):
+        dashboard, updates, fs_counts, stats = future.result()
+        if cache is not None:
+            cache.merge(updates)
+        fs.merge_counts(fs_counts)
+        merge_worker_stats(stats)
+        yield milestone, dashboard
+
+
+_PROJECT_NAME_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+_PROJECT_CORE_VALUE_RE = re.compile(r'##\s*Core Value\s*\n+(.+?)(?=\n#|\Z)', re.DOTALL)
+_PROJECT_DESCRIPTION_RE = re.compile(r'##\s*What This Is\s*\n+(.+?)(?=\n#|\Z)', re.DOTALL)
+_CONVERSION_STACK_RE = re.compile(r'stack[:\s]+([a-z0-9-]+)', re.IGNORECASE)
+
+
+def parse_project_md(project_path: Path) -> dict:
+    """Parse PROJECT.md for project info."""
+    if not project_path.exists():
+        return {}
+
+    content = read_file(project_path)
+
+    # Extract name (first H1)
+    name_match = _PROJECT_NAME_RE.search(content)
+    name = name_match.group(1).strip() if name_match else "Unknown Project"
+
+    # Extract core value
+    core_value_match = _PROJECT_CORE_VALUE_RE.search(content)
+    core_value = core_value_match.group(1).strip() if core_value_match else ""
+
+    # Extract description
+    desc_match = _PROJECT_DESCRIPTION_RE.search(content)
+    description = desc_match.group(1).strip() if desc_match else ""
+
+    return {
+        "name": name,
+        "core_value": core_value[:500] if core_value else "",
+        "description": description[:500] if description else ""
+    }
+
+
+def parse_conversion_md(conversion_path: Path) -> dict:
+    """Parse CONVERSION.md for conversion project info."""
+    if not conversion_path.exists():
+        return {"is_conversion_project": False}
+
+    content = read_file(conversion_path)
+
+    # Extract stack
+    stack_match = _CONVERSION_STACK_RE.search(content)
+    stack = stack_match.group(1) if stack_match else None
+
+    return {
+        "is_conversion_project": True,
+        "stack": stack
+    }
+
+
+def find_milestones(planning_dir: Path, fs: Optional[FsSnapshot] = None) -> list:
+    """Find all milestone folders."""
+    fs = fs or FsSnapshot()
+    milestones = []
+
+    # Check for nested milestone folders (.planning/v1.0-PAGE_Login/)
+    for item in sorted(fs.subdirs(planning_dir)):
+        if _MILESTONE_DIR_RE.match(item.name):
+            milestones.append({
+                "folder_name": item.name,
+                "path": item,
+                "archived": False
+            })
+
+    # Check for milestones in .planning/milestones/
+    # These may be active (placeholder with MILESTONE.json) or archived
+    milestones_dir = planning_dir / "milestones"
+    if fs.exists(milestones_dir):
+        for item in sorted(fs.subdirs(milestones_dir)):
+            if _MILESTONE_DIR_RE.match(item.name):
+                # Determine if truly archived by checking MILESTONE.json status
+                is_archived = True  # safe default for old data
+                milestone_json = item / "MILESTONE.json"
+                if fs.exists(milestone_json):
+                    try:
+                        meta = json.loads(read_file(milestone_json))
+                        ms_status = meta.get("status", "completed")
+                        is_archived = ms_status in ("completed", "archived")
+                    except (json.JSONDecodeError, OSError):
+                        pass
+
+                milestones.append({
+                    "folder_name": item.name,
+                    "path": item,
+                    "archived": is_archived
+                })
+
+    # Check for flat structure (single active milestone)
+    if not milestones and fs.exists(planning_dir / "ROADMAP.md"):
+        # Try to get milestone name from STATE.md
+        state_path = planning_dir / "STATE.md"
+        milestone_name = "v1.0-current"
+        if fs.exists(state_path):
+            content = read_file(state_path)
+            match = _STATE_MILESTONE_RE.search(content)
+            if match:
+                milestone_name = match.group(1)
+
+        milestones.append({
+            "folder_name": milestone_name,
+            "path": planning_dir,
+            "archived": False
+        })
+
+    return milestones
+
+
+def find_current_milestone(milestones: list) -> Optional[dict]:
+    """The first non-archived milestone, else the first one."""
+    return next((m for m in milestones if not m["archived"]), milestones[0] if milestones else None)
+
+
+SUMMARIES_FILENAME = ".dashboard-summaries.json"
+SUMMARIES_VERSION = 3
+# Weeks averaged into velocity.plans_per_week, up to the latest completion
+VELOCITY_WEEKS = 4
+_PROGRESS_TOTALS = ("phases", "plans", "tasks", "requirements")
+
+
+def milestone_summary(planning_dir: Path, milestone: dict, dashboard: dict, fs: Optional[FsSnapshot] = None) -> dict:
+    """Compact record of a milestone dashboard, from which the project aggregates are built.
+
+    Besides the progress counts it keeps the milestone's phases directory and
+    REQUIREMENTS.md (relative to planning_dir) so milestones sharing them are
+    counted once, and plan completions per UTC day from the plans' timing.
+    """
+    fs = fs or FsSnapshot()
+    folder = milestone["path"]
+    info = dashboard["milestone"]
+    phases_dir = detect_phases_dir(planning_dir, folder, fs)
+    requirements_path = find_milestone_document(folder, planning_dir, info["wxcode_version"], "REQUIREMENTS.md", fs)
+
+    completions = {}
+    for timing in timing_records(dashboard).values():
+        day = timing["completed_at"][:10]
+        completions[day] = completions.get(day, 0) + 1
+
+    def relative(path: Optional[Path]) -> Optional[str]:
+        return path.relative_to(planning_dir).as_posix() if path else None
+
+    progress = dashboard["progress"]
+    record = {
+        "element": info.get("element_name"),
+        "elements": info.get("elements") or [],
+        "archived": milestone["archived"],
+        "created_at": info.get("created_at"),
+        "completed_at": info.get("completed_at"),
+        "phases_dir": relative(phases_dir),
+        "requirements_doc": relative(requirements_path),
+        "completions": dict(sorted(completions.items())),
+    }
+    for name in _PROGRESS_TOTALS:
+        record[f"{name}_complete"] = progress.get(f"{name}_complete", 0)
+        record[f"{name}_total"] = progress.get(f"{name}_total", 0)
+    return record
+
+
+def load_milestone_summaries(planning_dir: Path) -> dict:
+    """Stored milestone_summary() records by folder name ({} if missing or outdated)."""
+    try:
+        data = json.loads((planning_dir / SUMMARIES_FILENAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != SUMMARIES_VERSION:
+        return {}
+    return data.get("milestones", {})
+
+
+def save_milestone_summaries(planning_dir: Path, summaries: dict):
+    try:
+        atomic_write_text(planning_dir / SUMMARIES_FILENAME, json.dumps(
+            {"version": SUMMARIES_VERSION, "milestones": summaries}, separators=(",", ":")
+        ))
+    except OSError:
+        pass
+
+
+def aggregate_summaries(summaries: list) -> dict:
+    """Project totals, plan velocity and per-element progress from milestone summaries.
+
+    Phases, plans, tasks and completions are counted once per phases directory,
+    requirements once per REQUIREMENTS.md, however many milestones share them.
+    plans_per_week averages the VELOCITY_WEEKS weeks up to the latest
+    completion, like milestone_velocity, so it does not decay between runs.
+    """
+    totals = {f"{name}_{kind}": 0 for name in _PROGRESS_TOTALS for kind in ("complete", "total")}
+    by_day = {}
+    elements = {}
+    seen_phases = set()
+    seen_requirements = set()
+    for record in summaries:
+        phases_key = record["phases_dir"]
+        if phases_key is None or phases_key not in seen_phases:
+            seen_phases.add(phases_key)
+            for name in ("phases", "plans", "tasks"):
+                totals[f"{name}_complete"] += record[f"{name}_complete"]
+                totals[f"{name}_total"] += record[f"{name}_total"]
+            for day, completed in record["completions"].items():
+                by_day[day] = by_day.get(day, 0) + completed
+        requirements_key = record["requirements_doc"]
+        if requirements_key is None or requirements_key not in seen_requirements:
+            seen_requirements.add(requirements_key)
+            totals["requirements_complete"] += record["requirements_complete"]
+            totals["requirements_total"] += record["requirements_total"]
+
+        for element in record["elements"] or ([record["element"]] if record["element"] else []):
+            entry = elements.setdefault(element, {"element": element, "milestones": 0,
+                                                  "tasks_complete": 0, "tasks_total": 0})
+            entry["milestones"] += 1
+            entry["tasks_complete"] += record["tasks_complete"]
+            entry["tasks_total"] += record["tasks_total"]
+
+    by_week = {}
+    for day, completed in sorted(by_day.items()):
+        year, week, _ = datetime.strptime(day, "%Y-%m-%d").isocalendar()
+        key = f"{year}-W{week:02d}"
+        by_week[key] = by_week.get(key, 0) + completed
+    recent_weeks = set()
+    if by_day:
+        latest = datetime.strptime(max(by_day), "%Y-%m-%d")
+        for weeks_ago in range(VELOCITY_WEEKS):
+            year, week, _ = (latest - timedelta(weeks=weeks_ago)).isocalendar()
+            recent_weeks.add(f"{year}-W{week:02d}")
+    recent = sum(completed for week, completed in by_week.items() if week in recent_weeks)
+
+    for entry in elements.values():
+        entry["tasks_percentage"] = round(entry["tasks_complete"] / entry["tasks_total"] * 100) if entry["tasks_total"] else 0
+
+    aggregates = {"milestones_summarized": len(summaries)}
+    for name in _PROGRESS_TOTALS:
+        complete, total = totals[f"{name}_complete"], totals[f"{name}_total"]
+        aggregates[f"{name}_complete"] = complete
+        aggregates[f"{name}_total"] = total
+        aggregates[f"{name}_percentage"] = round(complete / total * 100) if total else 0
+    aggregates["velocity"] = {
+        "plans_completed_by_week": by_week,
+        "plans_per_week": round(recent / VELOCITY_WEEKS, 1),
+    }
+    aggregates["elements"] = [elements[name] for name in sorted(elements)]
+    return aggregates
+
+
+def project_summaries(
+    planning_dir: Path,
+    milestones: list,
+    summaries: Optional[dict] = None,
+    fs: Optional[FsSnapshot] = None
+) -> list:
+    """Summary records of the given milestones, in order.
+
+    Taken from summaries (default: the stored ones); milestones without a
+    record are summarized from their existing dashboard file and added to
+    summaries, or skipped when they have never been generated.
+    """
+    fs = fs or FsSnapshot()
+    if summaries is None:
+        summaries = load_milestone_summaries(planning_dir)
+    records = []
+    for milestone in milestones:
+        record = summaries.get(milestone["folder_name"])
+        if record is None:
+            try:
+                dashboard = json.loads(read_file(milestone_dashboard_path(planning_dir, milestone)))
+                record = milestone_summary(planning_dir, milestone, dashboard, fs)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                continue
+            summaries[milestone["folder_name"]] = record
+        records.append(record)
+    return records
+
+
+def generate_project_dashboard(
+    planning_dir: Path,
+    milestones: list,
+    wxcode_version: str,
+    fs: Optional[FsSnapshot] = None,
+    summaries: Optional[dict] = None
+) -> dict:
+    """Generate the project dashboard.
+
+    The "aggregates" section is built from milestone summary records (see
+    project_summaries), so no milestone is parsed here.
+    """
+    fs = fs or FsSnapshot()
+
+    # Parse project info
+    project_info = parse_project_md(planning_dir / "PROJECT.md")
+
+    # Parse conversion info
+    conversion_info = parse_conversion_md(planning_dir / "CONVERSION.md")
+
+    if summaries is None:
+        summaries = load_milestone_summaries(planning_dir)
+    records = project_summaries(planning_dir, milestones, summaries, fs)
+
+    # Build milestones array (dates as derived in each milestone dashboard)
+    milestones_array = []
+    for m in milestones:
+        meta = read_milestone_meta(m["path"], m["folder_name"], fs)
+        record = summaries.get(m["folder_name"]) or {}
+
+        milestones_array.append({
+            "folder_name": m["folder_name"],
+            "mongodb_id": None,
+            "wxcode_version": meta["version"],
+            "element_name": meta["element"],
+            "elements": meta["elements"],
+            "display_name": meta["display_name"],
+            "status": "completed" if m["archived"] else "in_progress",
+            "created_at": record.get("created_at") or iso_timestamp(planning_created_time(m["path"], fs)),
+            "completed_at": record.get("completed_at")
+        })
+
+    # Find current milestone
+    current = find_current_milestone(milestones)
+    current_milestone = current["folder_name"] if current else None
+
+    # Calculate progress
+    milestones_complete = sum(1 for m in milestones if m["archived"])
+    milestones_total = len(milestones)
+
+    return {
+        "project": project_info,
+        "conversion": {
+            "is_conversion_project": conversion_info.get("is_conversion_project", False),
+            "elements_converted": None,  # Would need MCP
+            "elements_total": None,  # Would need MCP
+            "stack": conversion_info.get("stack")
+        },
+        "milestones": milestones_array,
+        "current_milestone": current_milestone,
+        "progress": {
+            "milestones_complete": milestones_complete,
+            "milestones_total": milestones_total,
+            "milestones_percentage": round((milestones_complete / milestones_total * 100) if milestones_total else 0)
+        },
+        "aggregates": aggregate_summaries(records),
+        "meta": {
+            "generated_at": run_timestamp(),
+            "wxcode_version": wxcode_version,
+            "generator": "generate-dashboard.py"
+        }
+    }
+
+
+HISTORY_FILENAME = "dashboard-history.jsonl"
+HISTORY_STATE_FILENAME = ".dashboard-history-state.json"
+HISTORY_VERSION = 1
+# The history log is rotated to dashboard-history.1.jsonl, ... past this size
+HISTORY_MAX_BYTES = 1024 * 1024
+HISTORY_ROTATIONS = 3
+_HISTORY_KINDS = ("phase", "plan", "task", "stage", "requirement")
+
+
+def history_state(dashboard: dict) -> dict:
+    """Statuses a milestone dashboard is tracked by in the history log, by kind and ID."""
+    phases = dashboard["phases"]
+    plans = [plan for phase in phases for plan in phase["plans"]]
+    return {
+        "phase": {str(phase["number"]): phase["status"] for phase in phases},
+        "plan": {plan["number"]: plan["status"] for plan in plans},
+        "task": {task["id"]: task["status"] for plan in plans for task in plan["tasks"]},
+        "stage": {stage["id"]: stage["status"] for stage in dashboard["workflow"]["stages"]},
+        "requirement": {
+            req_id: entry["status"] == "complete"
+            for req_id, entry in dashboard["requirements_coverage"]["index"].items()
+        }
+    }
+
+
+def history_changes(old: dict, new: dict) -> list:
+    """[kind, id, from, to] for every status that differs (null for added or removed IDs)."""
+    changes = []
+    for kind in _HISTORY_KINDS:
+        before, after = old.get(kind, {}), new[kind]
+        changes.extend([kind, key, before.get(key), value] for key, value in after.items() if before.get(key) != value)
+        changes.extend([kind, key, value, None] for key, value in before.items() if key not in after)
+    return changes
+
+
+class DashboardHistory:
+    """Append-only JSON-lines log of status changes between dashboard generations.
+
+    Each line carries the run timestamp ("ts") and a milestone, plus one of:
+    "changes" ([kind, id, from, to] for phases, plans, tasks, workflow stages
+    and requirement checkboxes), "snapshot" (every tracked status, written
+    for milestones seen for the first time) or "removed". The last state per
+    milestone is kept in a hidden JSON-lines file, so nothing is re-read to
+    diff; in memory it stays zlib-compressed and is only decoded for
+    milestones that changed. Once the log passes HISTORY_MAX_BYTES it is
+    rotated and the new file starts with one snapshot line per milestone,
+    folding the older deltas away.
+    """
+
+    STATE_PREFIX = '{"milestone":'
+    STATE_KEY = ',"state":'
+
+    def __init__(self, planning_dir: Path):
+        self.path = planning_dir / HISTORY_FILENAME
+        self.state_path = planning_dir / HISTORY_STATE_FILENAME
+        self.milestones = {}
+        self.pending = []
+
+    def load(self) -> "DashboardHistory":
+        if not self.path.exists():
+            return self
+        import zlib
+        decoder = json.JSONDecoder()
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                if json.loads(f.readline() or "null") != {"version": HISTORY_VERSION}:
+                    return self
+                # Lines are written by save(); split them instead of parsing the states
+                for line in f:
+                    if not line.startswith(self.STATE_PREFIX):
+                        raise ValueError(line[:80])
+                    name, end = decoder.raw_decode(line, len(self.STATE_PREFIX))
+                    line = line.rstrip()
+                    if not line.startswith(self.STATE_KEY, end) or not line.endswith("}"):
+                        raise ValueError(line[:80])
+                    self.milestones[name] = zlib.compress(line[end + len(self.STATE_KEY):-1].encode("utf-8"), 1)
+        except (OSError, ValueError):
+            self.milestones = {}
+        return self
+
+    def line(self, milestone: str, key: str, value: str) -> str:
+        prefix = f'{{"ts":{json.dumps(run_timestamp())},"milestone":{json.dumps(milestone, ensure_ascii=False)}'
+        return f'{prefix},"{key}":{value}}}\n'
+
+    def record(self, milestone: str, dashboard: dict):
+        """Queue the changes of a regenerated milestone dashboard."""
+        import zlib
+        state = history_state(dashboard)
+        text = _minified_text(state)
+        packed = zlib.compress(text.encode("utf-8"), 1)
+        previous = self.milestones.get(milestone)
+        if previous == packed:
+            return
+        self.milestones[milestone] = packed
+        try:
+            changes = history_changes(json.loads(zlib.decompress(previous)), state) if previous else None
+        except (zlib.error, ValueError):
+            changes = None
+        if changes is None:
+            self.pending.append(self.line(milestone, "snapshot", text))
+        elif changes:
+            self.pending.append(self.line(milestone, "changes", _minified_text(changes)))
+
+    def retain(self, milestones: set):
+        """Queue "removed" lines for milestones that no longer exist."""
+        for name in [name for name in self.milestones if name not in milestones]:
+            del self.milestones[name]
+            self.pending.append(self.line(name, "removed", "true"))
+
+    def rotated_path(self, index: int) -> Path:
+        return self.path.with_name(f"{self.path.stem}.{index}{self.path.suffix}")
+
+    def save(self):
+        """Append the queued lines, rotating the log first if it grew too large."""
+        if not self.pending:
+            return
+        import zlib
+        lines = "".join(self.pending)
+        self.pending = []
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            if self.path.stat().st_size > HISTORY_MAX_BYTES:
+                for index in range(HISTORY_ROTATIONS - 1, 0, -1):
+                    if self.rotated_path(index).exists():
+                        os.replace(self.rotated_path(index), self.rotated_path(index + 1))
+                os.replace(self.path, self.rotated_path(1))
+                with atomic_writer(self.path) as f:
+                    for name, packed in self.milestones.items():
+                        f.write(self.line(name, "snapshot", zlib.decompress(packed).decode("utf-8")).encode("utf-8"))
+            with atomic_writer(self.state_path) as f:
+                f.write(f'{{"version":{HISTORY_VERSION}}}\n'.encode("utf-8"))
+                for name, packed in self.milestones.items():
+                    name_json = json.dumps(name, ensure_ascii=False).encode("utf-8")
+                    f.write(self.STATE_PREFIX.encode("ascii") + name_json + self.STATE_KEY.encode("ascii"))
+                    f.write(zlib.decompress(packed) + b"}\n")
+        except OSError:
+            pass
+
+
+# Machine-local state kept next to the dashboards. It is listed in
+# .planning/.gitignore so that committing .planning/ leaves it out.
+LOCAL_STATE_PATTERNS = (
+    CACHE_FILENAME, STATE_FILENAME, SUMMARIES_FILENAME, TIMING_FILENAME,
+    HISTORY_STATE_FILENAME, "dashboard-history*.jsonl",
+)
+GITIGNORE_FILENAME = ".gitignore"
+
+
+def ensure_gitignore(planning_dir: Path, patterns: tuple = LOCAL_STATE_PATTERNS):
+    """Append the patterns missing from .planning/.gitignore, creating the file if needed."""
+    path = planning_dir / GITIGNORE_FILENAME
+    try:
+        existing = path.read_text(encoding="utf-8") if path.exists() else ""
+        listed = {line.strip() for line in existing.splitlines()}
+        missing = [pattern for pattern in patterns if pattern not in listed]
+        if not missing:
+            return
+        lines = [] if existing else ["# Machine-local WXCODE state, written by generate-dashboard.py"]
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(("\n" if existing and not existing.endswith("\n") else "") + "\n".join(lines + missing) + "\n")
+    except OSError:
+        pass
+
+
+def generate_dashboards(
+    planning_dir: Path,
+    milestones: list,
+    wxcode_version: str,
+    targets: Optional[list] = None,
+    cache: Optional[ParseCache] = None,
+    pool: Optional[ProcessPoolExecutor] = None,
+    force: bool = False,
+    fs: Optional[FsSnapshot] = None,
+    phase_numbers: Optional[dict] = None,
+    compact: bool = False
+):
+    """Write the project dashboard plus the dashboards of the target milestones.
+
+    targets defaults to every milestone; pass [] for the project dashboard only.
+    Summary records of the regenerated milestones are stored for the project
+    aggregates (see milestone_summary), their plan timings are appended to
+    the timing log (see TimingHistory) and their status changes to the
+    history log (see DashboardHistory).
+    phase_numbers limits re-parsing to some phases (see generate_milestone_dashboards).
+    compact also writes a .wxds snapshot next to each milestone dashboard.
+    The machine-local state files are listed in .planning/.gitignore.
+    Prints [WXCODE:DASHBOARD_UPDATED] for every file actually rewritten and
+    returns the paths of all dashboards produced, written or not.
+    """
+    fs = fs or FsSnapshot()
+    if targets is None:
+        targets = milestones
+    ensure_gitignore(planning_dir)
+
+    # Milestones first: their summary records feed the project aggregates
+    outputs = []
+    summaries = load_milestone_summaries(planning_dir)
+    known = {m["folder_name"] for m in milestones}
+    summaries_changed = any(name not in known for name in summaries)
+    summaries = {name: record for name, record in summaries.items() if name in known}
+    history = TimingHistory(planning_dir / TIMING_FILENAME).load()
+    history.retain(known)
+    changes = DashboardHistory(planning_dir).load()
+    changes.retain(known)
+    for milestone, milestone_dashboard in generate_milestone_dashboards(
+        planning_dir, targets, wxcode_version, cache, pool, fs, phase_numbers, history
+    ):
+        dashboard_path = milestone_dashboard_path(planning_dir, milestone)
+        outputs.append(dashboard_path)
+        written = write_dashboard(dashboard_path, milestone_dashboard, force=force)
+        if compact:
+            write_snapshot(dashboard_path, milestone_dashboard, changed=written)
+            outputs.append(snapshot_path(dashboard_path))
+        if written:
+            print(f"[WXCODE:DASHBOARD_UPDATED] {dashboard_path}", flush=True)
+        history.update(milestone["folder_name"], timing_records(milestone_dashboard))
+        with timed("history"):
+            changes.record(milestone["folder_name"], milestone_dashboard)
+        record = milestone_summary(planning_dir, milestone, milestone_dashboard, fs)
+        if summaries.get(milestone["folder_name"]) != record:
+            summaries[milestone["folder_name"]] = record
+            summaries_changed = True
+
+    stored = len(summaries)
+    with timed("project"):
+        project_dashboard = generate_project_dashboard(planning_dir, milestones, wxcode_version, fs, summaries)
+    if summaries_changed or len(summaries) != stored:
+        save_milestone_summaries(planning_dir, summaries)
+    with timed("history"):
+        changes.save()
+    project_dashboard_path = planning_dir / "dashboard.json"
+    outputs.insert(0, project_dashboard_path)
+    if write_dashboard(project_dashboard_path, project_dashboard, force=force):
+        print(f"[WXCODE:DASHBOARD_UPDATED] {project_dashboard_path}", flush=True)
+
+    if cache is not None:
+        cache.save()
+    return outputs
+
+
+# The in-memory model lives in wxcode_model.py (dataclasses are slow to import)
+_MODEL_EXPORTS = (
+    "Task", "Plan", "Phase", "Milestone", "Project",
+    "load_project", "refresh_project", "save_project",
+)
+
+
+def __getattr__(name: str):
+    """Re-export the wxcode_model names on first access (PEP 562)."""
+    if name in _MODEL_EXPORTS:
+        import wxcode_model
+        return getattr(wxcode_model, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Files whose changes affect milestone dashboards in --watch mode
+WATCH_SUFFIXES = ("-PLAN.md", "-SUMMARY.md", "-UAT.md", "-VERIFICATION.md", "ROADMAP.md", "REQUIREMENTS.md")
+# Files that change milestone discovery or project info: rebuild everything
+WATCH_STRUCTURAL = ("MILESTONE.json", "PROJECT.md", "CONVERSION.md", "STATE.md", "rules-summary.json")
+
+
+def is_watched_change(path: Path, is_dir: bool) -> bool:
+    """Whether a changed path can affect any dashboard (our own outputs never do)."""
+    name = path.name
+    if name.startswith(".") or is_dashboard_output(name):
+        return False
+    return is_dir or name.endswith(WATCH_SUFFIXES) or name in WATCH_STRUCTURAL
+
+
+class InotifyWatcher:
+    """Recursive watcher for a directory tree using Linux inotify through ctypes."""
+
+    kind = "inotify"
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_CLOEXEC = 0o2000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+    EVENT = "iIII"
+
+    def __init__(self, root: Path):
+        import ctypes
+        import ctypes.util
+        import struct
+        self.root = root
+        self.event = struct.Struct(self.EVENT)
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+        self.add_tree(root)
+
+    def add_tree(self, top: Path) -> set:
+        """Watch top and its subdirectories; return files already present (for new dirs)."""
+        found = set()
+        for dirpath, dirnames, filenames in os.walk(top):
+            wd = self._add_watch(self.fd, os.fsencode(dirpath), self.MASK)
+            if wd >= 0:
+                self.watches[wd] = Path(dirpath)
+            found.update((Path(dirpath) / name, False) for name in filenames)
+        return found
+
+    def read(self, timeout: Optional[float]) -> set:
+        """Wait up to timeout seconds; return {(path, is_dir)} that changed."""
+        import select
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        data = os.read(self.fd, 64 * 1024)
+        changes = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = self.event.unpack_from(data, offset)
+            raw_name = data[offset + self.event.size:offset + self.event.size + length]
+            offset += self.event.size + length
+
+            if mask & self.IN_Q_OVERFLOW:
+                # Events were dropped: report the root so everything is rebuilt
+                changes.add((self.root, True))
+                continue
+            if mask & self.IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+            name = os.fsdecode(raw_name.rstrip(b"\0"))
+            path = directory / name if name else directory
+            is_dir = bool(mask & self.IN_ISDIR) or not name
+
+            if is_dir and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                # Files may land in a new directory before its watch exists
+                changes |= self.add_tree(path)
+            changes.add((path, is_dir))
+        return changes
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Portable fallback watcher comparing (mtime, size) snapshots of the tree."""
+
+    kind = "polling"
+
+    def __init__(self, root: Path, interval: float):
+        self.root = root
+        self.interval = interval
+        self.state = self.scan()
+
+    def scan(self) -> dict:
+        state = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            for name in dirnames:
+                state[(Path(dirpath) / name, True)] = None
+            for name in filenames:
+                path = Path(dirpath) / name
+                state[(path, False)] = file_stamp(path)
+        return state
+
+    def read(self, timeout: Optional[float]) -> set:
+        """Sleep up to one interval (or timeout); return {(path, is_dir)} that changed."""
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        state = self.scan()
+        changes = {key for key in state.keys() | self.state.keys()
+                   if state.get(key, -1) != self.state.get(key, -1)}
+        self.state = state
+        return changes
+
+    def close(self):
+        pass
+
+
+def create_watcher(planning_dir: Path, poll: bool = False, interval: float = 1.0):
+    """Use inotify where available, otherwise fall back to mtime polling."""
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(planning_dir)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(planning_dir, interval)
+
+
+def milestone_sources(planning_dir: Path, milestone: dict, fs: Optional[FsSnapshot] = None) -> list:
+    """Paths a milestone dashboard is built from (files and directory roots)."""
+    fs = fs or FsSnapshot()
+    folder = milestone["path"]
+    version = read_milestone_meta(folder, milestone["folder_name"], fs)["version"]
+    sources = [folder]
+    phases_dir = detect_phases_dir(planning_dir, folder, fs)
+    if phases_dir:
+        sources.append(phases_dir)
+    for filename in ("ROADMAP.md", "REQUIREMENTS.md"):
+        document = find_milestone_document(folder, planning_dir, version, filename, fs)
+        if document:
+            sources.append(document)
+    return sources
+
+
+def affected_milestones(
+    planning_dir: Path,
+    milestones: list,
+    changes: set,
+    fs: Optional[FsSnapshot] = None
+) -> Optional[list]:
+    """Milestones whose dashboards depend on the changed paths.
+
+    Returns None when the change is structural (directories, MILESTONE.json,
+    PROJECT.md, ...) or maps to no known milestone, meaning rebuild everything.
+    """
+    fs = fs or FsSnapshot()
+    sources = [(m, milestone_sources(planning_dir, m, fs)) for m in milestones]
+    affected = []
+    for path, is_dir in changes:
+        if is_dir or path.name in WATCH_STRUCTURAL:
+            return None
+        matched = False
+        for milestone, paths in sources:
+            if any(path == source or source in path.parents for source in paths):
+                matched = True
+                if milestone not in affected:
+                    affected.append(milestone)
+        if not matched:
+            return None
+    # Keep discovery order so output order stays stable
+    return [m for m in milestones if m in affected]
+
+
+def narrow_targets(
+    planning_dir: Path,
+    milestones: list,
+    changes: set,
+    fs: Optional[FsSnapshot] = None
+) -> Optional[tuple]:
+    """Milestones and phases to regenerate for a set of changed files.
+
+    Returns (targets, phase_numbers), where phase_numbers maps the folder name
+    of each milestone whose changes all lie inside phase directories to the set
+    of those phase numbers (see generate_milestone_dashboards); the others are
+    rebuilt in full. None, as for affected_milestones, means rebuild everything.
+    """
+    fs = fs or FsSnapshot()
+    targets = affected_milestones(planning_dir, milestones, changes, fs)
+    if targets is None:
+        return None
+    phase_numbers = {}
+    for milestone in targets:
+        sources = milestone_sources(planning_dir, milestone, fs)
+        phases_dir = detect_phases_dir(planning_dir, milestone["path"], fs)
+        numbers = set()
+        for path, _ in changes:
+            if not any(path == source or source in path.parents for source in sources):
+                continue
+            if phases_dir is None or phases_dir not in path.parents:
+                # ROADMAP.md, REQUIREMENTS.md, ...
+                numbers = None
+                break
+            if path.parent == phases_dir:
+                # UAT files next to the phase directories only feed the workflow stages
+                continue
+            phase_dir = phases_dir / path.relative_to(phases_dir).parts[0]
+            if not _PHASE_DIR_RE.match(phase_dir.name):
+                numbers = None
+                break
+            numbers.add(phase_dir_identity(phase_dir)[0])
+        if numbers is not None:
+            phase_numbers[milestone["folder_name"]] = numbers
+    return targets, phase_numbers
+
+
+def watch(
+    planning_dir: Path,
+    wxcode_version: str,
+    cache: Optional[ParseCache],
+    pool: Optional[ProcessPoolExecutor],
+    args
+):
+    """Regenerate dashboards whenever planning files change, until interrupted.
+
+    Bursts of events (e.g. a whole execution wave) are debounced into one
+    regeneration: changes are collected until the tree has been quiet for
+    --debounce seconds, capped at 10x that so a steady stream still refreshes.
+    """
+    watcher = create_watcher(planning_dir, args.poll, args.poll_interval)
+    print(f"Watching {planning_dir} ({watcher.kind}), Ctrl+C to stop", flush=True)
+
+    def relevant(changes: set) -> set:
+        return {(path, is_dir) for path, is_dir in changes if is_watched_change(path, is_dir)}
+
+    milestones = find_milestones(planning_dir)
+    try:
+        while True:
+            changes = relevant(watcher.read(None))
+            if not changes:
+                continue
+
+            deadline = time.monotonic() + args.debounce * 10
+            while time.monotonic() < deadline:
+                more = relevant(watcher.read(args.debounce))
+                if not more:
+                    break
+                changes |= more
+
+            # Fresh snapshot per regeneration: the tree has changed since the last one
+            fs = FsSnapshot()
+            reset_stats(args.stats)
+            with timed("discovery"):
+                targets = affected_milestones(planning_dir, milestones, changes, fs)
+                if targets is None:
+                    milestones = find_milestones(planning_dir, fs)
+                    targets = milestones
+            if not milestones:
+                continue
+
+            reset_run_timestamp()
+            with timed("generate"):
+                generate_dashboards(
+                    planning_dir, milestones, wxcode_version, targets, cache, pool,
+                    fs=fs, compact=args.compact
+                )
+            if args.stats:
+                print_stats(fs)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def print_stats(fs: FsSnapshot):
+    """Print the --stats report of the run that just finished as one JSON line on stderr."""
+    report = _stats.report() if _stats is not None else {}
+    report["fs"] = fs.report()
+    print(json.dumps(report), file=sys.stderr, flush=True)
+
+
+def schema_main(args, project_dir: Path, planning_dir: Path):
+    """--schema: write the schema dashboard from the project's ORM model files."""
+    if args.check or args.watch or args.all or args.milestone or args.phase is not None or args.compact:
+        print("ERROR: --schema cannot be combined with --check, --watch, --all, --milestone, --phase or --compact",
+              file=sys.stderr)
+        sys.exit(1)
+
+    import wxcode_schema
+    legacy_tables = None
+    if args.legacy_tables:
+        try:
+            legacy_tables = wxcode_schema.load_legacy_tables(Path(args.legacy_tables))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"ERROR: Cannot read legacy tables: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    with timed("discovery"):
+        stack = wxcode_schema.detect_schema_stack(project_dir)
+    if stack["orm"] is not None and stack["orm"] not in wxcode_schema.SUPPORTED_ORMS:
+        supported = " and ".join(wxcode_schema.SUPPORTED_ORMS)
+        print(f"ERROR: Schema extraction supports {supported} models, not {stack['orm']} (stack {stack['id']})",
+              file=sys.stderr)
+        sys.exit(1)
+    if not stack["files"]:
+        print(f"ERROR: No SQLAlchemy or Prisma model files found in {project_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    cache = None
+    if not args.no_cache:
+        cache_path = planning_dir / wxcode_schema.SCHEMA_CACHE_FILENAME
+        ensure_gitignore(planning_dir, (wxcode_schema.SCHEMA_CACHE_FILENAME,))
+        cache = ParseCache(cache_path, wxcode_schema.SCHEMA_CACHE_VERSION).load()
+    with timed("generate"):
+        dashboard = wxcode_schema.generate_schema_outputs(project_dir, stack, cache, legacy_tables, force=args.force)
+    if args.stats:
+        print_stats(FsSnapshot())
+
+    coverage = dashboard["coverage"]
+    summary = f"{coverage['percentage']:g}% coverage" if coverage["legacy_tables"] else "legacy tables unknown"
+    print(f"\nSchema dashboard generated: {len(dashboard['tables'])} tables, {summary}")
+
+
+def main():
+    args = parse_args()
+
+    project_dir = Path(args.project_dir).resolve()
+    planning_dir = project_dir / ".planning"
+
+    if not planning_dir.exists():
+        print(f"ERROR: No .planning directory found in {project_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    wxcode_version = get_wxcode_version(args.wxcode_version)
+
+    # --profile implies --stats; when neither is given timed()/count() are no-ops
+    args.stats = args.stats or args.profile is not None
+    reset_stats(args.stats)
+
+    if args.schema:
+        schema_main(args, project_dir, planning_dir)
+        return
+
+    if args.check and args.watch:
+        print("ERROR: --check cannot be combined with --watch", file=sys.stderr)
+        sys.exit(1)
+
+    # Compare a stat-only tree of .planning/ with the last run with the same options:
+    # nothing changed skips parsing and writing entirely, a few changed files narrow
+    # the run to their milestones and phases. --force, --watch and instrumented runs
+    # always do the full work.
+    signature = tree = previous_run = changes = None
+    if args.check or not (args.force or args.watch or args.stats):
+        signature = run_signature(args, wxcode_version)
+        tree = planning_tree(planning_dir)
+        previous_run = load_planning_state(planning_dir, signature)
+        changes = planning_changes(planning_dir, previous_run, tree)
+        if args.check:
+            sys.exit(0 if changes == set() and not args.force else 1)
+        if changes == set():
+            print(f"\nDashboards up to date (WXCODE {wxcode_version})")
+            return
+
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    # One directory snapshot per run: every stat/listing below is served from it
+    fs = FsSnapshot()
+
+    # Find all milestones
+    with timed("discovery"):
+        milestones = find_milestones(planning_dir, fs)
+
+    if not milestones:
+        print("ERROR: No milestones found", file=sys.stderr)
+        sys.exit(1)
+
+    # Generate project dashboard, plus every milestone dashboard with --all / --watch
+    # or the selected one with --milestone / --phase
+    regenerate_all = args.all or args.watch
+    targets = None if regenerate_all else []
+    if args.milestone or args.phase is not None:
+        if regenerate_all:
+            print("ERROR: --milestone/--phase cannot be combined with --all or --watch", file=sys.stderr)
+            sys.exit(1)
+        if args.milestone:
+            selected = next((m for m in milestones if m["folder_name"] == args.milestone), None)
+            if selected is None:
+                available = ", ".join(m["folder_name"] for m in milestones)
+                print(f"ERROR: Milestone not found: {args.milestone} (available: {available})", file=sys.stderr)
+                sys.exit(1)
+        else:
+            selected = find_current_milestone(milestones)
+        targets = [selected]
+        if args.phase is not None:
+            phases_dir = detect_phases_dir(planning_dir, selected["path"], fs)
+            numbers = sorted({
+                phase_dir_identity(d)[0] for d in (fs.subdirs(phases_dir) if phases_dir else [])
+                if _PHASE_DIR_RE.match(d.name)
+            })
+            if args.phase not in numbers:
+                available = ", ".join(str(number) for number in numbers) or "none"
+                print(f"ERROR: Phase not found in {selected['folder_name']}: {args.phase} (available: {available})",
+                      file=sys.stderr)
+                sys.exit(1)
+
+    phase_numbers = {selected["folder_name"]: {args.phase}} if args.phase is not None else None
+    narrowed = None
+    if changes and targets != [] and args.phase is None:
+        with timed("discovery"):
+            narrowed = narrow_targets(planning_dir, milestones if targets is None else targets, changes, fs)
+        if narrowed is not None:
+            targets, phase_numbers = narrowed
+
+    cache = None
+    if targets != [] and not args.no_cache:
+        cache = ParseCache(planning_dir / CACHE_FILENAME).load()
+    pool = create_pool(args.jobs, cache) if targets != [] else None
+
+    try:
+        with timed("generate"):
+            outputs = generate_dashboards(
+                planning_dir, milestones, wxcode_version,
+                targets=targets,
+                cache=cache, pool=pool, force=args.force, fs=fs,
+                phase_numbers=phase_numbers, compact=args.compact
+            )
+        if tree is not None:
+            names = [path.name for path in outputs]
+            if narrowed is not None:
+                # Untouched milestone dashboards are still current
+                names += previous_run["outputs"]
+            save_planning_state(planning_dir, signature, tree, names)
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        if args.stats:
+            print_stats(fs)
+        if args.watch:
+            watch(planning_dir, wxcode_version, cache, pool, args)
+            return
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    print(f"\nDashboards generated successfully (WXCODE {wxcode_version})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+In-memory planning model for the wxcode_dashboard library.
+
+Kept in its own module so the command-line path never pays for dataclasses;
+import it directly or through wxcode_dashboard, which re-exports these names
+on first access.
+"""
+
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from wxcode_dashboard import (
+    CACHE_FILENAME,
+    TIMING_FILENAME,
+    DashboardHistory,
+    FsSnapshot,
+    ParseCache,
+    TimingHistory,
+    ensure_gitignore,
+    find_current_milestone,
+    find_milestones,
+    generate_milestone_dashboard,
+    generate_project_dashboard,
+    get_wxcode_version,
+    load_milestone_summaries,
+    milestone_dashboard_path,
+    milestone_summary,
+    reset_run_timestamp,
+    save_milestone_summaries,
+    snapshot_path,
+    timing_records,
+    write_dashboard,
+    write_snapshot,
+)
+
+
+# dataclass(slots=True) needs Python 3.10; older interpreters get regular dataclasses
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
+class Task:
+    id: str
+    name: str
+    file: Optional[str]
+    status: str
+    description: str
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Task":
+        return cls(data["id"], data["name"], data.get("file"), data["status"], data.get("description", ""))
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "file": self.file,
+            "status": self.status,
+            "description": self.description
+        }
+
+
+@dataclass(**_SLOTS)
+class Plan:
+    number: str
+    name: str
+    status: str
+    summary: Optional[str]
+    requirements: list = field(default_factory=list)
+    requirements_mentioned: list = field(default_factory=list)
+    subsystem: Optional[str] = None
+    tags: list = field(default_factory=list)
+    key_files: dict = field(default_factory=dict)
+    dependencies: dict = field(default_factory=dict)
+    timing: dict = field(default_factory=dict)
+    tasks: list = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Plan":
+        return cls(
+            data["number"], data["name"], data["status"], data.get("summary"),
+            list(data.get("requirements", [])), list(data.get("requirements_mentioned", [])),
+            data.get("subsystem"), list(data.get("tags", [])),
+            dict(data.get("key_files", {})), dict(data.get("dependencies", {})),
+            dict(data.get("timing", {})),
+            [Task.from_dict(t) for t in data.get("tasks", [])]
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "number": self.number,
+            "name": self.name,
+            "status": self.status,
+            "summary": self.summary,
+            "requirements": list(self.requirements),
+            "requirements_mentioned": list(self.requirements_mentioned),
+            "subsystem": self.subsystem,
+            "tags": list(self.tags),
+            "key_files": self.key_files,
+            "dependencies": self.dependencies,
+            "timing": self.timing,
+            "tasks": [t.to_dict() for t in self.tasks]
+        }
+
+
+@dataclass(**_SLOTS)
+class Phase:
+    number: int
+    name: str
+    goal: str
+    status: str
+    requirements_covered: list = field(default_factory=list)
+    plans: list = field(default_factory=list)
+    verified: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Phase":
+        return cls(
+            data["number"], data["name"], data.get("goal", ""), data["status"],
+            list(data.get("requirements_covered", [])),
+            [Plan.from_dict(p) for p in data.get("plans", [])],
+            data.get("verified", False)
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "number": self.number,
+            "name": self.name,
+            "goal": self.goal,
+            "status": self.status,
+            "requirements_covered": list(self.requirements_covered),
+            "plans": [p.to_dict() for p in self.plans],
+            "verified": self.verified
+        }
+
+
+@dataclass(**_SLOTS)
+class Milestone:
+    """One milestone dashboard. Sections without a typed model stay plain dicts."""
+    folder_name: str
+    path: Path
+    archived: bool
+    info: dict
+    workflow: dict
+    current_position: dict
+    progress: dict
+    phases: list
+    requirements: dict
+    requirements_coverage: dict
+    plan_graph: dict
+    velocity: dict
+    blockers: list
+    business_rules: Optional[dict]
+    meta: dict
+
+    @classmethod
+    def from_dashboard(cls, milestone: dict, dashboard: dict) -> "Milestone":
+        """Build from a find_milestones() entry and its generated dashboard."""
+        return cls(
+            milestone["folder_name"], milestone["path"], milestone["archived"],
+            dashboard["milestone"], dashboard["workflow"], dashboard["current_position"],
+            dashboard["progress"], [Phase.from_dict(p) for p in dashboard["phases"]],
+            dashboard["requirements"], dashboard["requirements_coverage"], dashboard["plan_graph"],
+            dashboard["velocity"], dashboard["blockers"], dashboard["business_rules"],
+            dashboard["meta"]
+        )
+
+    def to_dashboard(self) -> dict:
+        """The dashboard_<milestone>.json content, identical to the CLI output."""
+        return {
+            "milestone": self.info,
+            "workflow": self.workflow,
+            "current_position": self.current_position,
+            "progress": self.progress,
+            "phases": [p.to_dict() for p in self.phases],
+            "requirements": self.requirements,
+            "requirements_coverage": self.requirements_coverage,
+            "plan_graph": self.plan_graph,
+            "velocity": self.velocity,
+            "blockers": self.blockers,
+            "business_rules": self.business_rules,
+            "meta": self.meta
+        }
+
+    def source(self) -> dict:
+        """The find_milestones() entry this milestone was built from."""
+        return {"folder_name": self.folder_name, "path": self.path, "archived": self.archived}
+
+    def phase(self, number: int) -> Optional[Phase]:
+        return next((p for p in self.phases if p.number == number), None)
+
+
+@dataclass(**_SLOTS)
+class Project:
+    """In-memory model of a .planning/ tree, see load_project()."""
+    planning_dir: Path
+    wxcode_version: str
+    milestones: list
+    dashboard: dict
+    cache: Optional[ParseCache] = None
+    # milestone_summary() records behind the project aggregates, by folder name
+    summaries: dict = field(default_factory=dict)
+    # Recorded plan timings, loaded on the first refresh
+    timing: Optional[TimingHistory] = None
+
+    @property
+    def current_milestone(self) -> Optional[Milestone]:
+        """The first non-archived milestone, else the first one (as in dashboard.json)."""
+        return next((m for m in self.milestones if not m.archived), self.milestones[0] if self.milestones else None)
+
+    def milestone(self, folder_name: str) -> Optional[Milestone]:
+        return next((m for m in self.milestones if m.folder_name == folder_name), None)
+
+
+def load_project(
+    project_dir,
+    wxcode_version: Optional[str] = None,
+    use_cache: bool = True
+) -> Project:
+    """Parse a project's .planning/ tree into a Project without writing any dashboard.
+
+    Raises FileNotFoundError when there is no .planning directory.
+    """
+    planning_dir = Path(project_dir).resolve() / ".planning"
+    if not planning_dir.is_dir():
+        raise FileNotFoundError(f"No .planning directory found in {planning_dir.parent}")
+
+    cache = ParseCache(planning_dir / CACHE_FILENAME).load() if use_cache else None
+    project = Project(planning_dir, get_wxcode_version(wxcode_version), [], {}, cache)
+    refresh_project(project)
+    return project
+
+
+def refresh_project(project: Project, milestone: Optional[str] = None, phase: Optional[int] = None) -> list:
+    """Re-read planning files into the model and return the refreshed milestones.
+
+    Without arguments every milestone is rebuilt and milestone folders are
+    rediscovered. milestone limits the rebuild to one folder; phase re-parses
+    only that phase of it (default: the current milestone), taking the other
+    phases from the model, like --milestone/--phase.
+    """
+    reset_run_timestamp()
+    fs = FsSnapshot()
+    planning_dir = project.planning_dir
+    sources = find_milestones(planning_dir, fs)
+
+    if milestone is None and phase is None:
+        targets = sources
+    else:
+        if milestone is None:
+            current = find_current_milestone(sources)
+            milestone = current["folder_name"] if current else None
+        targets = [m for m in sources if m["folder_name"] == milestone]
+        if not targets:
+            raise ValueError(f"Milestone not found: {milestone}")
+
+    if project.timing is None:
+        project.timing = TimingHistory(planning_dir / TIMING_FILENAME).load()
+    refreshed = []
+    for source in targets:
+        previous = None
+        existing = project.milestone(source["folder_name"])
+        if phase is not None and existing is not None:
+            previous = existing.to_dashboard()
+        dashboard = generate_milestone_dashboard(
+            source["path"],
+            source["folder_name"],
+            project.wxcode_version,
+            root_planning_dir=planning_dir,
+            is_archived=source["archived"],
+            cache=project.cache,
+            fs=fs,
+            phase_numbers=None if phase is None else {phase},
+            previous=previous,
+            history=project.timing.records(source["folder_name"])
+        )
+        refreshed.append(Milestone.from_dashboard(source, dashboard))
+
+    # Keep discovery order; milestones that disappeared are dropped
+    by_name = {m.folder_name: m for m in project.milestones}
+    by_name.update((m.folder_name, m) for m in refreshed)
+    project.milestones = [by_name[m["folder_name"]] for m in sources if m["folder_name"] in by_name]
+    summaries = project.summaries or load_milestone_summaries(planning_dir)
+    summaries = {name: record for name, record in summaries.items() if name in by_name}
+    refreshed_names = {m.folder_name for m in refreshed}
+    for m in project.milestones:
+        if m.folder_name in refreshed_names or m.folder_name not in summaries:
+            summaries[m.folder_name] = milestone_summary(planning_dir, m.source(), m.to_dashboard(), fs)
+    project.summaries = summaries
+    project.dashboard = generate_project_dashboard(
+        planning_dir, sources, project.wxcode_version, fs, summaries
+    )
+    if project.cache is not None:
+        project.cache.save()
+    return refreshed
+
+
+def save_project(project: Project, force: bool = False, compact: bool = False) -> list:
+    """Write the project and milestone dashboards of the model; returns the paths written.
+
+    compact also writes the .wxds snapshots (see write_snapshot). Plan timings
+    and status changes are appended to the timing and history logs as by the CLI.
+    """
+    written = []
+    ensure_gitignore(project.planning_dir)
+    names = {m.folder_name for m in project.milestones}
+    if project.timing is not None:
+        project.timing.retain(names)
+    changes = DashboardHistory(project.planning_dir).load()
+    changes.retain(names)
+    if project.summaries and project.summaries != load_milestone_summaries(project.planning_dir):
+        save_milestone_summaries(project.planning_dir, project.summaries)
+    project_dashboard_path = project.planning_dir / "dashboard.json"
+    if write_dashboard(project_dashboard_path, project.dashboard, force=force):
+        written.append(project_dashboard_path)
+    for milestone in project.milestones:
+        path = milestone_dashboard_path(project.planning_dir, milestone.source())
+        dashboard = milestone.to_dashboard()
+        changed = write_dashboard(path, dashboard, force=force)
+        if changed:
+            written.append(path)
+        if project.timing is not None:
+            project.timing.update(milestone.folder_name, timing_records(dashboard))
+        changes.record(milestone.folder_name, dashboard)
+        if compact and write_snapshot(path, dashboard, changed):
+            written.append(snapshot_path(path))
+    changes.save()
+    return written
@@ -0,0 +1,1739 @@
+"""
+Schema dashboard generator for the wxcode_dashboard library.
+
+Statically extracts tables, columns, enums, relationships and coverage from a
+project's ORM model files into .planning/schema-dashboard.json, in the format
+of docs/SCHEMA-DASHBOARD-SPEC.md, plus the .planning/SCHEMA-STATUS.md summary:
+
+    python generate-dashboard.py --schema [--legacy-tables FILE] [--project-dir PATH]
+
+Supported ORMs are SQLAlchemy (declarative classes and Table() objects, read
+with ast) and Prisma (schema.prisma, read line by line); nothing is imported
+or executed, so the output depends only on the model files. Parsed files are
+kept in .planning/.schema-cache.json keyed by path, mtime and size, so only
+changed model files are re-parsed.
+
+Coverage compares the models with the legacy table names given by
+--legacy-tables (a JSON list or object from MCP get_schema, or one name per
+line); without it the legacy tables recorded by the previous schema dashboard
+are reused. Tables keep a "validated" or "error" status set by validation for
+as long as their extracted definition is unchanged.
+"""
+
+import ast
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Optional
+
+from wxcode_dashboard import (
+    ParseCache,
+    atomic_write_text,
+    cached_parse,
+    count,
+    parse_project_md,
+    read_file,
+    run_timestamp,
+    timed,
+    write_dashboard,
+)
+
+SCHEMA_SPEC_URL = "https://wxcode.dev/schemas/dashboard-v1.json"
+SCHEMA_SPEC_VERSION = "1.0.0"
+SCHEMA_DASHBOARD_FILENAME = "schema-dashboard.json"
+SCHEMA_STATUS_FILENAME = "SCHEMA-STATUS.md"
+SCHEMA_CACHE_FILENAME = ".schema-cache.json"
+# Bump whenever the output of parse_sqlalchemy_file / parse_prisma_file or the cache key format changes
+SCHEMA_CACHE_VERSION = 2
+
+# Stack IDs (spec section 4.1) -> ORM and default models location
+STACK_ORMS = {
+    "fastapi-sqlalchemy": ("SQLAlchemy", "app/models/"),
+    "fastapi-react": ("SQLAlchemy", "backend/app/models/"),
+    "django-templates": ("Django ORM", "*/models.py"),
+    "nextjs-app-router": ("Prisma", "prisma/schema.prisma"),
+    "nextjs-pages": ("Prisma", "prisma/schema.prisma"),
+    "nuxt3": ("Prisma", "prisma/schema.prisma"),
+    "nestjs-react": ("TypeORM", "src/entities/"),
+    "nestjs-vue": ("TypeORM", "src/entities/"),
+    "sveltekit": ("Prisma", "prisma/schema.prisma"),
+    "remix": ("Prisma", "prisma/schema.prisma"),
+    "laravel-blade": ("Eloquent", "app/Models/"),
+    "laravel-react": ("Eloquent", "app/Models/"),
+    "rails-erb": ("ActiveRecord", "app/models/"),
+}
+SUPPORTED_ORMS = ("SQLAlchemy", "Prisma")
+SQLALCHEMY_LOCATIONS = ("app/models/", "backend/app/models/", "src/models/", "models/")
+PRISMA_LOCATIONS = ("prisma/schema.prisma", "prisma/schema/", "schema.prisma")
+# Directories never searched for SQLAlchemy models when no models location is known
+SCAN_SKIP_DIRS = {"node_modules", "venv", "__pycache__", "site-packages", "dist", "build", "migrations", "alembic"}
+
+_CONVERSION_FIELD_RE = re.compile(r'^\|\s*\*\*([^*|]+)\*\*\s*\|\s*`?([^`|\n]*?)`?\s*\|', re.MULTILINE)
+_GENERATED_LINE_RE = re.compile(r'^\*\*Generated:\*\*.*$', re.MULTILINE)
+
+
+def parse_conversion_fields(conversion_path: Path) -> dict:
+    """Property table rows of CONVERSION.md ("**Stack ID** | `x`"), unfilled placeholders skipped."""
+    if not conversion_path.exists():
+        return {}
+    fields = {}
+    for label, value in _CONVERSION_FIELD_RE.findall(read_file(conversion_path)):
+        value = value.strip()
+        if value and not value.startswith("{"):
+            fields.setdefault(label.strip().lower(), value)
+    return fields
+
+
+_BASE_TYPE_NAMES = {
+    "integer": ("integer", "biginteger", "smallinteger", "int", "bigint", "smallint", "tinyint", "mediumint"),
+    "string": ("string", "varchar", "nvarchar", "char", "nchar", "unicode", "citext"),
+    "text": ("text", "unicodetext", "clob", "longtext", "mediumtext", "tinytext", "ntext"),
+    "decimal": ("numeric", "decimal", "money"),
+    "float": ("float", "double", "double_precision", "real"),
+    "boolean": ("boolean", "bit"),
+    "date": ("date",),
+    "time": ("time",),
+    "datetime": ("datetime", "timestamp", "datetime2", "smalldatetime"),
+    "binary": ("largebinary", "blob", "bytea", "varbinary", "binary", "longblob", "mediumblob", "image"),
+    "uuid": ("uuid", "uniqueidentifier", "uuidtype"),
+    "json": ("json", "jsonb"),
+    "array": ("array",),
+    "enum": ("enum",),
+}
+SQL_BASE_TYPES = {name: base for base, names in _BASE_TYPE_NAMES.items() for name in names}
+
+# Python annotations of SQLAlchemy 2.0 Mapped[...] columns -> SQLAlchemy type
+PYTHON_SQLALCHEMY_TYPES = {
+    "int": "Integer", "str": "String", "float": "Float", "bool": "Boolean",
+    "Decimal": "Numeric", "datetime": "DateTime", "date": "Date", "time": "Time",
+    "bytes": "LargeBinary", "UUID": "Uuid", "dict": "JSON",
+}
+
+PRISMA_BASE_TYPES = {
+    "Int": "integer", "BigInt": "integer", "String": "string", "Decimal": "decimal", "Float": "float",
+    "Boolean": "boolean", "DateTime": "datetime", "Bytes": "binary", "Json": "json",
+}
+# Prisma native type attributes (@db.X) that refine the base type
+PRISMA_NATIVE_BASE_TYPES = {
+    "Text": "text", "MediumText": "text", "LongText": "text", "TinyText": "text", "NText": "text",
+    "Uuid": "uuid", "UniqueIdentifier": "uuid", "Date": "date", "Time": "time", "Timetz": "time",
+    "Money": "decimal", "Bit": "boolean", "Real": "float", "DoublePrecision": "float",
+}
+
+REFERENTIAL_ACTIONS = {
+    "cascade": "CASCADE", "restrict": "RESTRICT", "setnull": "SET NULL",
+    "setdefault": "SET DEFAULT", "noaction": "NO ACTION",
+}
+
+
+def base_type(name: str) -> str:
+    """Normalized base type of an SQL/SQLAlchemy type name; unknown types count as string."""
+    return SQL_BASE_TYPES.get(name.lower(), "string")
+
+
+def referential_action(value: Optional[str], default: str = "NO ACTION") -> str:
+    if not value:
+        return default
+    return REFERENTIAL_ACTIONS.get(re.sub(r'[\s_]', "", value).lower(), value.upper())
+
+
+def type_info(base: str, raw: str, orm_specific: str, size=None, precision=None, scale=None) -> dict:
+    return {
+        "base": base,
+        "raw": raw,
+        "orm_specific": orm_specific,
+        "size": size,
+        "precision": precision,
+        "scale": scale
+    }
+
+
+def column_entry(name: str, legacy_name: str, column_type: Optional[dict]) -> dict:
+    """A column with every field of spec section 8.2 at its default."""
+    return {
+        "name": name,
+        "legacy_name": legacy_name,
+        "type": column_type,
+        "nullable": True,
+        "primary_key": False,
+        "auto_increment": False,
+        "unique": False,
+        "default": None,
+        "server_default": None,
+        "comment": None,
+        "computed": None,
+        "foreign_key": None
+    }
+
+
+def table_entry(name: str, legacy_name: str, model_file: str, description: Optional[str] = None) -> dict:
+    """A table with every field of spec section 8.1 empty."""
+    return {
+        "name": name,
+        "legacy_name": legacy_name,
+        "model_file": model_file,
+        "status": "generated",
+        "description": description,
+        "columns": [],
+        "primary_key": {"name": None, "columns": [], "auto_generated_name": True},
+        "foreign_keys": [],
+        "indexes": [],
+        "unique_constraints": [],
+        "check_constraints": [],
+        "relationships": [],
+        "triggers": [],
+        "table_options": {
+            "schema": None,
+            "tablespace": None,
+            "comment": None,
+            "inherits": None,
+            "partition_by": None,
+            "managed": True
+        }
+    }
+
+
+def foreign_key_entry(
+    name: Optional[str],
+    columns: list,
+    references_table: str,
+    references_columns: list,
+    on_delete: str = "NO ACTION",
+    on_update: str = "NO ACTION",
+    deferrable: bool = False,
+    initially_deferred: bool = False
+) -> dict:
+    return {
+        "name": name,
+        "columns": columns,
+        "references_table": references_table,
+        "references_columns": references_columns,
+        "on_delete": on_delete,
+        "on_update": on_update,
+        "deferrable": deferrable,
+        "initially_deferred": initially_deferred
+    }
+
+
+def index_entry(name: Optional[str], columns: list, unique: bool = False, using: Optional[str] = None,
+                where: Optional[str] = None, include: Optional[list] = None) -> dict:
+    return {
+        "name": name,
+        "columns": columns,
+        "unique": unique,
+        "type": using,
+        "where": where,
+        "include": include,
+        "using": using
+    }
+
+
+_COLUMN_CALLS = ("Column", "mapped_column")
+_RELATIONSHIP_CALLS = ("relationship", "relation")
+
+
+def _call_name(node) -> Optional[str]:
+    """Last dotted name of a call's function (sa.Column(...) -> "Column")."""
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return None
+
+
+def _literal(node, default=None):
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return default
+
+
+def _keywords(call: ast.Call) -> dict:
+    return {kw.arg: kw.value for kw in call.keywords if kw.arg}
+
+
+class _Source:
+    """Source text of ast nodes, whitespace-collapsed."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __call__(self, node) -> str:
+        segment = ast.get_source_segment(self.text, node) or ""
+        return re.sub(r'\s*\n\s*', " ", segment)
+
+
+def _string_or_source(node, source: _Source) -> Optional[str]:
+    """Literal string value, text("...") argument, or the expression as written."""
+    if node is None:
+        return None
+    value = _literal(node)
+    if isinstance(value, str):
+        return value
+    if isinstance(node, ast.Call) and _call_name(node) in ("text", "literal_column") and node.args:
+        value = _literal(node.args[0])
+        if isinstance(value, str):
+            return value
+    return re.sub(r'^(?:\w+\.)*func\.', "", source(node))
+
+
+def _column_ref(node, source: _Source) -> Optional[str]:
+    """Column named in a constraint: "COL", Model.COL, table.c.COL."""
+    value = _literal(node)
+    if isinstance(value, str):
+        return value
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return source(node) or None
+
+
+def _annotation_type(node) -> tuple:
+    """(inner annotation, optional, is_list) of Mapped[...] / Optional[...] / List[...]."""
+    optional = is_list = False
+    while True:
+        if isinstance(node, ast.Subscript):
+            outer = _call_name(node.value)
+            inner = node.slice
+            if outer == "Mapped":
+                node = inner
+                continue
+            if outer == "Optional":
+                optional = True
+                node = inner
+                continue
+            if outer in ("List", "list", "Set", "set", "Sequence"):
+                is_list = True
+                node = inner
+                continue
+            if outer == "Union" and isinstance(inner, ast.Tuple):
+                members = [e for e in inner.elts if not (isinstance(e, ast.Constant) and e.value is None)]
+                optional = optional or len(members) < len(inner.elts)
+                node = members[0] if members else inner
+                continue
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+            left, right = node.left, node.right
+            if isinstance(right, ast.Constant) and right.value is None:
+                optional, node = True, left
+                continue
+            if isinstance(left, ast.Constant) and left.value is None:
+                optional, node = True, right
+                continue
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            # Forward reference: parse "Optional['X']" style strings too
+            try:
+                parsed = ast.parse(node.value, mode="eval").body
+            except SyntaxError:
+                return node.value, optional, is_list
+            if isinstance(parsed, ast.Name):
+                return parsed.id, optional, is_list
+            node = parsed
+            continue
+        return node, optional, is_list
+
+
+def _sqlalchemy_type(node, source: _Source, orm_specific: str) -> dict:
+    """Type object of a type expression: Integer, String(100), sa.Numeric(19, 4), ARRAY(Integer)."""
+    name = _call_name(node) or source(node)
+    size = precision = scale = None
+    if isinstance(node, ast.Call):
+        args = [_literal(arg) for arg in node.args]
+        kwargs = {key: _literal(value) for key, value in _keywords(node).items()}
+        base = base_type(name)
+        if base in ("string", "text", "binary"):
+            size = kwargs.get("length", args[0] if args and isinstance(args[0], int) else None)
+        elif base == "decimal":
+            precision = kwargs.get("precision", args[0] if args and isinstance(args[0], int) else None)
+            scale = kwargs.get("scale", args[1] if len(args) > 1 and isinstance(args[1], int) else None)
+    return type_info(base_type(name), source(node), orm_specific, size, precision, scale)
+
+
+def _enum_type_ref(node) -> tuple:
+    """(enum class name, database enum name) of an Enum(StatusPedido, name="...") type."""
+    if isinstance(node, ast.Call) and _call_name(node) == "Enum":
+        enum_class = _call_name(node.args[0]) if node.args else None
+        name = _literal(_keywords(node).get("name"))
+        return enum_class, name if isinstance(name, str) else None
+    return None, None
+
+
+def _parse_column_call(call: ast.Call, attr: str, annotation, source: _Source, orm_specific: str) -> dict:
+    """Column(...) / mapped_column(...) -> column entry with parse-time extras.
+
+    Extras (removed when resolving): _fk (the ForeignKey call details),
+    _sequence, _index, _enum, _pk_explicit, _autoincrement ("auto" unless given).
+    """
+    kwargs = _keywords(call)
+    legacy_name = None
+    type_node = None
+    column = column_entry(attr, attr, None)
+    column["_autoincrement"] = "auto"
+
+    for arg in call.args:
+        value = _literal(arg)
+        kind = _call_name(arg)
+        if isinstance(value, str) and legacy_name is None and type_node is None:
+            legacy_name = value
+        elif kind == "ForeignKey":
+            fk_kwargs = _keywords(arg)
+            column["_fk"] = {
+                "target": _column_ref(arg.args[0], source) if arg.args else None,
+                "name": _literal(fk_kwargs.get("name")),
+                "on_delete": _literal(fk_kwargs.get("ondelete")),
+                "on_update": _literal(fk_kwargs.get("onupdate")),
+                "deferrable": bool(_literal(fk_kwargs.get("deferrable"), False)),
+                "initially": _literal(fk_kwargs.get("initially")),
+            }
+        elif kind == "Sequence":
+            seq_kwargs = {key: _literal(value) for key, value in _keywords(arg).items()}
+            column["_sequence"] = {
+                "name": _literal(arg.args[0]) if arg.args else None,
+                "start": seq_kwargs.get("start", 1),
+                "increment": seq_kwargs.get("increment", 1),
+                "min_value": seq_kwargs.get("minvalue"),
+                "max_value": seq_kwargs.get("maxvalue"),
+                "cycle": bool(seq_kwargs.get("cycle", False)),
+            }
+        elif kind == "Identity":
+            column["_autoincrement"] = True
+        elif kind == "Computed":
+            computed_kwargs = _keywords(arg)
+            column["computed"] = {
+                "expression": _string_or_source(arg.args[0], source) if arg.args else None,
+                "stored": bool(_literal(computed_kwargs.get("persisted"), True)),
+                "type": None,
+            }
+        elif type_node is None:
+            type_node = arg
+
+    name_kw = _literal(kwargs.get("name"))
+    if isinstance(name_kw, str):
+        legacy_name = name_kw
+    if "type_" in kwargs and type_node is None:
+        type_node = kwargs["type_"]
+    column["legacy_name"] = legacy_name or attr
+
+    optional = None
+    if annotation is not None:
+        inner, optional, _ = _annotation_type(annotation)
+    if type_node is not None:
+        column["type"] = _sqlalchemy_type(type_node, source, orm_specific)
+        column["_enum"] = _enum_type_ref(type_node)
+    elif annotation is not None:
+        python_name = _call_name(inner) or (inner if isinstance(inner, str) else source(inner))
+        sqlalchemy_name = PYTHON_SQLALCHEMY_TYPES.get(python_name)
+        if sqlalchemy_name:
+            column["type"] = type_info(base_type(sqlalchemy_name), python_name, orm_specific)
+        elif python_name:
+            # Any other class in Mapped[...] is an enum (the default type map only adds Enum)
+            column["type"] = type_info("enum", python_name, orm_specific)
+            column["_enum"] = (python_name, None)
+    if column["type"] is None:
+        # Typed from the referenced column when resolving
+        column["type"] = type_info("string", "", orm_specific)
+        column["_type_from_fk"] = True
+    if column["computed"] is not None:
+        column["computed"]["type"] = {"base": column["type"]["base"]}
+
+    primary_key = bool(_literal(kwargs.get("primary_key"), False))
+    column["primary_key"] = primary_key
+    nullable = _literal(kwargs.get("nullable"))
+    if isinstance(nullable, bool):
+        column["nullable"] = nullable
+    elif primary_key:
+        column["nullable"] = False
+    elif optional is not None:
+        column["nullable"] = optional
+    autoincrement = _literal(kwargs.get("autoincrement"))
+    if isinstance(autoincrement, bool):
+        column["_autoincrement"] = autoincrement
+    column["unique"] = bool(_literal(kwargs.get("unique"), False))
+    column["_index"] = bool(_literal(kwargs.get("index"), False))
+    if "default" in kwargs:
+        default = kwargs["default"]
+        column["default"] = _literal(default, source(default))
+    server_default = kwargs.get("server_default")
+    if server_default is not None:
+        column["server_default"] = _string_or_source(server_default, source)
+    comment = _literal(kwargs.get("comment"))
+    if isinstance(comment, str):
+        column["comment"] = comment
+    return column
+
+
+def _parse_relationship_call(call: ast.Call, attr: str, annotation, source: _Source) -> dict:
+    """relationship(...) -> relationship entry with parse-time hints (resolved later)."""
+    kwargs = _keywords(call)
+    target = None
+    if call.args:
+        target = _literal(call.args[0])
+        if not isinstance(target, str):
+            target = _call_name(call.args[0])
+    uselist = _literal(kwargs.get("uselist"))
+    if annotation is not None:
+        inner, _, is_list = _annotation_type(annotation)
+        if target is None:
+            target = inner if isinstance(inner, str) else _call_name(inner)
+        if not isinstance(uselist, bool):
+            uselist = is_list
+    if isinstance(target, str):
+        target = target.rsplit(".", 1)[-1]
+
+    backref = kwargs.get("backref")
+    backref_name = _literal(backref)
+    if isinstance(backref, ast.Call) and backref.args:
+        backref_name = _literal(backref.args[0])
+    secondary = kwargs.get("secondary")
+    foreign_keys = kwargs.get("foreign_keys")
+    if foreign_keys is not None:
+        nodes = foreign_keys.elts if isinstance(foreign_keys, (ast.List, ast.Tuple)) else [foreign_keys]
+        foreign_keys = []
+        for node in nodes:
+            ref = _column_ref(node, source) or ""
+            foreign_keys += [part.rsplit(".", 1)[-1] for part in re.split(r'[\[\],\s]+', ref) if part]
+
+    lazy = _literal(kwargs.get("lazy"))
+    cascade = _literal(kwargs.get("cascade"))
+    return {
+        "name": attr,
+        "type": None,
+        "target_table": None,
+        "target_model": target,
+        "local_columns": [],
+        "remote_columns": [],
+        "back_populates": _literal(kwargs.get("back_populates")) or (backref_name if isinstance(backref_name, str) else None),
+        "lazy": lazy if isinstance(lazy, str) else "select",
+        "cascade": cascade if isinstance(cascade, str) else None,
+        "_uselist": uselist if isinstance(uselist, bool) else None,
+        "_secondary": _column_ref(secondary, source) if secondary is not None else None,
+        "_foreign_keys": foreign_keys,
+        "_remote_side": "remote_side" in kwargs,
+        "_backref": backref_name if isinstance(backref_name, str) else None,
+    }
+
+
+def _apply_table_args(table: dict, node, source: _Source, deferred: list):
+    """__table_args__ / Table() constraint arguments: constraints, indexes, options."""
+    items = node.elts if isinstance(node, (ast.Tuple, ast.List)) else [node]
+    for item in items:
+        if isinstance(item, ast.Dict):
+            options = {_literal(key): _literal(value, source(value)) for key, value in zip(item.keys, item.values)}
+            table_options = table["table_options"]
+            table_options["schema"] = options.get("schema", table_options["schema"])
+            table_options["comment"] = options.get("comment", table_options["comment"])
+            table_options["tablespace"] = options.get("postgresql_tablespace", table_options["tablespace"])
+            table_options["partition_by"] = options.get("postgresql_partition_by", table_options["partition_by"])
+            if table_options["comment"] and not table["description"]:
+                table["description"] = table_options["comment"]
+        elif isinstance(item, ast.Call):
+            deferred.append(_constraint(item, source))
+
+
+def _constraint(call: ast.Call, source: _Source) -> dict:
+    """Index / UniqueConstraint / CheckConstraint / ForeignKeyConstraint / PrimaryKeyConstraint."""
+    kind = _call_name(call)
+    kwargs = _keywords(call)
+    name = _literal(kwargs.get("name"))
+    args = list(call.args)
+    if kind == "Index":
+        if args and isinstance(_literal(args[0]), str):
+            name = _literal(args.pop(0))
+        using = next((_literal(v) for k, v in kwargs.items() if k.endswith("_using")), None)
+        where = next((_string_or_source(v, source) for k, v in kwargs.items() if k.endswith("_where")), None)
+        include = next((_literal(v, []) for k, v in kwargs.items() if k.endswith("_include")), None)
+        return {"kind": kind, "entry": index_entry(
+            name, [_column_ref(arg, source) for arg in args],
+            unique=bool(_literal(kwargs.get("unique"), False)), using=using, where=where, include=include
+        ), "model": _call_name(args[0].value) if args and isinstance(args[0], ast.Attribute) else None}
+    if kind == "CheckConstraint":
+        return {"kind": kind, "entry": {
+            "name": name,
+            "expression": _string_or_source(args[0], source) if args else None,
+            "columns": [],
+        }}
+    if kind == "ForeignKeyConstraint":
+        columns = _literal(args[0], []) if args else []
+        targets = _literal(args[1], []) if len(args) > 1 else []
+        initially = _literal(kwargs.get("initially"))
+        return {"kind": kind, "targets": targets, "entry": foreign_key_entry(
+            name, list(columns), "", [],
+            on_delete=referential_action(_literal(kwargs.get("ondelete"))),
+            on_update=referential_action(_literal(kwargs.get("onupdate"))),
+            deferrable=bool(_literal(kwargs.get("deferrable"), False)),
+            initially_deferred=isinstance(initially, str) and initially.upper() == "DEFERRED"
+        )}
+    return {"kind": kind, "entry": {"name": name, "columns": [_column_ref(arg, source) for arg in args]}}
+
+
+def parse_sqlalchemy_file(path: Path) -> dict:
+    """Tables, association tables, mixins and enums defined in one SQLAlchemy module.
+
+    Relationships and foreign keys are left unresolved (see resolve_sqlalchemy),
+    so the result only depends on this file and can be cached per file.
+    """
+    text = read_file(path)
+    result = {"tables": [], "mixins": [], "enums": [], "indexes": [], "dialects": [], "error": None}
+    try:
+        tree = ast.parse(text, filename=str(path))
+    except SyntaxError as e:
+        result["error"] = f"line {e.lineno}: {e.msg}"
+        return result
+    source = _Source(text)
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module and node.module.startswith("sqlalchemy.dialects."):
+            result["dialects"].append(node.module.split(".")[2])
+
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            parsed = _parse_sqlalchemy_class(node, source)
+            if parsed is not None:
+                result[parsed.pop("kind")].append(parsed)
+        elif isinstance(node, ast.Assign) and isinstance(node.value, ast.Call):
+            if _call_name(node.value) == "Table" and len(node.targets) == 1:
+                table = _parse_table_call(node.value, node.targets[0], source)
+                if table is not None:
+                    result["tables"].append(table)
+        elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call) and _call_name(node.value) == "Index":
+            result["indexes"].append(_constraint(node.value, source))
+    return result
+
+
+def _parse_table_call(call: ast.Call, target, source: _Source) -> Optional[dict]:
+    """name = Table("NAME", metadata, Column(...), ...) -> table entry (association tables)."""
+    legacy_name = _literal(call.args[0]) if call.args else None
+    if not isinstance(legacy_name, str):
+        return None
+    variable = _call_name(target) or legacy_name
+    table = table_entry(variable, legacy_name, "")
+    table["_variable"] = variable
+    table["_bases"] = []
+    table["_constraints"] = []
+    for arg in call.args[2:]:
+        if isinstance(arg, ast.Call) and _call_name(arg) in _COLUMN_CALLS:
+            column = _parse_column_call(arg, "", None, source, source(arg))
+            column["name"] = column["legacy_name"]
+            table["columns"].append(column)
+        elif isinstance(arg, ast.Call):
+            table["_constraints"].append(_constraint(arg, source))
+    options = ast.Dict(keys=[], values=[])
+    for kw in call.keywords:
+        if kw.arg:
+            options.keys.append(ast.Constant(kw.arg))
+            options.values.append(kw.value)
+    _apply_table_args(table, options, source, table["_constraints"])
+    return table
+
+
+def _parse_sqlalchemy_class(node: ast.ClassDef, source: _Source) -> Optional[dict]:
+    bases = [_call_name(base) for base in node.bases]
+    docstring = ast.get_docstring(node)
+    description = docstring.strip().split("\n")[0] if docstring else None
+
+    if any(base and base.endswith("Enum") for base in bases):
+        values = []
+        for stmt in node.body:
+            if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+                value = _literal(stmt.value)
+                if value is not None and not stmt.targets[0].id.startswith("_"):
+                    values.append({"name": stmt.targets[0].id, "value": str(value), "label": None})
+        return {"kind": "enums", "name": node.name, "values": values}
+
+    tablename = None
+    table = table_entry(node.name, node.name, "", description)
+    table["_bases"] = [base for base in bases if base]
+    table["_constraints"] = []
+    relationships = []
+    for stmt in node.body:
+        target = annotation = value = None
+        if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1:
+            target, value = stmt.targets[0], stmt.value
+        elif isinstance(stmt, ast.AnnAssign):
+            target, annotation, value = stmt.target, stmt.annotation, stmt.value
+        if not isinstance(target, ast.Name):
+            continue
+        attr = target.id
+        if attr == "__tablename__":
+            tablename = _literal(value)
+        elif attr == "__table_args__" and value is not None:
+            _apply_table_args(table, value, source, table["_constraints"])
+        elif isinstance(value, ast.Call) and _call_name(value) in _COLUMN_CALLS:
+            table["columns"].append(_parse_column_call(value, attr, annotation, source, source(stmt)))
+        elif isinstance(value, ast.Call) and _call_name(value) in _RELATIONSHIP_CALLS:
+            relationships.append(_parse_relationship_call(value, attr, annotation, source))
+        elif value is None and annotation is not None and _call_name(
+            annotation.value if isinstance(annotation, ast.Subscript) else annotation
+        ) == "Mapped":
+            inner, _, is_list = _annotation_type(annotation)
+            python_name = inner if isinstance(inner, str) else _call_name(inner)
+            if is_list or python_name not in PYTHON_SQLALCHEMY_TYPES:
+                continue
+            column = _parse_column_call(ast.Call(ast.Name("mapped_column"), [], []), attr, annotation, source,
+                                        source(stmt))
+            table["columns"].append(column)
+    table["relationships"] = relationships
+
+    if isinstance(tablename, str):
+        table["legacy_name"] = tablename
+        return {"kind": "tables", **table}
+    if table["columns"] or relationships or table["_constraints"]:
+        # Mixin / abstract base: its columns are copied into the tables deriving from it
+        return {"kind": "mixins", **table}
+    return None
+
+
+_PRISMA_BLOCK_RE = re.compile(r'^\s*(model|enum|view|datasource|generator|type)\s+(\w+)\s*\{')
+_PRISMA_FIELD_RE = re.compile(r'^\s*(\w+)\s+([\w.]+(?:\([^)]*\))?)(\[\])?(\?)?\s*(.*)$')
+
+
+def _strip_prisma_comment(line: str) -> tuple:
+    """(code, doc comment) of a schema line; // comments outside strings are dropped."""
+    in_string = False
+    for i, char in enumerate(line):
+        if char == '"' and (i == 0 or line[i - 1] != "\\"):
+            in_string = not in_string
+        elif not in_string and line.startswith("//", i):
+            comment = line[i:]
+            doc = comment[3:].strip() if comment.startswith("///") else None
+            return line[:i].rstrip(), doc
+    return line.rstrip(), None
+
+
+def _balanced(text: str, start: int) -> int:
+    """Index just past the parenthesis group opening at text[start], quotes respected."""
+    depth = 0
+    in_string = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if char == '"' and text[i - 1] != "\\":
+            in_string = not in_string
+        elif not in_string and char in "([":
+            depth += 1
+        elif not in_string and char in ")]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return len(text)
+
+
+def prisma_attributes(text: str) -> list:
+    """[(name, argument text or None)] of the @x(...) / @@x(...) attributes in text."""
+    attributes = []
+    i = 0
+    while True:
+        i = text.find("@", i)
+        if i < 0:
+            return attributes
+        match = re.match(r'@@?[\w.]+', text[i:])
+        if not match:
+            i += 1
+            continue
+        name = match.group(0)
+        end = i + len(name)
+        args = None
+        if end < len(text) and text[end] == "(":
+            close = _balanced(text, end)
+            args = text[end + 1:close - 1]
+            end = close
+        attributes.append((name, args))
+        i = end
+
+
+def _split_top_level(text: str) -> list:
+    parts = []
+    depth = 0
+    in_string = False
+    current = ""
+    for i, char in enumerate(text):
+        if char == '"' and (i == 0 or text[i - 1] != "\\"):
+            in_string = not in_string
+        elif not in_string and char in "([":
+            depth += 1
+        elif not in_string and char in ")]":
+            depth -= 1
+        elif not in_string and depth == 0 and char == ",":
+            parts.append(current.strip())
+            current = ""
+            continue
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def _prisma_value(text: str):
+    """Argument value: "string", [a, b(sort: Desc)] -> ["a", "b"], 42, true, identifiers as written."""
+    text = text.strip()
+    if text.startswith('"') and text.endswith('"'):
+        return text[1:-1].replace('\\"', '"')
+    if text.startswith("["):
+        return [re.match(r'[\w."]*', item).group(0).strip('"') for item in _split_top_level(text[1:-1])]
+    if text in ("true", "false"):
+        return text == "true"
+    if re.fullmatch(r'-?\d+', text):
+        return int(text)
+    if re.fullmatch(r'-?\d+\.\d+', text):
+        return float(text)
+    return text
+
+
+def prisma_arguments(args: Optional[str]) -> tuple:
+    """(positional values, keyword values) of an attribute's argument text."""
+    positional, named = [], {}
+    for part in _split_top_level(args or ""):
+        match = re.match(r'(\w+)\s*:\s*(.+)$', part, re.DOTALL)
+        if match and not part.startswith('"'):
+            named[match.group(1)] = _prisma_value(match.group(2))
+        else:
+            positional.append(_prisma_value(part))
+    return positional, named
+
+
+def parse_prisma_file(path: Path) -> dict:
+    """Models, views, enums and the datasource of one .prisma file.
+
+    Relation fields are kept as unresolved relationship hints (see resolve_prisma).
+    """
+    result = {"tables": [], "views": [], "enums": [], "datasource": None, "error": None}
+    block = None
+    docs = []
+    for line in read_file(path).splitlines():
+        code, doc = _strip_prisma_comment(line)
+        if doc is not None:
+            docs.append(doc)
+            continue
+        if not code.strip():
+            if block is None:
+                docs = []
+            continue
+        if block is None:
+            match = _PRISMA_BLOCK_RE.match(code)
+            if match:
+                block = {"kind": match.group(1), "name": match.group(2), "lines": [], "doc": " ".join(docs) or None}
+                rest = code[match.end():].strip()
+                # One-line blocks: generator client { provider = "prisma-client-js" }, model X {}
+                closed = rest.endswith("}") and rest.count("}") == rest.count("{") + 1
+                if closed:
+                    rest = rest[:-1].strip()
+                if rest:
+                    block["lines"].append((rest, None))
+                if closed:
+                    _finish_prisma_block(block, result)
+                    block = None
+            docs = []
+            continue
+        if code.strip() == "}":
+            _finish_prisma_block(block, result)
+            block = None
+            continue
+        block["lines"].append((code.strip(), " ".join(docs) or None))
+        docs = []
+    if block is not None:
+        result["error"] = f"unterminated {block['kind']} {block['name']}"
+    return result
+
+
+def _finish_prisma_block(block: dict, result: dict):
+    kind, name = block["kind"], block["name"]
+    if kind == "enum":
+        values = []
+        legacy_name = name
+        for code, _doc in block["lines"]:
+            attributes = dict(prisma_attributes(code))
+            if code.startswith("@@"):
+                if "@@map" in attributes:
+                    legacy_name = prisma_arguments(attributes["@@map"])[0][0]
+                continue
+            value_name = code.split()[0]
+            mapped = prisma_arguments(attributes["@map"])[0][0] if "@map" in attributes else value_name
+            values.append({"name": value_name, "value": mapped, "label": None})
+        result["enums"].append({"name": name, "legacy_name": legacy_name, "values": values})
+    elif kind == "datasource":
+        settings = {}
+        for code, _doc in block["lines"]:
+            if "=" in code:
+                key, value = code.split("=", 1)
+                settings[key.strip()] = value.strip()
+        result["datasource"] = settings
+    elif kind in ("model", "view"):
+        table = _parse_prisma_model(block)
+        result["tables" if kind == "model" else "views"].append(table)
+
+
+def _parse_prisma_model(block: dict) -> dict:
+    table = table_entry(block["name"], block["name"], "", block["doc"])
+    table["_fields"] = []
+    table["_block_attributes"] = []
+    for code, doc in block["lines"]:
+        if code.startswith("@@"):
+            table["_block_attributes"] += prisma_attributes(code)
+            continue
+        match = _PRISMA_FIELD_RE.match(code)
+        if not match:
+            continue
+        field_name, field_type, is_list, optional, rest = match.groups()
+        table["_fields"].append({
+            "name": field_name,
+            "type": field_type,
+            "list": bool(is_list),
+            "optional": bool(optional),
+            "attributes": prisma_attributes(rest),
+            "declaration": f"{field_type}{is_list or ''}{optional or ''} {rest}".strip(),
+            "doc": doc,
+        })
+    return table
+
+
+def _legacy_column(table: dict, name: str) -> str:
+    """Database name of a column given by database name or model attribute."""
+    for column in table["columns"]:
+        if column["legacy_name"] == name:
+            return name
+    for column in table["columns"]:
+        if column["name"] == name:
+            return column["legacy_name"]
+    return name
+
+
+def _split_column_target(target: str) -> tuple:
+    """"TABLE.COL" / "schema.TABLE.COL" / "Model.attr" -> (table part, column part)."""
+    if "." not in target:
+        return target, None
+    table, column = target.rsplit(".", 1)
+    if table.endswith(".c"):
+        table = table[:-2]
+    return table, column
+
+
+def resolve_sqlalchemy(files: dict) -> tuple:
+    """Turn per-file parse results {model_file: result} into (tables, enums, sequences, dialects)."""
+    tables = [dict(table, model_file=model_file) for model_file, result in files.items() for table in result["tables"]]
+    mixins = {mixin["name"]: mixin for result in files.values() for mixin in result["mixins"]}
+    by_model = {table["name"]: table for table in tables}
+    by_variable = {table["_variable"]: table for table in tables if table.get("_variable")}
+    by_legacy = {table["legacy_name"]: table for table in tables}
+
+    def table_for(name: Optional[str]) -> Optional[dict]:
+        if name is None:
+            return None
+        return by_legacy.get(name) or by_model.get(name) or by_variable.get(name) or by_legacy.get(name.rsplit(".", 1)[-1])
+
+    # Mixin columns, relationships and constraints, nearest base first
+    for table in tables:
+        seen = set()
+        pending = list(table["_bases"])
+        while pending:
+            base = mixins.get(pending.pop(0))
+            if base is None or base["name"] in seen:
+                continue
+            seen.add(base["name"])
+            own = {column["name"] for column in table["columns"]}
+            table["columns"] += [json.loads(json.dumps(c)) for c in base["columns"] if c["name"] not in own]
+            table["relationships"] += [json.loads(json.dumps(r)) for r in base["relationships"]]
+            table["_constraints"] += base["_constraints"]
+            pending += base["_bases"]
+    for result in files.values():
+        for constraint in result["indexes"]:
+            table = table_for(constraint.get("model"))
+            if table is not None:
+                table["_constraints"].append(constraint)
+
+    sequences = []
+    for table in tables:
+        legacy = table["legacy_name"]
+        primary_key = table["primary_key"]
+        for column in table["columns"]:
+            fk = column.pop("_fk", None)
+            if fk and fk["target"]:
+                ref_table_name, ref_column = _split_column_target(fk["target"])
+                ref_table = table_for(ref_table_name)
+                references_table = ref_table["legacy_name"] if ref_table else ref_table_name
+                if ref_table is not None and ref_column:
+                    ref_column = _legacy_column(ref_table, ref_column)
+                column["foreign_key"] = {"table": references_table, "column": ref_column}
+                initially = fk["initially"]
+                table["foreign_keys"].append(foreign_key_entry(
+                    fk["name"], [column["legacy_name"]], references_table, [ref_column] if ref_column else [],
+                    on_delete=referential_action(fk["on_delete"]), on_update=referential_action(fk["on_update"]),
+                    deferrable=fk["deferrable"],
+                    initially_deferred=isinstance(initially, str) and initially.upper() == "DEFERRED"
+                ))
+                if column.pop("_type_from_fk", False) and ref_table is not None:
+                    referenced = next((c for c in ref_table["columns"] if c["legacy_name"] == ref_column), None)
+                    if referenced is not None and referenced["type"]["raw"]:
+                        column["type"] = dict(referenced["type"], orm_specific=column["type"]["orm_specific"])
+            column.pop("_type_from_fk", None)
+            sequence = column.pop("_sequence", None)
+            if sequence:
+                sequences.append(dict(sequence, owned_by=f"{legacy}.{column['legacy_name']}"))
+                column["_autoincrement"] = True
+            if column["primary_key"]:
+                primary_key["columns"].append(column["legacy_name"])
+            if column.pop("_index"):
+                table["indexes"].append(index_entry(f"ix_{legacy}_{column['legacy_name']}", [column["legacy_name"]],
+                                                    unique=column["unique"]))
+            elif column["unique"]:
+                table["unique_constraints"].append({"name": None, "columns": [column["legacy_name"]]})
+
+        for constraint in table.pop("_constraints"):
+            kind, entry = constraint["kind"], constraint["entry"]
+            entry = json.loads(json.dumps(entry))
+            if kind in ("UniqueConstraint", "PrimaryKeyConstraint", "Index"):
+                entry["columns"] = [_legacy_column(table, name) for name in entry["columns"]]
+            if kind == "Index":
+                table["indexes"].append(entry)
+            elif kind == "UniqueConstraint":
+                table["unique_constraints"].append(entry)
+            elif kind == "PrimaryKeyConstraint":
+                primary_key.update(name=entry["name"], columns=entry["columns"],
+                                   auto_generated_name=entry["name"] is None)
+                for column in table["columns"]:
+                    if column["legacy_name"] in entry["columns"]:
+                        column["primary_key"] = True
+                        column["nullable"] = False
+            elif kind == "CheckConstraint":
+                table["check_constraints"].append(entry)
+            elif kind == "ForeignKeyConstraint":
+                targets = [_split_column_target(target) for target in constraint["targets"]]
+                ref_table = table_for(targets[0][0]) if targets else None
+                entry["columns"] = [_legacy_column(table, name) for name in entry["columns"]]
+                entry["references_table"] = ref_table["legacy_name"] if ref_table else (targets[0][0] if targets else "")
+                entry["references_columns"] = [
+                    _legacy_column(ref_table, column) if ref_table else column for _, column in targets
+                ]
+                table["foreign_keys"].append(entry)
+
+        # autoincrement="auto": a lone integer primary key without a foreign key
+        for column in table["columns"]:
+            auto = column.pop("_autoincrement")
+            if auto == "auto":
+                auto = (
+                    column["primary_key"] and len(primary_key["columns"]) == 1
+                    and column["type"]["base"] == "integer" and column["foreign_key"] is None
+                )
+            column["auto_increment"] = bool(auto)
+
+    # backref= declares the inverse relationship on the target model
+    for table in tables:
+        for rel in list(table["relationships"]):
+            target = table_for(rel["target_model"])
+            if rel["_backref"] and target is not None and all(r["name"] != rel["_backref"] for r in target["relationships"]):
+                # Self-referential: the inverse of the one-to-many side is the many-to-one side
+                target["relationships"].append({
+                    **rel, "name": rel["_backref"], "target_model": table["name"], "back_populates": rel["name"],
+                    "lazy": "select", "cascade": None, "_uselist": None, "_foreign_keys": None,
+                    "_remote_side": not rel["_remote_side"], "_backref": None,
+                })
+
+    for table in tables:
+        for rel in table["relationships"]:
+            _resolve_relationship(table, rel, table_for(rel["target_model"]), table_for(rel["_secondary"]))
+
+    enum_names = {}
+    for table in tables:
+        for column in table["columns"]:
+            enum_class, enum_name = column.pop("_enum", None) or (None, None)
+            if enum_class and enum_name:
+                enum_names.setdefault(enum_class, enum_name)
+        table.pop("_bases")
+        table.pop("_variable", None)
+    enums = []
+    for model_file, result in files.items():
+        for enum in result["enums"]:
+            enums.append({
+                "name": enum["name"],
+                "legacy_name": enum_names.get(enum["name"], enum["name"]),
+                "model_file": model_file,
+                "values": enum["values"]
+            })
+    dialects = sorted({dialect for result in files.values() for dialect in result["dialects"]})
+    return tables, enums, sequences, dialects
+
+
+def _resolve_relationship(table: dict, rel: dict, target: Optional[dict], secondary: Optional[dict]):
+    """Fill type, target_table and column pairs of a parsed SQLAlchemy relationship."""
+    uselist = rel.pop("_uselist")
+    hinted = rel.pop("_foreign_keys") or []
+    remote_side = rel.pop("_remote_side")
+    junction = rel.pop("_secondary")
+    rel.pop("_backref")
+    rel["target_table"] = target["legacy_name"] if target else None
+    if target is not None:
+        rel["target_model"] = target["name"]
+
+    if junction is not None:
+        rel["type"] = "many-to-many"
+        items = list(rel.items())
+        rel.clear()
+        for key, value in items:
+            rel[key] = value
+            if key == "target_model":
+                rel["junction_table"] = secondary["legacy_name"] if secondary else junction
+        if secondary is not None:
+            for fk in secondary["foreign_keys"]:
+                if fk["references_table"] == table["legacy_name"] and not rel["local_columns"]:
+                    rel["local_columns"] = list(fk["columns"])
+                elif target is not None and fk["references_table"] == target["legacy_name"]:
+                    rel["remote_columns"] = list(fk["columns"])
+        return
+
+    outgoing = [fk for fk in table["foreign_keys"] if target and fk["references_table"] == target["legacy_name"]]
+    incoming = [fk for fk in target["foreign_keys"] if fk["references_table"] == table["legacy_name"]] if target else []
+    if hinted:
+        hinted = {_legacy_column(table, name) for name in hinted} | {
+            _legacy_column(target, name) for name in hinted if target
+        }
+        outgoing = [fk for fk in outgoing if set(fk["columns"]) & hinted]
+        incoming = [fk for fk in incoming if set(fk["columns"]) & hinted]
+    if target is table:
+        # Self-referential: remote_side marks the many-to-one side
+        outgoing, incoming = (outgoing, []) if remote_side else ([], incoming)
+
+    if outgoing and (not incoming or uselist is not True):
+        fk = outgoing[0]
+        unique = any(
+            column["legacy_name"] in fk["columns"] and (column["unique"] or column["primary_key"])
+            for column in table["columns"]
+        ) and len(fk["columns"]) == 1
+        rel["type"] = "one-to-one" if unique and uselist is False else "many-to-one"
+        rel["local_columns"] = list(fk["columns"])
+        rel["remote_columns"] = list(fk["references_columns"])
+    else:
+        rel["type"] = "one-to-one" if uselist is False else "one-to-many"
+        if incoming:
+            rel["local_columns"] = list(incoming[0]["references_columns"])
+            rel["remote_columns"] = list(incoming[0]["columns"])
+
+
+_PRISMA_DEFAULT_DB_FUNCTIONS = {"now()": "CURRENT_TIMESTAMP"}
+
+
+def resolve_prisma(files: dict) -> tuple:
+    """Turn per-file parse results {model_file: result} into (tables, views, enums, datasource)."""
+    tables = []
+    views = []
+    enums = []
+    datasource = None
+    for model_file, result in files.items():
+        tables += [dict(table, model_file=model_file) for table in result["tables"]]
+        views += [dict(view, model_file=model_file) for view in result["views"]]
+        enums += [dict(enum, model_file=model_file) for enum in result["enums"]]
+        datasource = datasource or result["datasource"]
+    enum_names = {enum["name"] for enum in enums}
+    by_model = {table["name"]: table for table in tables}
+
+    for table in tables + views:
+        for name, args in table["_block_attributes"]:
+            if name == "@@map":
+                table["legacy_name"] = prisma_arguments(args)[0][0]
+            elif name == "@@schema":
+                table["table_options"]["schema"] = prisma_arguments(args)[0][0]
+        for field in table["_fields"]:
+            if field["type"] in by_model:
+                continue
+            table["columns"].append(_prisma_column(field, enum_names))
+
+    for table in tables:
+        _prisma_constraints(table, by_model)
+    for table in tables:
+        table["relationships"] = [
+            _prisma_relationship(table, field, by_model[field["type"]])
+            for field in table["_fields"] if field["type"] in by_model
+        ]
+    for table in tables + views:
+        table.pop("_fields")
+        table.pop("_block_attributes")
+
+    spec_views = []
+    for view in views:
+        spec_views.append({
+            "name": view["name"],
+            "legacy_name": view["legacy_name"],
+            "model_file": view["model_file"],
+            "materialized": False,
+            "definition": None,
+            "columns": [{"name": c["legacy_name"], "type": {"base": c["type"]["base"]}} for c in view["columns"]],
+            "dependencies": []
+        })
+    spec_enums = [
+        {"name": enum["name"], "legacy_name": enum["legacy_name"], "model_file": enum["model_file"],
+         "values": enum["values"]}
+        for enum in enums
+    ]
+    return tables, spec_views, spec_enums, datasource
+
+
+def _prisma_column(field: dict, enum_names: set) -> dict:
+    attributes = field["attributes"]
+    names = [name for name, _ in attributes]
+    args_of = dict(attributes)
+    legacy_name = prisma_arguments(args_of["@map"])[0][0] if "@map" in args_of else field["name"]
+    prisma_type = field["type"]
+    raw = prisma_type
+    size = precision = scale = None
+    if prisma_type in enum_names:
+        base = "enum"
+    elif prisma_type.startswith("Unsupported("):
+        base = "string"
+    else:
+        base = PRISMA_BASE_TYPES.get(prisma_type, "string")
+    for name, args in attributes:
+        if name.startswith("@db."):
+            native = name[4:]
+            raw = f"{prisma_type} @db.{native}" + (f"({args})" if args is not None else "")
+            base = PRISMA_NATIVE_BASE_TYPES.get(native, base)
+            values = prisma_arguments(args)[0]
+            if base in ("string", "binary") and values and isinstance(values[0], int):
+                size = values[0]
+            elif base == "decimal" and values:
+                precision = values[0] if isinstance(values[0], int) else None
+                scale = values[1] if len(values) > 1 and isinstance(values[1], int) else None
+    if field["list"] and base != "enum":
+        base = "array"
+    column = column_entry(field["name"], legacy_name, type_info(base, raw, field["declaration"], size, precision, scale))
+    column["nullable"] = field["optional"]
+    column["primary_key"] = "@id" in names
+    column["unique"] = "@unique" in names
+    column["comment"] = field["doc"]
+    if "@default" in args_of:
+        default = args_of["@default"].strip()
+        if default == "autoincrement()" or default.startswith("sequence("):
+            column["auto_increment"] = True
+        elif default.startswith("dbgenerated("):
+            generated = prisma_arguments(default[len("dbgenerated("):-1])[0]
+            column["server_default"] = generated[0] if generated else None
+        elif default in _PRISMA_DEFAULT_DB_FUNCTIONS:
+            column["server_default"] = _PRISMA_DEFAULT_DB_FUNCTIONS[default]
+        else:
+            column["default"] = _prisma_value(default)
+    return column
+
+
+def _prisma_constraints(table: dict, by_model: dict):
+    """Primary key, unique constraints, indexes and foreign keys of a Prisma model."""
+    legacy = table["legacy_name"]
+    for column in table["columns"]:
+        if column["primary_key"]:
+            table["primary_key"]["columns"].append(column["legacy_name"])
+    for field in table["_fields"]:
+        args_of = dict(field["attributes"])
+        if "@unique" in args_of:
+            named = prisma_arguments(args_of["@unique"])[1]
+            table["unique_constraints"].append({"name": named.get("map"), "columns": [_legacy_column(table, field["name"])]})
+        if "@id" in args_of:
+            named = prisma_arguments(args_of["@id"])[1]
+            if named.get("map"):
+                table["primary_key"].update(name=named["map"], auto_generated_name=False)
+        target = by_model.get(field["type"])
+        if target is None or "@relation" not in args_of:
+            continue
+        _, named = prisma_arguments(args_of["@relation"])
+        if not named.get("fields"):
+            continue
+        table["foreign_keys"].append(foreign_key_entry(
+            named.get("map"),
+            [_legacy_column(table, name) for name in named["fields"]],
+            target["legacy_name"],
+            [_legacy_column(target, name) for name in named.get("references", [])],
+            on_delete=referential_action(named.get("onDelete"), "SET NULL" if field["optional"] else "RESTRICT"),
+            on_update=referential_action(named.get("onUpdate"), "CASCADE")
+        ))
+        for column in table["columns"]:
+            if column["legacy_name"] in table["foreign_keys"][-1]["columns"] and len(named["fields"]) == 1:
+                column["foreign_key"] = {
+                    "table": target["legacy_name"],
+                    "column": table["foreign_keys"][-1]["references_columns"][0]
+                }
+
+    for name, args in table["_block_attributes"]:
+        positional, named = prisma_arguments(args)
+        columns = positional[0] if positional and isinstance(positional[0], list) else named.get("fields", [])
+        columns = [_legacy_column(table, column) for column in columns]
+        if name == "@@id":
+            table["primary_key"].update(name=named.get("map"), columns=columns,
+                                        auto_generated_name=named.get("map") is None)
+            for column in table["columns"]:
+                if column["legacy_name"] in columns:
+                    column["primary_key"] = True
+        elif name == "@@unique":
+            table["unique_constraints"].append({"name": named.get("map") or named.get("name"), "columns": columns})
+        elif name == "@@index":
+            using = named.get("type")
+            table["indexes"].append(index_entry(
+                named.get("map") or named.get("name") or f"{legacy}_{'_'.join(columns)}_idx", columns,
+                using=using.lower() if isinstance(using, str) else None
+            ))
+
+
+def _prisma_relationship(table: dict, field: dict, target: dict) -> dict:
+    """Relationship entry of a relation field, paired with the opposite field on target."""
+    positional, named = prisma_arguments(dict(field["attributes"]).get("@relation"))
+    relation_name = named.get("name") or (positional[0] if positional else None)
+    opposite = opposite_named = None
+    for other in target["_fields"]:
+        if other is field or other["type"] != table["name"]:
+            continue
+        other_positional, other_named = prisma_arguments(dict(other["attributes"]).get("@relation"))
+        if (other_named.get("name") or (other_positional[0] if other_positional else None)) == relation_name:
+            opposite, opposite_named = other, other_named
+            break
+
+    rel = {
+        "name": field["name"],
+        "type": None,
+        "target_table": target["legacy_name"],
+        "target_model": target["name"],
+    }
+    local = remote = []
+    if named.get("fields"):
+        local = [_legacy_column(table, name) for name in named["fields"]]
+        remote = [_legacy_column(target, name) for name in named.get("references", [])]
+        unique = set(table["primary_key"]["columns"]) == set(local) or any(
+            set(constraint["columns"]) == set(local) for constraint in table["unique_constraints"]
+        )
+        rel["type"] = "one-to-one" if unique else "many-to-one"
+    elif opposite_named and opposite_named.get("fields"):
+        local = [_legacy_column(table, name) for name in opposite_named.get("references", [])]
+        remote = [_legacy_column(target, name) for name in opposite_named["fields"]]
+        rel["type"] = "one-to-many" if field["list"] else "one-to-one"
+    else:
+        # Implicit many-to-many: Prisma's _AToB join table with columns A and B
+        first, second = sorted([table["name"], target["name"]])
+        rel["type"] = "many-to-many"
+        rel["junction_table"] = f"_{relation_name}" if relation_name else f"_{first}To{second}"
+        local, remote = (["A"], ["B"]) if table["name"] == first else (["B"], ["A"])
+    rel.update({
+        "local_columns": local,
+        "remote_columns": remote,
+        "back_populates": opposite["name"] if opposite else None,
+        "lazy": None,
+        "cascade": None
+    })
+    return rel
+
+
+def detect_schema_stack(project_dir: Path) -> dict:
+    """Stack object (spec section 4) plus the model files to parse, under "files".
+
+    The stack ID and ORM come from CONVERSION.md and the models location from
+    STACK_ORMS; when they are unknown or the location does not exist, the usual
+    Prisma and SQLAlchemy locations are tried, then any Python module declaring
+    __tablename__. orm is None when no model files were found.
+    """
+    conversion = parse_conversion_fields(project_dir / ".planning" / "CONVERSION.md")
+    stack_id = conversion.get("stack id")
+    orm, location = STACK_ORMS.get(stack_id, (None, None))
+    declared = (conversion.get("orm") or "").lower()
+    if orm is None:
+        orm = next((name for name in SUPPORTED_ORMS if name.lower() in declared), None)
+    if orm is not None and orm not in SUPPORTED_ORMS:
+        return {"id": stack_id, "orm": orm, "models_location": location, "files": []}
+
+    candidates = []
+    if location:
+        candidates.append((orm, location))
+    if orm in (None, "Prisma"):
+        candidates += [("Prisma", path) for path in PRISMA_LOCATIONS]
+    if orm in (None, "SQLAlchemy"):
+        candidates += [("SQLAlchemy", path) for path in SQLALCHEMY_LOCATIONS]
+    for candidate_orm, candidate in candidates:
+        files = model_files(project_dir, candidate_orm, candidate)
+        if files:
+            return {"id": stack_id, "orm": candidate_orm, "models_location": candidate, "files": files}
+
+    if orm in (None, "SQLAlchemy"):
+        files = scan_sqlalchemy_modules(project_dir)
+        if files:
+            parents = {path.parent.relative_to(project_dir).as_posix() for path in files}
+            location = os.path.commonpath(sorted(parents)) + "/" if len(parents) > 1 else parents.pop() + "/"
+            return {"id": stack_id, "orm": "SQLAlchemy", "models_location": location.lstrip("./") or "./",
+                    "files": files}
+    return {"id": stack_id, "orm": orm, "models_location": location, "files": []}
+
+
+def model_files(project_dir: Path, orm: str, location: str) -> list:
+    """Model files at a models location: the file itself, or the .py / .prisma files below it."""
+    path = project_dir / location
+    if path.is_file():
+        return [path]
+    if not path.is_dir():
+        return []
+    pattern = "*.prisma" if orm == "Prisma" else "*.py"
+    return sorted(p for p in path.rglob(pattern) if "__pycache__" not in p.parts)
+
+
+def scan_sqlalchemy_modules(project_dir: Path) -> list:
+    """Python modules below project_dir that declare __tablename__ (hidden and vendored dirs skipped)."""
+    found = []
+    for root, dirs, files in os.walk(project_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in SCAN_SKIP_DIRS)
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = Path(root) / name
+                try:
+                    if "__tablename__" in read_file(path):
+                        found.append(path)
+                except (OSError, UnicodeDecodeError):
+                    continue
+    return found
+
+
+_SQLALCHEMY_VERSION_RE = re.compile(r'sqlalchemy(?:\[[^\]]*\])?\s*["\']?\s*[=~<>!^@:,\s"\']*\s*v?(\d+)\.(\d+)',
+                                    re.IGNORECASE)
+_PRISMA_VERSION_RE = re.compile(r'"(?:@prisma/client|prisma)"\s*:\s*"[^\d"]*(\d+)\.(\d+)')
+VERSION_FILES = {
+    "SQLAlchemy": ("pyproject.toml", "requirements.txt", "backend/pyproject.toml", "backend/requirements.txt"),
+    "Prisma": ("package.json",),
+}
+
+
+def orm_version(project_dir: Path, orm: str) -> Optional[str]:
+    """Major.minor ORM version declared in the project's dependency files, if any."""
+    version_re = _PRISMA_VERSION_RE if orm == "Prisma" else _SQLALCHEMY_VERSION_RE
+    for name in VERSION_FILES.get(orm, ()):
+        path = project_dir / name
+        if path.exists():
+            match = version_re.search(read_file(path))
+            if match:
+                return f"{match.group(1)}.{match.group(2)}"
+    return None
+
+
+ENV_FILES = (".env", "backend/.env")
+ENV_URL_KEYS = ("DATABASE_URL", "SQLALCHEMY_DATABASE_URI", "SQLALCHEMY_DATABASE_URL", "DB_URL")
+DATABASE_TYPES = {
+    "postgres": "postgresql", "postgresql": "postgresql", "cockroachdb": "postgresql",
+    "mysql": "mysql", "mariadb": "mysql", "mssql": "sqlserver", "sqlserver": "sqlserver",
+    "sqlite": "sqlite", "file": "sqlite", "oracle": "oracle", "mongodb": "mongodb",
+}
+DEFAULT_PORTS = {"postgresql": 5432, "mysql": 3306, "sqlserver": 1433, "oracle": 1521, "mongodb": 27017}
+
+
+def read_env(project_dir: Path) -> dict:
+    """KEY=VALUE pairs of the project's .env files (first definition wins)."""
+    env = {}
+    for name in ENV_FILES:
+        path = project_dir / name
+        if not path.exists():
+            continue
+        for line in read_file(path).splitlines():
+            line = line.strip()
+            if line.startswith("export "):
+                line = line[len("export "):]
+            if "=" in line and not line.startswith("#"):
+                key, value = line.split("=", 1)
+                env.setdefault(key.strip(), value.strip().strip("\"'"))
+    return env
+
+
+def database_connection(url: str, name: str = "default") -> Optional[dict]:
+    """Connection object (spec section 6) of a database URL; the password is never kept."""
+    from urllib.parse import parse_qs, unquote, urlsplit
+    scheme = url.split(":", 1)[0].split("+", 1)[0].lower()
+    database_type = DATABASE_TYPES.get(scheme)
+    if database_type is None:
+        return None
+    if database_type == "sqlite":
+        database = re.sub(r'^(?:sqlite[^:]*:///?|file:)', "", url)
+        return {"name": name, "database_type": database_type, "host": None, "port": None,
+                "database": database or None, "schema": None, "user": None}
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+    query = parse_qs(parts.query)
+    return {
+        "name": name,
+        "database_type": database_type,
+        "host": parts.hostname,
+        "port": port or DEFAULT_PORTS.get(database_type),
+        "database": unquote(parts.path.lstrip("/")) or None,
+        "schema": (query.get("schema") or query.get("currentSchema") or [None])[0],
+        "user": unquote(parts.username) if parts.username else None
+    }
+
+
+def schema_connections(project_dir: Path, datasource: Optional[dict]) -> list:
+    """Database connections from the Prisma datasource or the DATABASE_URL-style .env keys."""
+    env = read_env(project_dir)
+    url = None
+    if datasource and "url" in datasource:
+        value = datasource["url"]
+        match = re.match(r'env\(\s*"([^"]+)"\s*\)', value)
+        url = env.get(match.group(1)) if match else _prisma_value(value)
+    if not url:
+        url = next((env[key] for key in ENV_URL_KEYS if env.get(key)), None)
+    connection = database_connection(url) if isinstance(url, str) else None
+    return [connection] if connection else []
+
+
+def prisma_extensions(datasource: Optional[dict]) -> list:
+    """Extensions (spec section 15) of a datasource's extensions = [...] list."""
+    value = (datasource or {}).get("extensions", "")
+    extensions = []
+    if value.startswith("["):
+        for item in _split_top_level(value[1:-1]):
+            match = re.match(r'(\w+)\s*(?:\((.*)\))?$', item, re.DOTALL)
+            if match:
+                named = prisma_arguments(match.group(2))[1]
+                extensions.append({"name": named.get("map", match.group(1)), "version": named.get("version"),
+                                   "schema": named.get("schema")})
+    return extensions
+
+
+def parse_model_files(project_dir: Path, stack: dict, cache: Optional[ParseCache] = None) -> dict:
+    """{model file relative to project_dir: per-file parse result}, through the cache when given."""
+    kind, parser = ("prisma", parse_prisma_file) if stack["orm"] == "Prisma" else ("sqlalchemy", parse_sqlalchemy_file)
+    files = {}
+    for path in stack["files"]:
+        rel = path.relative_to(project_dir).as_posix()
+        try:
+            files[rel] = cached_parse(cache, kind, path, parser)
+        except (OSError, UnicodeDecodeError) as e:
+            files[rel] = {"error": str(e)}
+        count("model_files")
+    return files
+
+
+def load_legacy_tables(path: Path) -> list:
+    """Legacy table names from a JSON list (of names or {"name": ...} objects), an object
+    with such a "tables" list (MCP get_schema output), or plain text with one name per line.
+    """
+    text = path.read_text()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return [line.strip() for line in text.splitlines() if line.strip() and not line.startswith("#")]
+    if isinstance(data, dict):
+        data = data.get("tables", [])
+    names = []
+    for item in data if isinstance(data, list) else []:
+        name = item.get("name") or item.get("table_name") if isinstance(item, dict) else item
+        if isinstance(name, str):
+            names.append(name)
+    return names
+
+
+def load_previous_schema(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def previous_legacy_tables(previous: dict) -> Optional[list]:
+    """Legacy table names implied by a previous dashboard's coverage, None if it had none."""
+    coverage = previous.get("coverage") or {}
+    if not coverage.get("legacy_tables"):
+        return None
+    extra = set(coverage.get("extra_tables", []))
+    names = [table.get("legacy_name") for table in previous.get("tables", [])]
+    return [name for name in names if name and name not in extra] + list(coverage.get("missing_tables", []))
+
+
+def build_coverage(tables: list, legacy_tables: Optional[list]) -> dict:
+    """Coverage object (spec section 5); all zero/empty while the legacy tables are unknown.
+
+    Names match case-insensitively (legacy databases often report USERS for a
+    users model); the lists keep each side's own spelling.
+    """
+    generated = {}
+    for table in tables:
+        generated.setdefault(table["legacy_name"].casefold(), table["legacy_name"])
+    legacy = {}
+    for name in legacy_tables or ():
+        legacy.setdefault(name.casefold(), name)
+    matched = legacy.keys() & generated.keys()
+    return {
+        "legacy_tables": len(legacy),
+        "models_generated": len(tables),
+        "models_validated": sum(1 for table in tables if table["status"] == "validated"),
+        "percentage": round(len(matched) / len(legacy) * 100, 1) if legacy else 0.0,
+        "missing_tables": sorted(name for key, name in legacy.items() if key not in generated),
+        "extra_tables": sorted(name for key, name in generated.items() if key not in legacy) if legacy else []
+    }
+
+
+def schema_statistics(dashboard: dict) -> dict:
+    tables = dashboard["tables"]
+    return {
+        "total_tables": len(tables),
+        "total_columns": sum(len(table["columns"]) for table in tables),
+        "total_relationships": sum(len(table["relationships"]) for table in tables),
+        "total_indexes": sum(len(table["indexes"]) for table in tables),
+        "total_foreign_keys": sum(len(table["foreign_keys"]) for table in tables),
+        "total_enums": len(dashboard["enums"]),
+        "total_views": len(dashboard["views"]),
+        "total_functions": len(dashboard["functions"]),
+        "total_procedures": len(dashboard["procedures"]),
+        "total_sequences": len(dashboard["sequences"]),
+        "total_triggers": sum(len(table["triggers"]) for table in tables)
+    }
+
+
+def build_schema_dashboard(
+    project_dir: Path,
+    stack: dict,
+    files: dict,
+    legacy_tables: Optional[list] = None,
+    previous: Optional[dict] = None
+) -> dict:
+    """Assemble the schema dashboard from parsed model files (see parse_model_files).
+
+    legacy_tables defaults to the ones recorded in previous, the last dashboard,
+    whose "validated"/"error" statuses are kept for tables that did not change.
+    """
+    previous = previous or {}
+    parsed = {rel: result for rel, result in files.items() if not result.get("error")}
+    views = sequences = []
+    datasource = None
+    dialects = []
+    if stack["orm"] == "Prisma":
+        tables, views, enums, datasource = resolve_prisma(parsed)
+    else:
+        tables, enums, sequences, dialects = resolve_sqlalchemy(parsed)
+
+    previous_tables = {table.get("legacy_name"): table for table in previous.get("tables", [])}
+    for table in tables:
+        legacy_columns = [column["legacy_name"] for column in table["columns"]]
+        for check in table["check_constraints"]:
+            words = set(re.findall(r'\w+', check["expression"] or ""))
+            check["columns"] = [name for name in legacy_columns if name in words]
+        before = previous_tables.get(table["legacy_name"])
+        if before and before.get("status") in ("validated", "error") and dict(before, status="generated") == table:
+            table["status"] = before["status"]
+
+    connections = schema_connections(project_dir, datasource)
+    provider = _prisma_value(datasource["provider"]) if datasource and "provider" in datasource else None
+    database_type = (
+        DATABASE_TYPES.get(provider, provider) if provider
+        else connections[0]["database_type"] if connections
+        else DATABASE_TYPES.get(dialects[0], dialects[0]) if dialects
+        else None
+    )
+    conversion = parse_conversion_fields(project_dir / ".planning" / "CONVERSION.md")
+    project_info = parse_project_md(project_dir / ".planning" / "PROJECT.md")
+    if legacy_tables is None:
+        legacy_tables = previous_legacy_tables(previous)
+
+    dashboard = {
+        "$schema": SCHEMA_SPEC_URL,
+        "version": SCHEMA_SPEC_VERSION,
+        "generated_at": run_timestamp(),
+        "project": {
+            "name": project_info.get("name") or project_dir.name,
+            "output_project_id": conversion.get("output project id"),
+            "legacy_project": conversion.get("project name")
+        },
+        "stack": {
+            "id": stack["id"],
+            "orm": stack["orm"],
+            "orm_version": orm_version(project_dir, stack["orm"]),
+            "database_type": database_type,
+            "models_location": stack["models_location"]
+        },
+        "coverage": build_coverage(tables, legacy_tables),
+        "connections": connections,
+        "enums": enums,
+        "tables": tables,
+        "views": views,
+        "sequences": sequences,
+        "functions": [],
+        "procedures": [],
+        "composite_types": [],
+        "domains": [],
+        "extensions": prisma_extensions(datasource),
+    }
+    dashboard["statistics"] = schema_statistics(dashboard)
+    return dashboard
+
+
+def render_schema_status(dashboard: dict, errors: dict) -> str:
+    """SCHEMA-STATUS.md: coverage, missing tables and per-table counts in Markdown."""
+    stack = dashboard["stack"]
+    coverage = dashboard["coverage"]
+    orm = " ".join(part for part in (stack["orm"], stack["orm_version"]) if part)
+    lines = [
+        "# Schema Status",
+        "",
+        f"**Generated:** {dashboard['generated_at'][:19].replace('T', ' ')}",
+        f"**Stack:** {stack['id'] or 'unknown'} ({orm})",
+        "",
+        "## Coverage",
+        "",
+        "| Metric | Count |",
+        "|--------|-------|",
+        f"| Legacy Tables | {coverage['legacy_tables'] or 'unknown'} |",
+        f"| Models Generated | {coverage['models_generated']} |",
+        f"| Models Validated | {coverage['models_validated']} |",
+        f"| Coverage | {coverage['percentage']:g}% |" if coverage["legacy_tables"] else "| Coverage | — |",
+        "",
+        "## Missing Tables",
+        "",
+    ]
+    lines += [f"- {name}" for name in coverage["missing_tables"]] or ["(none)"]
+    if coverage["extra_tables"]:
+        lines += ["", "## Extra Tables", ""] + [f"- {name}" for name in coverage["extra_tables"]]
+    lines += ["", "## Model Summary", "", "| Table | Columns | Relationships | Indexes |",
+              "|-------|---------|---------------|---------|"]
+    lines += [
+        f"| {table['legacy_name']} | {len(table['columns'])} | {len(table['relationships'])} | {len(table['indexes'])} |"
+        for table in dashboard["tables"]
+    ]
+    lines += ["", "## Validation Issues", ""]
+    lines += [f"- `{rel}` could not be parsed: {error}" for rel, error in sorted(errors.items())] or ["(none)"]
+    return "\n".join(lines) + "\n"
+
+
+def write_schema_status(path: Path, text: str, force: bool = False) -> bool:
+    """Write SCHEMA-STATUS.md unless only its Generated line would change."""
+    if not force and path.exists():
+        try:
+            if _GENERATED_LINE_RE.sub("", path.read_text()) == _GENERATED_LINE_RE.sub("", text):
+                return False
+        except OSError:
+            pass
+    atomic_write_text(path, text)
+    return True
+
+
+def generate_schema_outputs(
+    project_dir: Path,
+    stack: dict,
+    cache: Optional[ParseCache] = None,
+    legacy_tables: Optional[list] = None,
+    force: bool = False
+) -> dict:
+    """Write .planning/schema-dashboard.json and SCHEMA-STATUS.md for a detected stack.
+
+    Prints [WXCODE:SCHEMA_DASHBOARD_UPDATED] / [WXCODE:SCHEMA_STATUS_UPDATED] for
+    the files actually rewritten, warns about unparsable model files on stderr
+    and returns the dashboard.
+    """
+    planning_dir = project_dir / ".planning"
+    dashboard_path = planning_dir / SCHEMA_DASHBOARD_FILENAME
+    with timed("parse"):
+        files = parse_model_files(project_dir, stack, cache)
+    errors = {rel: result["error"] for rel, result in files.items() if result.get("error")}
+    for rel, error in sorted(errors.items()):
+        print(f"WARNING: Could not parse {rel}: {error}", file=sys.stderr)
+
+    with timed("schema"):
+        dashboard = build_schema_dashboard(
+            project_dir, stack, files, legacy_tables, load_previous_schema(dashboard_path)
+        )
+    if write_dashboard(dashboard_path, dashboard, force=force):
+        print(f"[WXCODE:SCHEMA_DASHBOARD_UPDATED] {dashboard_path}", flush=True)
+    status_path = planning_dir / SCHEMA_STATUS_FILENAME
+    if write_schema_status(status_path, render_schema_status(dashboard, errors), force=force):
+        print(f"[WXCODE:SCHEMA_STATUS_UPDATED] {status_path}", flush=True)
+    if cache is not None:
+        cache.save()
+    return dashboard